@@ -0,0 +1,224 @@
+"""Recall/latency benchmark for the hybrid collection's dense index.
+
+Copies the dense vectors of the served collection into a scratch collection
+laid out with the QDRANT_* settings, samples stored vectors as queries and
+compares the configured search (HNSW, plus quantization with and without
+rescoring) against exact search. The served collection is never modified, so
+layouts can be compared by changing e.g. QDRANT_QUANTIZATION between runs:
+
+    python benchmark_collection.py --queries 200 --limit 10
+    QDRANT_QUANTIZATION=binary python benchmark_collection.py --oversampling 1 2 4
+
+Apply the chosen layout with configure_collection.py.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Set
+
+from qdrant_client import models
+from utils.logging import get_logger, setup_logging
+from utils.qdrant_client import QdrantOfficialHybridStore
+
+setup_logging(debug=False, structured_logs=False, log_level="INFO")
+logger = get_logger(__name__)
+
+
+def copy_collection(
+    store: QdrantOfficialHybridStore, collection_name: str, batch_size: int
+) -> None:
+    """Copy the served collection's dense vectors into a collection using settings."""
+    source = store.collection_name
+    dense_params = store.client.get_collection(source).config.params.vectors[
+        store.dense_vector_name
+    ]
+    if store.client.collection_exists(collection_name):
+        store.client.delete_collection(collection_name)
+    store.client.create_collection(
+        collection_name=collection_name,
+        **store.collection_layout(dense_params.size),
+    )
+
+    offset = None
+    copied = 0
+    while True:
+        points, offset = store.client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=[store.dense_vector_name],
+        )
+        if points:
+            store.client.upsert(
+                collection_name=collection_name,
+                points=[
+                    models.PointStruct(
+                        id=point.id,
+                        vector={
+                            store.dense_vector_name: point.vector[
+                                store.dense_vector_name
+                            ]
+                        },
+                    )
+                    for point in points
+                ],
+            )
+            copied += len(points)
+        if offset is None:
+            break
+    logger.info(f"Copied {copied} points from {source} to {collection_name}")
+
+
+def wait_until_optimized(
+    store: QdrantOfficialHybridStore, collection_name: str, timeout: float
+) -> None:
+    """Wait for the copy to be indexed and quantized."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = store.client.get_collection(collection_name)
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(1)
+    logger.warning("Collection is still optimizing, results may be skewed")
+
+
+def sample_queries(
+    store: QdrantOfficialHybridStore, collection_name: str, count: int, seed: int
+) -> List[List[float]]:
+    points, _ = store.client.scroll(
+        collection_name=collection_name,
+        limit=count * 5,
+        with_payload=False,
+        with_vectors=[store.dense_vector_name],
+    )
+    random.Random(seed).shuffle(points)
+    return [point.vector[store.dense_vector_name] for point in points[:count]]
+
+
+def search_ids(
+    store: QdrantOfficialHybridStore,
+    collection_name: str,
+    vector: List[float],
+    limit: int,
+    params: Optional[models.SearchParams],
+) -> Set[str]:
+    points = store.client.query_points(
+        collection_name=collection_name,
+        query=vector,
+        using=store.dense_vector_name,
+        search_params=params,
+        limit=limit,
+        with_payload=False,
+    ).points
+    return {point.id for point in points}
+
+
+def run_variant(
+    store: QdrantOfficialHybridStore,
+    collection_name: str,
+    queries: List[List[float]],
+    truth: List[Set[str]],
+    limit: int,
+    params: Optional[models.SearchParams],
+) -> Dict[str, float]:
+    recalls, latencies = [], []
+    for vector, expected in zip(queries, truth):
+        start_time = time.perf_counter()
+        found = search_ids(store, collection_name, vector, limit, params)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+
+    latencies.sort()
+    return {
+        "recall": statistics.mean(recalls),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--oversampling", type=float, nargs="+", default=[1.0, 2.0, 4.0]
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--optimize-timeout", type=float, default=600)
+    parser.add_argument("--copy-batch-size", type=int, default=256)
+    parser.add_argument(
+        "--keep-copy",
+        action="store_true",
+        help="Keep the scratch collection instead of deleting it afterwards",
+    )
+    args = parser.parse_args()
+
+    store = QdrantOfficialHybridStore()
+    collection_name = f"{store.collection_name}_benchmark"
+    copy_collection(store, collection_name, args.copy_batch_size)
+    try:
+        benchmark(store, collection_name, args)
+    finally:
+        if not args.keep_copy:
+            store.client.delete_collection(collection_name)
+
+
+def benchmark(
+    store: QdrantOfficialHybridStore, collection_name: str, args: argparse.Namespace
+) -> None:
+    wait_until_optimized(store, collection_name, args.optimize_timeout)
+
+    info = store.client.get_collection(collection_name)
+    quantization = info.config.quantization_config
+    print(f"Copy of {store.collection_name}: {info.points_count} points")
+    print(
+        f"  quantization={type(quantization).__name__ if quantization else None} "
+        f"vectors_on_disk={info.config.params.vectors[store.dense_vector_name].on_disk} "
+        f"payload_on_disk={info.config.params.on_disk_payload} "
+        f"hnsw m={info.config.hnsw_config.m} "
+        f"ef_construct={info.config.hnsw_config.ef_construct}"
+    )
+
+    queries = sample_queries(store, collection_name, args.queries, args.seed)
+    if not queries:
+        print("Collection is empty, nothing to benchmark")
+        return
+
+    exact = models.SearchParams(exact=True)
+    truth = [
+        search_ids(store, collection_name, vector, args.limit, exact)
+        for vector in queries
+    ]
+
+    variants: Dict[str, models.SearchParams] = {
+        "exact": exact,
+        "hnsw": models.SearchParams(
+            quantization=models.QuantizationSearchParams(ignore=True)
+        ),
+    }
+    if quantization:
+        variants["quantized, no rescore"] = models.SearchParams(
+            quantization=models.QuantizationSearchParams(rescore=False)
+        )
+        for oversampling in args.oversampling:
+            variants[f"quantized, rescore x{oversampling:g}"] = models.SearchParams(
+                quantization=models.QuantizationSearchParams(
+                    rescore=True, oversampling=oversampling
+                )
+            )
+
+    print(f"\n{len(queries)} queries, top {args.limit}")
+    print(f"{'variant':<28}{'recall':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, params in variants.items():
+        result = run_variant(store, collection_name, queries, truth, args.limit, params)
+        print(
+            f"{name:<28}{result['recall']:>8.3f}"
+            f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
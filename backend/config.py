@@ -1,7 +1,14 @@
 import os
 from typing import Optional
 
-from constants import OpenAIModels, ProcessingDefaults
+from constants import (
+    OpenAIModels,
+    ProcessingDefaults,
+    QdrantDefaults,
+    QuantizationMode,
+    RelevanceGraderMode,
+    RenderExecutor,
+)
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -33,6 +40,168 @@ class Settings(BaseSettings):
     )
     upload_dir: str = Field(default="./uploads", env="UPLOAD_DIR")
 
+    # PDF Rendering Settings
+    pdf_render_executor: RenderExecutor = Field(
+        default=RenderExecutor.PROCESS, env="PDF_RENDER_EXECUTOR"
+    )
+    pdf_render_workers: int = Field(
+        default=min(4, os.cpu_count() or 1), env="PDF_RENDER_WORKERS"
+    )
+    pdf_render_shard_size: int = Field(
+        default=ProcessingDefaults.PDF_RENDER_SHARD_SIZE, env="PDF_RENDER_SHARD_SIZE"
+    )
+    pdf_render_dpi: int = Field(
+        default=ProcessingDefaults.PDF_RENDER_DPI, env="PDF_RENDER_DPI"
+    )
+
+    # Native Text Layer Settings (skip vision for born-digital pages)
+    native_text_fast_path: bool = Field(default=True, env="NATIVE_TEXT_FAST_PATH")
+    native_text_min_chars: int = Field(
+        default=ProcessingDefaults.NATIVE_TEXT_MIN_CHARS, env="NATIVE_TEXT_MIN_CHARS"
+    )
+    native_text_max_image_coverage: float = Field(
+        default=ProcessingDefaults.NATIVE_TEXT_MAX_IMAGE_COVERAGE,
+        env="NATIVE_TEXT_MAX_IMAGE_COVERAGE",
+    )
+    native_text_min_figure_area: float = Field(
+        default=ProcessingDefaults.NATIVE_TEXT_MIN_FIGURE_AREA,
+        env="NATIVE_TEXT_MIN_FIGURE_AREA",
+    )
+    native_text_max_drawings: int = Field(
+        default=ProcessingDefaults.NATIVE_TEXT_MAX_DRAWINGS,
+        env="NATIVE_TEXT_MAX_DRAWINGS",
+    )
+
+    # Page Extraction Cache Settings
+    extraction_cache_enabled: bool = Field(default=True, env="EXTRACTION_CACHE_ENABLED")
+    extraction_cache_path: str = Field(
+        default="./extraction_cache/pages.db", env="EXTRACTION_CACHE_PATH"
+    )
+    extraction_cache_max_bytes: int = Field(
+        default=ProcessingDefaults.EXTRACTION_CACHE_MAX_BYTES,
+        env="EXTRACTION_CACHE_MAX_BYTES",
+    )
+
+    # OpenAI Rate Limit Settings (shared by all documents in the process)
+    openai_requests_per_minute: int = Field(
+        default=ProcessingDefaults.OPENAI_REQUESTS_PER_MINUTE,
+        env="OPENAI_REQUESTS_PER_MINUTE",
+    )
+    openai_tokens_per_minute: int = Field(
+        default=ProcessingDefaults.OPENAI_TOKENS_PER_MINUTE,
+        env="OPENAI_TOKENS_PER_MINUTE",
+    )
+    openai_max_retries: int = Field(default=5, env="OPENAI_MAX_RETRIES")
+    openai_backoff_base_seconds: float = Field(
+        default=1.0, env="OPENAI_BACKOFF_BASE_SECONDS"
+    )
+    openai_backoff_max_seconds: float = Field(
+        default=60.0, env="OPENAI_BACKOFF_MAX_SECONDS"
+    )
+    vision_max_concurrency: int = Field(
+        default=ProcessingDefaults.VISION_MAX_CONCURRENCY, env="VISION_MAX_CONCURRENCY"
+    )
+    vision_estimated_tokens_per_page: int = Field(
+        default=ProcessingDefaults.VISION_ESTIMATED_TOKENS_PER_PAGE,
+        env="VISION_ESTIMATED_TOKENS_PER_PAGE",
+    )
+
+    # Chat Session Settings
+    chat_history_max_turns: int = Field(
+        default=ProcessingDefaults.MAX_CONVERSATION_HISTORY,
+        env="CHAT_HISTORY_MAX_TURNS",
+    )  # Question/answer turns kept per session
+    chat_history_tool_content_chars: int = Field(
+        default=ProcessingDefaults.CHAT_HISTORY_TOOL_CONTENT_CHARS,
+        env="CHAT_HISTORY_TOOL_CONTENT_CHARS",
+    )
+    chat_context_token_budget: int = Field(
+        default=ProcessingDefaults.CHAT_CONTEXT_TOKEN_BUDGET,
+        env="CHAT_CONTEXT_TOKEN_BUDGET",
+    )
+    chat_history_token_budget: int = Field(
+        default=ProcessingDefaults.CHAT_HISTORY_TOKEN_BUDGET,
+        env="CHAT_HISTORY_TOKEN_BUDGET",
+    )
+    relevance_grader: RelevanceGraderMode = Field(
+        default=RelevanceGraderMode.CASCADE, env="RELEVANCE_GRADER"
+    )
+    relevance_grader_model: str = Field(
+        default=OpenAIModels.GPT_4_1_MINI, env="RELEVANCE_GRADER_MODEL"
+    )  # LLM for retrievals the cheaper graders can't decide
+    relevance_accept_score: float = Field(
+        default=ProcessingDefaults.RELEVANCE_ACCEPT_SCORE,
+        env="RELEVANCE_ACCEPT_SCORE",
+    )
+    relevance_reject_score: float = Field(
+        default=ProcessingDefaults.RELEVANCE_REJECT_SCORE,
+        env="RELEVANCE_REJECT_SCORE",
+    )
+    relevance_cross_encoder_model: Optional[str] = Field(
+        default=None, env="RELEVANCE_CROSS_ENCODER_MODEL"
+    )  # e.g. Xenova/ms-marco-MiniLM-L-6-v2; unset skips the cross-encoder
+    relevance_cross_encoder_accept: float = Field(
+        default=ProcessingDefaults.RELEVANCE_CROSS_ENCODER_ACCEPT,
+        env="RELEVANCE_CROSS_ENCODER_ACCEPT",
+    )
+    relevance_cross_encoder_reject: float = Field(
+        default=ProcessingDefaults.RELEVANCE_CROSS_ENCODER_REJECT,
+        env="RELEVANCE_CROSS_ENCODER_REJECT",
+    )
+    chat_session_cache_size: int = Field(
+        default=ProcessingDefaults.CHAT_SESSION_CACHE_SIZE,
+        env="CHAT_SESSION_CACHE_SIZE",
+    )  # 0 disables the in-memory front
+    chat_session_ttl_seconds: int = Field(
+        default=ProcessingDefaults.CHAT_SESSION_TTL_SECONDS,
+        env="CHAT_SESSION_TTL_SECONDS",
+    )
+    chat_session_purge_interval_seconds: int = Field(
+        default=ProcessingDefaults.CHAT_SESSION_PURGE_INTERVAL_SECONDS,
+        env="CHAT_SESSION_PURGE_INTERVAL_SECONDS",
+    )
+
+    # Ingestion Queue Settings
+    ingestion_embedded_worker: bool = Field(
+        default=False, env="INGESTION_EMBEDDED_WORKER"
+    )  # Run a worker inside the API process (single-process development setups)
+    ingestion_worker_concurrency: int = Field(
+        default=2, env="INGESTION_WORKER_CONCURRENCY"
+    )
+    ingestion_poll_interval_seconds: float = Field(
+        default=2.0, env="INGESTION_POLL_INTERVAL_SECONDS"
+    )
+    ingestion_lease_seconds: int = Field(
+        default=ProcessingDefaults.INGESTION_LEASE_SECONDS,
+        env="INGESTION_LEASE_SECONDS",
+    )
+    ingestion_heartbeat_seconds: int = Field(
+        default=ProcessingDefaults.INGESTION_HEARTBEAT_SECONDS,
+        env="INGESTION_HEARTBEAT_SECONDS",
+    )
+    ingestion_max_attempts: int = Field(
+        default=ProcessingDefaults.INGESTION_MAX_ATTEMPTS,
+        env="INGESTION_MAX_ATTEMPTS",
+    )
+    ingestion_retry_backoff_seconds: int = Field(
+        default=ProcessingDefaults.INGESTION_RETRY_BACKOFF_SECONDS,
+        env="INGESTION_RETRY_BACKOFF_SECONDS",
+    )
+    indexing_queue_size: int = Field(
+        default=ProcessingDefaults.INDEXING_QUEUE_SIZE, env="INDEXING_QUEUE_SIZE"
+    )
+    progress_flush_seconds: float = Field(
+        default=ProcessingDefaults.PROGRESS_FLUSH_SECONDS, env="PROGRESS_FLUSH_SECONDS"
+    )
+    progress_events_poll_seconds: float = Field(
+        default=ProcessingDefaults.PROGRESS_EVENTS_POLL_SECONDS,
+        env="PROGRESS_EVENTS_POLL_SECONDS",
+    )
+    progress_events_keepalive_seconds: float = Field(
+        default=ProcessingDefaults.PROGRESS_EVENTS_KEEPALIVE_SECONDS,
+        env="PROGRESS_EVENTS_KEEPALIVE_SECONDS",
+    )
+
     # Database Settings
     database_url: str = Field(
         default="sqlite:///./document_intelligence.db", env="DATABASE_URL"
@@ -42,6 +211,80 @@ class Settings(BaseSettings):
     vector_db_path: str = Field(default="./vector_db", env="VECTOR_DB_PATH")
     qdrant_url: Optional[str] = Field(default=None, env="QDRANT_URL")
     qdrant_api_key: Optional[str] = Field(default=None, env="QDRANT_API_KEY")
+    qdrant_collection: str = Field(
+        default=QdrantDefaults.COLLECTION_ALIAS, env="QDRANT_COLLECTION"
+    )  # Alias of the active collection, swapped by embedding migrations
+    qdrant_alias_refresh_seconds: float = Field(
+        default=30.0, env="QDRANT_ALIAS_REFRESH_SECONDS"
+    )  # How soon a process follows an alias swap
+    embedding_dense_model: str = Field(
+        default=QdrantDefaults.DENSE_MODEL, env="EMBEDDING_DENSE_MODEL"
+    )  # Models for a new collection and the default migration target
+    embedding_sparse_model: str = Field(
+        default=QdrantDefaults.SPARSE_MODEL, env="EMBEDDING_SPARSE_MODEL"
+    )
+    qdrant_prefer_grpc: bool = Field(default=False, env="QDRANT_PREFER_GRPC")
+    qdrant_grpc_port: int = Field(default=6334, env="QDRANT_GRPC_PORT")
+    qdrant_max_connections: int = Field(
+        default=ProcessingDefaults.QDRANT_MAX_CONNECTIONS,
+        env="QDRANT_MAX_CONNECTIONS",
+    )  # Connection pool size of the async (query) client
+    # Collection layout. Startup only warns when an existing collection differs;
+    # apply changes with configure_collection.py (migrate_collection_config)
+    qdrant_quantization: QuantizationMode = Field(
+        default=QuantizationMode.NONE, env="QDRANT_QUANTIZATION"
+    )
+    qdrant_quantization_always_ram: bool = Field(
+        default=True, env="QDRANT_QUANTIZATION_ALWAYS_RAM"
+    )  # Keep quantized vectors in RAM when the originals are on disk
+    qdrant_quantization_rescore: bool = Field(
+        default=True, env="QDRANT_QUANTIZATION_RESCORE"
+    )  # Re-rank quantized candidates with the original vectors
+    qdrant_quantization_oversampling: float = Field(
+        default=ProcessingDefaults.QDRANT_QUANTIZATION_OVERSAMPLING,
+        env="QDRANT_QUANTIZATION_OVERSAMPLING",
+    )
+    qdrant_vectors_on_disk: bool = Field(default=False, env="QDRANT_VECTORS_ON_DISK")
+    qdrant_payload_on_disk: bool = Field(default=False, env="QDRANT_PAYLOAD_ON_DISK")
+    qdrant_sparse_on_disk: bool = Field(default=False, env="QDRANT_SPARSE_ON_DISK")
+    qdrant_hnsw_on_disk: bool = Field(default=False, env="QDRANT_HNSW_ON_DISK")
+    qdrant_hnsw_m: int = Field(
+        default=ProcessingDefaults.QDRANT_HNSW_M, env="QDRANT_HNSW_M"
+    )
+    qdrant_hnsw_ef_construct: int = Field(
+        default=ProcessingDefaults.QDRANT_HNSW_EF_CONSTRUCT,
+        env="QDRANT_HNSW_EF_CONSTRUCT",
+    )
+    embedding_warm_up: bool = Field(
+        default=True, env="EMBEDDING_WARM_UP"
+    )  # Load embedding models at startup instead of on the first query
+    embedding_batch_size: int = Field(
+        default=ProcessingDefaults.EMBEDDING_BATCH_SIZE, env="EMBEDDING_BATCH_SIZE"
+    )
+    embedding_threads: Optional[int] = Field(
+        default=None, env="EMBEDDING_THREADS"
+    )  # ONNX threads per model; None lets onnxruntime use every core
+    embedding_parallel: Optional[int] = Field(
+        default=None, env="EMBEDDING_PARALLEL"
+    )  # Data-parallel embedding processes for large batches; 0 = one per core
+    embedding_providers: Optional[list[str]] = Field(
+        default=None, env="EMBEDDING_PROVIDERS"
+    )  # ONNX execution providers, e.g. ["CUDAExecutionProvider"]
+    qdrant_upload_batch_size: int = Field(
+        default=ProcessingDefaults.QDRANT_UPLOAD_BATCH_SIZE,
+        env="QDRANT_UPLOAD_BATCH_SIZE",
+    )
+    search_batch_size: int = Field(
+        default=ProcessingDefaults.SEARCH_BATCH_SIZE, env="SEARCH_BATCH_SIZE"
+    )
+    query_embedding_cache_size: int = Field(
+        default=ProcessingDefaults.QUERY_EMBEDDING_CACHE_SIZE,
+        env="QUERY_EMBEDDING_CACHE_SIZE",
+    )  # 0 disables the cache
+    query_embedding_cache_ttl_seconds: int = Field(
+        default=ProcessingDefaults.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        env="QUERY_EMBEDDING_CACHE_TTL_SECONDS",
+    )
 
     # LLM API Settings
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
@@ -0,0 +1,53 @@
+"""Apply the QDRANT_* layout settings to the served vector collection.
+
+The API and workers never change the layout of an existing collection; they
+only warn when it differs from their settings. Run this with the settings to
+apply (quantization, on-disk storage, HNSW parameters) to update the
+collection in place. Qdrant rebuilds the affected indexes in the background
+and keeps serving searches meanwhile:
+
+    QDRANT_QUANTIZATION=scalar python configure_collection.py --dry-run
+    QDRANT_QUANTIZATION=scalar python configure_collection.py
+
+Set the same values on the API and workers afterwards, so newly created
+collections get the same layout.
+"""
+
+import argparse
+
+from config import settings
+from db import create_db_and_tables
+from utils.logging import get_logger, setup_logging
+from utils.qdrant_client import get_vector_store
+
+setup_logging(
+    debug=settings.debug,
+    structured_logs=False,
+    log_level="DEBUG" if settings.debug else "INFO",
+)
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only show the changes that would be applied",
+    )
+    args = parser.parse_args()
+
+    create_db_and_tables()
+
+    store = get_vector_store()
+    changes = store.migrate_collection_config(dry_run=args.dry_run)
+    if not changes:
+        logger.info(f"Collection {store.collection_name} already matches settings")
+    elif args.dry_run:
+        logger.info(
+            f"Would update collection {store.collection_name}: {', '.join(changes)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
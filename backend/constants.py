@@ -9,6 +9,33 @@ class DocumentStatus(str, Enum):
     FAILED = "failed"
 
 
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class PageStatus(str, Enum):
+    COMPLETED = "completed"
+    FAILED = "failed"  # Retried on the next processing attempt
+
+
+class JobType(str, Enum):
+    PROCESS = "process"  # Full extraction and indexing
+    CLONE = "clone"  # Reuse content of an identical, already processed document
+
+
+class ProcessingStep:
+    PENDING = "Pending"
+    STARTING = "Starting processing..."
+    EXTRACTING = "Extracting pages..."
+    INDEXING = "Indexing pages..."
+    FINALIZING = "Finalizing..."
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+
 class MessageRole(str, Enum):
     USER = "user"
     ASSISTANT = "assistant"
@@ -33,6 +60,23 @@ class SearchMode(str, Enum):
     SPARSE = "sparse"
 
 
+class RenderExecutor(str, Enum):
+    PROCESS = "process"  # Parallel rendering, one PyMuPDF per worker process
+    THREAD = "thread"  # No forking, for environments that don't allow it
+
+
+class QuantizationMode(str, Enum):
+    NONE = "none"
+    SCALAR = "scalar"  # int8, ~4x less memory
+    BINARY = "binary"  # 1 bit per dimension, ~32x less memory
+
+
+class RelevanceGraderMode(str, Enum):
+    CASCADE = "cascade"  # Retrieval signals, then cross-encoder, LLM when unsure
+    SIGNALS = "signals"  # Never calls a model
+    LLM = "llm"  # LLM grades every retrieval
+
+
 class ProcessingDefaults:
     MAX_FILE_SIZE: Final[int] = 50 * 1024 * 1024
     BASE_CHUNK_SIZE: Final[int] = 1200  # Increased for better context
@@ -46,6 +90,49 @@ class ProcessingDefaults:
     MAX_PAGINATION_LIMIT: Final[int] = 100
     SIMILARITY_THRESHOLD: Final[float] = 0.2
     HIGH_RELEVANCE_SCORE: Final[float] = 0.85
+    PDF_RENDER_DPI: Final[int] = 150
+    PDF_RENDER_SHARD_SIZE: Final[int] = 4  # Pages rendered per pool task
+    NATIVE_TEXT_MIN_CHARS: Final[int] = 200  # Below this a page is treated as scanned
+    NATIVE_TEXT_MAX_IMAGE_COVERAGE: Final[float] = 0.35
+    NATIVE_TEXT_MIN_FIGURE_AREA: Final[float] = (
+        0.03  # Image share that counts as figure
+    )
+    NATIVE_TEXT_MAX_DRAWINGS: Final[int] = 50  # More vector paths suggest a chart
+    EXTRACTION_CACHE_MAX_BYTES: Final[int] = 512 * 1024 * 1024
+    QUERY_EMBEDDING_CACHE_SIZE: Final[int] = 2048
+    EMBEDDING_BATCH_SIZE: Final[int] = 64  # Chunks per ONNX inference call
+    QDRANT_UPLOAD_BATCH_SIZE: Final[int] = 128  # Points per upsert request
+    SEARCH_BATCH_SIZE: Final[int] = 256  # Queries per query_batch_points request
+    QDRANT_MAX_CONNECTIONS: Final[int] = 64
+    QDRANT_HNSW_M: Final[int] = 16  # Qdrant defaults
+    QDRANT_HNSW_EF_CONSTRUCT: Final[int] = 100
+    QDRANT_QUANTIZATION_OVERSAMPLING: Final[float] = 2.0
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: Final[int] = 6 * 60 * 60
+    # Starting budgets, corrected from x-ratelimit-* headers after the first call
+    OPENAI_REQUESTS_PER_MINUTE: Final[int] = 500
+    OPENAI_TOKENS_PER_MINUTE: Final[int] = 450_000
+    VISION_MAX_CONCURRENCY: Final[int] = 16
+    VISION_ESTIMATED_TOKENS_PER_PAGE: Final[int] = 6000  # Prompt + image + max_tokens
+    INGESTION_LEASE_SECONDS: Final[int] = 300  # Job is reclaimed if not renewed
+    INGESTION_HEARTBEAT_SECONDS: Final[int] = 30
+    INGESTION_MAX_ATTEMPTS: Final[int] = 3
+    INGESTION_RETRY_BACKOFF_SECONDS: Final[int] = 30
+    INDEXING_QUEUE_SIZE: Final[int] = 8  # Pages buffered between pipeline stages
+    PROGRESS_FLUSH_SECONDS: Final[float] = 2.0
+    PROGRESS_EVENTS_POLL_SECONDS: Final[float] = 1.0  # DB poll when worker is remote
+    PROGRESS_EVENTS_KEEPALIVE_SECONDS: Final[float] = 15.0
+    CHAT_SESSION_CACHE_SIZE: Final[int] = 256  # Hot sessions kept per process
+    CHAT_SESSION_TTL_SECONDS: Final[int] = 7 * 24 * 60 * 60
+    CHAT_SESSION_PURGE_INTERVAL_SECONDS: Final[int] = 10 * 60
+    CHAT_HISTORY_TOOL_CONTENT_CHARS: Final[int] = 1500  # Per earlier retrieval
+    CHAT_CONTEXT_TOKEN_BUDGET: Final[int] = 6000  # Retrieved chunks per answer
+    CHAT_HISTORY_TOKEN_BUDGET: Final[int] = 4000  # Messages per model call
+    # Retrieval signal score bands: relevant above accept, irrelevant below reject
+    RELEVANCE_ACCEPT_SCORE: Final[float] = 0.6
+    RELEVANCE_REJECT_SCORE: Final[float] = 0.25
+    # Cross-encoder probability bands, same meaning
+    RELEVANCE_CROSS_ENCODER_ACCEPT: Final[float] = 0.7
+    RELEVANCE_CROSS_ENCODER_REJECT: Final[float] = 0.3
     # Legacy constant for backward compatibility
     CHUNK_SIZE: Final[int] = BASE_CHUNK_SIZE
 
@@ -88,6 +175,7 @@ class HTTPMessages:
     UPLOAD_SUCCESS = "Document uploaded successfully"
     DELETE_SUCCESS = "Document deleted successfully"
     PROCESSING_STARTED = "Document processing started"
+    DUPLICATE_REUSED = "Identical document already processed - reusing its content"
     CONVERSATION_CLEARED = "Conversation cleared successfully"
 
 
@@ -121,12 +209,22 @@ class OpenAIModels:
     GPT_4_TURBO = "gpt-4-turbo-preview"
     TEXT_EMBEDDING_SMALL = "text-embedding-3-small"
     TEXT_EMBEDDING_LARGE = "text-embedding-3-large"
+    GPT_4_1 = "gpt-4.1"
+    GPT_4_1_MINI = "gpt-4.1-mini"
+
+
+class VectorCollectionStatus(str, Enum):
+    BUILDING = "building"  # Being filled by an embedding migration
+    ACTIVE = "active"  # Behind the collection alias
+    RETIRED = "retired"  # Replaced by a migration, kept for rollback
 
 
 class QdrantDefaults:
-    COLLECTION_NAME = "hybrid_documents_official"
+    COLLECTION_ALIAS = "hybrid_documents"  # Name searches and writes go through
+    COLLECTION_NAME = "hybrid_documents_official"  # Collection from before aliases
     DENSE_VECTOR_NAME = "dense"
     SPARSE_VECTOR_NAME = "sparse"
     DENSE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     SPARSE_MODEL = "prithivida/Splade_PP_en_v1"
     DEFAULT_DISTANCE = "cosine"
+    HYDRATION_MARGIN = 5  # Extra hits fetched in case chunk content rows are missing
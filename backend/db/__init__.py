@@ -1,7 +1,7 @@
 import os
 
 from config import settings
-from sqlalchemy import Engine
+from sqlalchemy import Engine, inspect
 from sqlmodel import SQLModel, create_engine
 
 # Create database engine
@@ -19,9 +19,45 @@ engine = create_engine(
 def create_db_and_tables():
     """Create database tables."""
     # Import models to register them with SQLModel
-    from db.models import ChatMessage, Conversation, Document
+    from db.models import (
+        ChatMessage,
+        ChunkContent,
+        Conversation,
+        Document,
+        DocumentPage,
+        IngestionJob,
+        SessionCheckpoint,
+        SessionCheckpointWrite,
+        VectorCollection,
+    )
 
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns():
+    """Add columns introduced after a table was first created.
+
+    ``create_all`` only creates missing tables, so new nullable columns (and
+    their indexes) are added to existing databases here.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                )
+
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
 
 
 def get_engine() -> Engine:
@@ -1,7 +1,14 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from constants import DocumentStatus, MessageRole
+from constants import (
+    DocumentStatus,
+    JobStatus,
+    JobType,
+    MessageRole,
+    PageStatus,
+    VectorCollectionStatus,
+)
 from sqlmodel import Field, Relationship, SQLModel
 from utils.serialization import (
     ModelJSONMixin,
@@ -51,6 +58,36 @@ class Document(SQLModel, ModelJSONMixin, table=True):
         default=None, description="Serialized MarkdownDocument JSON"
     )
 
+    content_hash: Optional[str] = Field(
+        default=None,
+        unique=True,
+        index=True,
+        description="SHA-256 of the uploaded file, set on the canonical copy only",
+    )
+    duplicate_of: Optional[str] = Field(
+        default=None,
+        description="Document whose extracted content was reused for this upload",
+    )
+
+    # Live processing progress, flushed periodically by the processing worker
+    pages_total: Optional[int] = Field(default=None, description="Pages in the PDF")
+    pages_rendered: Optional[int] = Field(
+        default=None, description="Pages rendered or read from the text layer"
+    )
+    pages_extracted: Optional[int] = Field(
+        default=None, description="Pages with extracted content"
+    )
+    pages_indexed: Optional[int] = Field(
+        default=None, description="Pages whose chunks are in Qdrant"
+    )
+    chunks_embedded: Optional[int] = Field(default=None, description="Chunks embedded")
+    chunks_upserted: Optional[int] = Field(
+        default=None, description="Chunks upserted to Qdrant"
+    )
+    progress_updated_at: Optional[datetime] = Field(
+        default=None, description="Last progress update"
+    )
+
     conversations: List["Conversation"] = Relationship(back_populates="document")
 
     @property
@@ -74,6 +111,160 @@ class Document(SQLModel, ModelJSONMixin, table=True):
         self.markdown_content = serialize_metadata(value)
 
 
+class DocumentPage(SQLModel, table=True):
+    """Checkpointed extraction result for a single page of a document."""
+
+    document_id: str = Field(primary_key=True, description="Parent document")
+    page_number: int = Field(primary_key=True, description="Zero-based page index")
+
+    status: str = Field(default=PageStatus.COMPLETED, description="Page status")
+    source: Optional[str] = Field(default=None, description="native, vision or cache")
+    page_json: Optional[str] = Field(
+        default=None, description="Serialized MarkdownPage JSON"
+    )
+    tokens_used: int = Field(default=0, description="OpenAI tokens spent on the page")
+    indexed: bool = Field(
+        default=False, description="Whether the page's chunks are in Qdrant"
+    )
+    attempts: int = Field(default=1, description="Extraction attempts so far")
+    error_message: Optional[str] = Field(
+        default=None, description="Error from the latest failed attempt"
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.now, description="Last update timestamp"
+    )
+
+
+class ChunkContent(SQLModel, table=True):
+    """Text and chunker metadata of an indexed chunk.
+
+    Qdrant payloads only hold the fields used for filtering and attribution;
+    the content is looked up here for the final search results.
+    """
+
+    point_id: str = Field(primary_key=True, description="Qdrant point id")
+    document_id: str = Field(index=True, description="Parent document")
+    page_number: int = Field(description="Zero-based page index")
+    content: str = Field(description="Chunk text")
+    metadata_json: Optional[str] = Field(
+        default=None, description="Serialized chunker metadata"
+    )
+
+    @property
+    def chunk_metadata(self) -> Dict[str, Any]:
+        return deserialize_metadata(self.metadata_json)
+
+    @chunk_metadata.setter
+    def chunk_metadata(self, value: Optional[Dict[str, Any]]):
+        self.metadata_json = serialize_metadata(value)
+
+
+class VectorCollection(SQLModel, table=True):
+    """A Qdrant collection and the embedding models its vectors come from."""
+
+    collection_name: str = Field(primary_key=True, description="Qdrant collection")
+    dense_model: str = Field(description="fastembed dense model")
+    sparse_model: str = Field(description="fastembed sparse model")
+    status: str = Field(
+        default=VectorCollectionStatus.BUILDING, description="Migration state"
+    )
+    created_at: datetime = Field(
+        default_factory=datetime.now, description="Creation timestamp"
+    )
+    activated_at: Optional[datetime] = Field(
+        default=None, description="When the alias was pointed at it"
+    )
+
+
+class IngestionJob(SQLModel, table=True):
+    """Durable queue entry for document ingestion, claimed by workers with a lease."""
+
+    job_id: str = Field(primary_key=True, description="Unique job identifier")
+    document_id: str = Field(index=True, description="Document to ingest")
+    job_type: str = Field(default=JobType.PROCESS, description="process or clone")
+    file_path: str = Field(description="Path to stored file")
+    source_document_id: Optional[str] = Field(
+        default=None, description="Document whose content is reused (clone jobs)"
+    )
+    extract_tables: bool = Field(default=True)
+    extract_figures: bool = Field(default=True)
+    force: bool = Field(
+        default=False, description="Discard page checkpoints on the first attempt"
+    )
+
+    status: str = Field(
+        default=JobStatus.QUEUED, index=True, description="Queue status"
+    )
+    attempts: int = Field(default=0, description="Number of times the job was claimed")
+    max_attempts: int = Field(default=3, description="Attempts before giving up")
+    available_at: datetime = Field(
+        default_factory=datetime.now, description="Earliest time the job may run"
+    )
+
+    worker_id: Optional[str] = Field(default=None, description="Current lease owner")
+    lease_expires_at: Optional[datetime] = Field(
+        default=None, description="Lease expiry; expired jobs are reclaimed"
+    )
+    heartbeat_at: Optional[datetime] = Field(
+        default=None, description="Last heartbeat from the lease owner"
+    )
+
+    created_at: datetime = Field(
+        default_factory=datetime.now, description="Enqueue timestamp"
+    )
+    started_at: Optional[datetime] = Field(
+        default=None, description="Start of the latest attempt"
+    )
+    completed_at: Optional[datetime] = Field(
+        default=None, description="Completion or final failure time"
+    )
+    error_message: Optional[str] = Field(
+        default=None, description="Error from the latest failed attempt"
+    )
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class SessionCheckpoint(SQLModel, table=True):
+    """Latest LangGraph checkpoint of a chat session (older ones are not kept)."""
+
+    thread_id: str = Field(primary_key=True, description="Chat session id")
+    checkpoint_ns: str = Field(
+        default="", primary_key=True, description="Subgraph namespace"
+    )
+    checkpoint_id: str = Field(description="LangGraph checkpoint id")
+    parent_checkpoint_id: Optional[str] = Field(
+        default=None, description="Checkpoint this one was created from"
+    )
+    checkpoint_type: str = Field(description="Serializer type of checkpoint_blob")
+    checkpoint_blob: bytes = Field(description="Serialized checkpoint")
+    metadata_type: str = Field(description="Serializer type of metadata_blob")
+    metadata_blob: bytes = Field(description="Serialized checkpoint metadata")
+    updated_at: datetime = Field(
+        default_factory=datetime.now,
+        index=True,
+        description="Last write, for idle session eviction",
+    )
+
+
+class SessionCheckpointWrite(SQLModel, table=True):
+    """Pending write of a task against a session's latest checkpoint."""
+
+    thread_id: str = Field(primary_key=True, description="Chat session id")
+    checkpoint_ns: str = Field(
+        default="", primary_key=True, description="Subgraph namespace"
+    )
+    checkpoint_id: str = Field(primary_key=True, description="LangGraph checkpoint id")
+    task_id: str = Field(primary_key=True, description="Task that made the write")
+    idx: int = Field(primary_key=True, description="Write index within the task")
+    channel: str = Field(description="Channel written to")
+    value_type: str = Field(description="Serializer type of value_blob")
+    value_blob: bytes = Field(description="Serialized value")
+    task_path: str = Field(default="", description="Path of the task")
+
+
 class Conversation(SQLModel, table=True):
     """Conversation model for storing chat sessions."""
 
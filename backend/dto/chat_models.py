@@ -55,6 +55,22 @@ class ChatRequest(BaseModel):
     )
 
 
+class TokenUsage(BaseModel):
+    """Tokens spent answering a question."""
+
+    prompt_tokens: int = Field(default=0, description="Prompt tokens, all model calls")
+    completion_tokens: int = Field(
+        default=0, description="Completion tokens, all model calls"
+    )
+    total_tokens: int = Field(default=0, description="Prompt plus completion tokens")
+    context_tokens: int = Field(
+        default=0, description="Retrieved context packed into the answer prompt"
+    )
+    history_tokens: int = Field(
+        default=0, description="Conversation history sent to the model"
+    )
+
+
 class ChatResponse(BaseModel):
     """Response model for chat/ask endpoint."""
 
@@ -70,6 +86,9 @@ class ChatResponse(BaseModel):
     documents_searched: int = Field(
         default=0, description="Number of documents searched"
     )
+    token_usage: Optional[TokenUsage] = Field(
+        default=None, description="Token accounting for this turn"
+    )
 
 
 class ChatMessageDto(BaseModel):
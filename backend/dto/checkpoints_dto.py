@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import List, Optional
+
+from db.models import SessionCheckpoint, SessionCheckpointWrite
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+# Keeps IN (...) lists well below SQLite's bound parameter limit
+_LOOKUP_BATCH_SIZE = 500
+
+
+class CheckpointsDto:
+    """Latest conversation checkpoint per chat session and its pending writes."""
+
+    def __init__(self, db_engine):
+        self.__db_engine = db_engine
+
+    def get_checkpoint(
+        self, thread_id: str, checkpoint_ns: str = ""
+    ) -> Optional[SessionCheckpoint]:
+        with Session(self.__db_engine) as session:
+            return session.get(SessionCheckpoint, (thread_id, checkpoint_ns))
+
+    def get_checkpoint_id(
+        self, thread_id: str, checkpoint_ns: str = ""
+    ) -> Optional[str]:
+        """Id of the stored checkpoint, without loading the checkpoint itself."""
+        with Session(self.__db_engine) as session:
+            return session.exec(
+                select(SessionCheckpoint.checkpoint_id).where(
+                    SessionCheckpoint.thread_id == thread_id,
+                    SessionCheckpoint.checkpoint_ns == checkpoint_ns,
+                )
+            ).first()
+
+    def get_writes(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> List[SessionCheckpointWrite]:
+        with Session(self.__db_engine) as session:
+            return session.exec(
+                select(SessionCheckpointWrite)
+                .where(
+                    SessionCheckpointWrite.thread_id == thread_id,
+                    SessionCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                    SessionCheckpointWrite.checkpoint_id == checkpoint_id,
+                )
+                .order_by(SessionCheckpointWrite.task_id, SessionCheckpointWrite.idx)
+            ).all()
+
+    def save_checkpoint(self, checkpoint: SessionCheckpoint) -> None:
+        """Replace the session's checkpoint and drop writes of the previous one."""
+        with Session(self.__db_engine) as session:
+            session.merge(checkpoint)
+            session.exec(
+                delete(SessionCheckpointWrite).where(
+                    SessionCheckpointWrite.thread_id == checkpoint.thread_id,
+                    SessionCheckpointWrite.checkpoint_ns == checkpoint.checkpoint_ns,
+                    SessionCheckpointWrite.checkpoint_id != checkpoint.checkpoint_id,
+                )
+            )
+            session.commit()
+
+    def save_writes(self, writes: List[SessionCheckpointWrite]) -> None:
+        """Store task writes.
+
+        Regular writes are stored once; special ones (errors, interrupts, with
+        a negative index) replace the previous value.
+        """
+        if not writes:
+            return
+
+        with Session(self.__db_engine) as session:
+            for write in writes:
+                if write.idx >= 0 and session.get(
+                    SessionCheckpointWrite,
+                    (
+                        write.thread_id,
+                        write.checkpoint_ns,
+                        write.checkpoint_id,
+                        write.task_id,
+                        write.idx,
+                    ),
+                ):
+                    continue
+                session.merge(write)
+            session.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with Session(self.__db_engine) as session:
+            session.exec(
+                delete(SessionCheckpointWrite).where(
+                    SessionCheckpointWrite.thread_id == thread_id
+                )
+            )
+            session.exec(
+                delete(SessionCheckpoint).where(
+                    SessionCheckpoint.thread_id == thread_id
+                )
+            )
+            session.commit()
+
+    def delete_idle(self, updated_before: datetime) -> List[str]:
+        """Delete sessions not written since ``updated_before``; returns their ids."""
+        with Session(self.__db_engine) as session:
+            thread_ids = list(
+                set(
+                    session.exec(
+                        select(SessionCheckpoint.thread_id).where(
+                            SessionCheckpoint.updated_at < updated_before
+                        )
+                    ).all()
+                )
+            )
+            for start in range(0, len(thread_ids), _LOOKUP_BATCH_SIZE):
+                batch = thread_ids[start : start + _LOOKUP_BATCH_SIZE]
+                # Re-checks the age, so a session written meanwhile survives
+                session.exec(
+                    delete(SessionCheckpoint).where(
+                        SessionCheckpoint.thread_id.in_(batch),
+                        SessionCheckpoint.updated_at < updated_before,
+                    )
+                )
+                session.exec(
+                    delete(SessionCheckpointWrite).where(
+                        SessionCheckpointWrite.thread_id.in_(batch),
+                        SessionCheckpointWrite.thread_id.not_in(
+                            select(SessionCheckpoint.thread_id)
+                        ),
+                    )
+                )
+            session.commit()
+            return thread_ids
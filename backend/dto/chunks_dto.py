@@ -0,0 +1,126 @@
+from typing import Dict, List
+
+from db.models import ChunkContent
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+# Keeps IN (...) lists well below SQLite's bound parameter limit
+_LOOKUP_BATCH_SIZE = 500
+# Rows per insert statement, with one bound parameter per column
+_UPSERT_BATCH_SIZE = 100
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class ChunksDto:
+    """Chunk content stored next to the slim Qdrant payloads."""
+
+    def __init__(self, db_engine):
+        self.__db_engine = db_engine
+
+    def save_chunks(self, chunks: List[ChunkContent]) -> None:
+        if not chunks:
+            return
+
+        with Session(self.__db_engine) as session:
+            # Chunk ids are deterministic, so a re-indexed chunk replaces its row
+            insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+            if insert is None:
+                for chunk in chunks:
+                    session.merge(chunk)
+                session.commit()
+                return
+
+            columns = [column.name for column in ChunkContent.__table__.columns]
+            for start in range(0, len(chunks), _UPSERT_BATCH_SIZE):
+                statement = insert(ChunkContent).values(
+                    [
+                        {column: getattr(chunk, column) for column in columns}
+                        for chunk in chunks[start : start + _UPSERT_BATCH_SIZE]
+                    ]
+                )
+                session.exec(
+                    statement.on_conflict_do_update(
+                        index_elements=[ChunkContent.point_id],
+                        set_={
+                            column: statement.excluded[column]
+                            for column in columns
+                            if column != "point_id"
+                        },
+                    )
+                )
+            session.commit()
+
+    def get_chunks(self, point_ids: List[str]) -> Dict[str, ChunkContent]:
+        """Return stored chunks by Qdrant point id; unknown ids are left out."""
+        point_ids = [str(point_id) for point_id in point_ids]
+        chunks: Dict[str, ChunkContent] = {}
+
+        with Session(self.__db_engine) as session:
+            for start in range(0, len(point_ids), _LOOKUP_BATCH_SIZE):
+                rows = session.exec(
+                    select(ChunkContent).where(
+                        ChunkContent.point_id.in_(
+                            point_ids[start : start + _LOOKUP_BATCH_SIZE]
+                        )
+                    )
+                ).all()
+                chunks.update((row.point_id, row) for row in rows)
+
+        return chunks
+
+    def copy_chunks(self, point_ids: Dict[str, str], document_id: str) -> None:
+        """Copy chunks to new point ids (old id -> new id) of another document."""
+        sources = self.get_chunks(list(point_ids))
+        self.save_chunks(
+            [
+                ChunkContent(
+                    point_id=point_ids[point_id],
+                    document_id=document_id,
+                    page_number=source.page_number,
+                    content=source.content,
+                    metadata_json=source.metadata_json,
+                )
+                for point_id, source in sources.items()
+            ]
+        )
+
+    def delete_chunks(self, point_ids: List[str]) -> int:
+        point_ids = [str(point_id) for point_id in point_ids]
+        deleted = 0
+
+        with Session(self.__db_engine) as session:
+            for start in range(0, len(point_ids), _LOOKUP_BATCH_SIZE):
+                result = session.exec(
+                    delete(ChunkContent).where(
+                        ChunkContent.point_id.in_(
+                            point_ids[start : start + _LOOKUP_BATCH_SIZE]
+                        )
+                    )
+                )
+                deleted += result.rowcount
+            session.commit()
+
+        return deleted
+
+    def delete_other_pages(self, document_id: str, page_numbers: List[int]) -> int:
+        """Drop chunks of a document that aren't on one of ``page_numbers``."""
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                delete(ChunkContent).where(
+                    ChunkContent.document_id == document_id,
+                    ChunkContent.page_number.not_in(page_numbers),
+                )
+            )
+            session.commit()
+            return result.rowcount
+
+    def delete_document_chunks(self, document_id: str) -> int:
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                delete(ChunkContent).where(ChunkContent.document_id == document_id)
+            )
+            session.commit()
+            return result.rowcount
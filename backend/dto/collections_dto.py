@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional
+
+from constants import VectorCollectionStatus
+from db.models import VectorCollection
+from sqlalchemy import update
+from sqlmodel import Session
+
+
+class VectorCollectionsDto:
+    """Which embedding models built each Qdrant collection."""
+
+    def __init__(self, db_engine):
+        self.__db_engine = db_engine
+
+    def get_collection(self, collection_name: str) -> Optional[VectorCollection]:
+        with Session(self.__db_engine) as session:
+            return session.get(VectorCollection, collection_name)
+
+    def register_collection(
+        self, collection_name: str, dense_model: str, sparse_model: str
+    ) -> None:
+        with Session(self.__db_engine) as session:
+            session.merge(
+                VectorCollection(
+                    collection_name=collection_name,
+                    dense_model=dense_model,
+                    sparse_model=sparse_model,
+                )
+            )
+            session.commit()
+
+    def mark_active(self, collection_name: str) -> None:
+        """Record an alias swap: the collection is active, all others retired."""
+        with Session(self.__db_engine) as session:
+            session.exec(
+                update(VectorCollection)
+                .where(
+                    VectorCollection.collection_name != collection_name,
+                    VectorCollection.status == VectorCollectionStatus.ACTIVE,
+                )
+                .values(status=VectorCollectionStatus.RETIRED)
+            )
+            session.exec(
+                update(VectorCollection)
+                .where(VectorCollection.collection_name == collection_name)
+                .values(
+                    status=VectorCollectionStatus.ACTIVE, activated_at=datetime.now()
+                )
+            )
+            session.commit()
@@ -1,17 +1,68 @@
+import hashlib
 import os
-import shutil
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from config import settings
+from constants import DocumentStatus, ProcessingStep
 from db.models import Conversation, Document
 from fastapi import UploadFile
 from fastapi.exceptions import HTTPException
 from pydantic import BaseModel
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
+PROGRESS_COUNTERS = (
+    "pages_total",
+    "pages_rendered",
+    "pages_extracted",
+    "pages_indexed",
+    "chunks_embedded",
+    "chunks_upserted",
+)
+
+# Share of the progress bar given to each per-page step
+_STEP_WEIGHTS = {
+    "pages_rendered": 0.1,
+    "pages_extracted": 0.6,
+    "pages_indexed": 0.3,
+}
+
+
+def summarize_progress(status: str, counters: Dict[str, int]) -> Dict[str, Any]:
+    """Derive the overall percentage and current step from progress counters."""
+    if status == DocumentStatus.COMPLETED:
+        return {"progress_percentage": 100.0, "current_step": ProcessingStep.COMPLETED}
+    if status == DocumentStatus.FAILED:
+        return {"progress_percentage": 0.0, "current_step": ProcessingStep.FAILED}
+    if status != DocumentStatus.PROCESSING:
+        return {"progress_percentage": 0.0, "current_step": ProcessingStep.PENDING}
+
+    pages_total = counters.get("pages_total") or 0
+    if not pages_total:
+        return {"progress_percentage": 0.0, "current_step": ProcessingStep.STARTING}
+
+    done = sum(
+        weight * min(counters.get(counter) or 0, pages_total) / pages_total
+        for counter, weight in _STEP_WEIGHTS.items()
+    )
+
+    if (counters.get("pages_extracted") or 0) < pages_total:
+        current_step = ProcessingStep.EXTRACTING
+    elif (counters.get("pages_indexed") or 0) < pages_total:
+        current_step = ProcessingStep.INDEXING
+    else:
+        current_step = ProcessingStep.FINALIZING
+
+    # 100% is reserved for the completed status
+    return {
+        "progress_percentage": round(min(done * 100, 99.0), 1),
+        "current_step": current_step,
+    }
+
 
 class DocumentContent(BaseModel):
     """Document content model for updates."""
@@ -30,8 +81,13 @@ class DocumentsDto:
         file_size: int,
         file_path: str,
         document_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> Dict[str, any]:
-        """Save uploaded document to database."""
+        """Save uploaded document to database.
+
+        When ``content_hash`` matches a completed document, the new document is
+        recorded as its duplicate (``duplicate_of``) so its content can be reused.
+        """
         with Session(self.__db_engine) as session:
             if document_id:
                 # Update existing document
@@ -52,6 +108,23 @@ class DocumentsDto:
                         "document": found_document,
                     }
 
+            duplicate_of = None
+            if content_hash:
+                existing = session.exec(
+                    select(Document).where(Document.content_hash == content_hash)
+                ).first()
+                if existing is not None:
+                    if existing.status == DocumentStatus.COMPLETED:
+                        duplicate_of = existing.document_id
+                        content_hash = None
+                    elif existing.status == DocumentStatus.FAILED:
+                        # A failed copy is no use to anyone - this upload takes over
+                        existing.content_hash = None
+                        session.add(existing)
+                    else:
+                        # Still processing - extract independently
+                        content_hash = None
+
             # Create new document
             new_document_id = document_id or str(uuid.uuid4())
             new_document = Document(
@@ -60,10 +133,19 @@ class DocumentsDto:
                 file_path=file_path,
                 file_size=file_size,
                 status="pending",
+                content_hash=content_hash,
+                duplicate_of=duplicate_of,
             )
 
             session.add(new_document)
-            session.commit()
+            try:
+                session.commit()
+            except IntegrityError:
+                # A concurrent upload of the same file claimed the hash first
+                session.rollback()
+                new_document.content_hash = None
+                session.add(new_document)
+                session.commit()
             session.refresh(new_document)
 
             return {
@@ -181,7 +263,7 @@ class DocumentsDto:
             }
 
     def save_uploaded_file(self, file: UploadFile) -> Dict[str, str]:
-        """Save uploaded file to disk."""
+        """Save uploaded file to disk, hashing it as it is copied."""
         # Generate unique filename
         file_extension = Path(file.filename).suffix
         unique_filename = f"{uuid.uuid4()}{file_extension}"
@@ -189,43 +271,64 @@ class DocumentsDto:
 
         # Save file
         try:
+            content_hash = hashlib.sha256()
             with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+                while chunk := file.file.read(1024 * 1024):
+                    content_hash.update(chunk)
+                    buffer.write(chunk)
 
             return {
                 "file_path": file_path,
                 "filename": file.filename,
                 "saved_filename": unique_filename,
+                "content_hash": content_hash.hexdigest(),
             }
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
 
-    def get_processing_progress(self, document_id: str) -> Dict[str, any]:
-        """Get document processing progress."""
+    def update_processing_progress(
+        self,
+        document_id: str,
+        progress_updated_at: datetime,
+        **counters: int,
+    ) -> None:
+        """Store live progress counters without loading the document."""
+        with Session(self.__db_engine) as session:
+            session.exec(
+                update(Document)
+                .where(Document.document_id == document_id)
+                .values(progress_updated_at=progress_updated_at, **counters)
+            )
+            session.commit()
+
+    def get_processing_progress(
+        self, document_id: str, live_counters: Optional[Dict[str, int]] = None
+    ) -> Dict[str, any]:
+        """Get document processing progress.
+
+        ``live_counters`` (from an in-process tracker) take precedence over the
+        last values flushed to the database.
+        """
         with Session(self.__db_engine) as session:
             document = session.get(Document, document_id)
 
             if document is None:
                 raise HTTPException(status_code=404, detail="Document not found")
 
-            progress_percentage = 0.0
-            current_step = "Pending"
-
-            if document.status == "processing":
-                current_step = "Processing PDF..."
-                progress_percentage = 50.0
-            elif document.status == "completed":
-                current_step = "Completed"
-                progress_percentage = 100.0
-            elif document.status == "failed":
-                current_step = "Failed"
-                progress_percentage = 0.0
+            counters = {
+                counter: getattr(document, counter) or 0
+                for counter in PROGRESS_COUNTERS
+            }
+            if live_counters and document.status == DocumentStatus.PROCESSING:
+                counters.update(
+                    {counter: live_counters[counter] for counter in PROGRESS_COUNTERS}
+                )
 
             return {
                 "document_id": document_id,
                 "status": document.status,
-                "progress_percentage": progress_percentage,
-                "current_step": current_step,
+                **summarize_progress(document.status, counters),
+                **counters,
                 "tables_count": (
                     document.tables_count if document.tables_count > 0 else None
                 ),
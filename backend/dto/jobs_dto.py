@@ -0,0 +1,293 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from config import settings
+from constants import DocumentStatus, JobStatus, JobType
+from db.models import Document, IngestionJob
+from sqlalchemy import and_, func, or_, update
+from sqlmodel import Session, select
+
+
+class JobsDto:
+    """Durable ingestion queue backed by the ``ingestionjob`` table.
+
+    Jobs are claimed with an optimistic conditional UPDATE, so any number of
+    workers on any number of machines can share one database without extra
+    locking. A claim is a lease: the owner must heartbeat before it expires or
+    the job becomes claimable again.
+    """
+
+    def __init__(self, db_engine):
+        self.__db_engine = db_engine
+
+    def enqueue_job(
+        self,
+        document_id: str,
+        file_path: str,
+        job_type: str = JobType.PROCESS,
+        source_document_id: Optional[str] = None,
+        extract_tables: bool = True,
+        extract_figures: bool = True,
+        force: bool = False,
+    ) -> IngestionJob:
+        """Queue a document for ingestion, reusing an active job if one exists."""
+        with Session(self.__db_engine) as session:
+            active_job = session.exec(
+                select(IngestionJob).where(
+                    IngestionJob.document_id == document_id,
+                    IngestionJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+                )
+            ).first()
+            if active_job is not None:
+                return active_job
+
+            job = IngestionJob(
+                job_id=str(uuid.uuid4()),
+                document_id=document_id,
+                job_type=job_type,
+                file_path=file_path,
+                source_document_id=source_document_id,
+                extract_tables=extract_tables,
+                extract_figures=extract_figures,
+                force=force,
+                max_attempts=settings.ingestion_max_attempts,
+            )
+
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+
+            return job
+
+    def get_latest_job(self, document_id: str) -> Optional[IngestionJob]:
+        """Get the most recently queued job for a document."""
+        with Session(self.__db_engine) as session:
+            return session.exec(
+                select(IngestionJob)
+                .where(IngestionJob.document_id == document_id)
+                .order_by(IngestionJob.created_at.desc())
+            ).first()
+
+    def claim_next_job(
+        self, worker_id: str, lease_seconds: int, candidates: int = 5
+    ) -> Optional[IngestionJob]:
+        """Claim the oldest runnable job, including jobs whose lease has expired.
+
+        Returns None when nothing is runnable or every candidate was claimed by
+        another worker first.
+        """
+        now = datetime.now()
+        claimable = or_(
+            and_(
+                IngestionJob.status == JobStatus.QUEUED,
+                IngestionJob.available_at <= now,
+            ),
+            and_(
+                IngestionJob.status == JobStatus.RUNNING,
+                IngestionJob.lease_expires_at < now,
+            ),
+        )
+
+        with Session(self.__db_engine) as session:
+            jobs = session.exec(
+                select(IngestionJob)
+                .where(claimable)
+                .order_by(IngestionJob.available_at)
+                .limit(candidates)
+            ).all()
+
+            for job in jobs:
+                if job.attempts >= job.max_attempts:
+                    # The previous owner died on its last attempt
+                    self._fail_abandoned_job(session, job, now)
+                    continue
+
+                claimed = session.exec(
+                    update(IngestionJob)
+                    .where(
+                        IngestionJob.job_id == job.job_id,
+                        IngestionJob.status == job.status,
+                        IngestionJob.attempts == job.attempts,
+                    )
+                    .values(
+                        status=JobStatus.RUNNING,
+                        attempts=job.attempts + 1,
+                        worker_id=worker_id,
+                        lease_expires_at=now + timedelta(seconds=lease_seconds),
+                        heartbeat_at=now,
+                        started_at=now,
+                    )
+                )
+                session.commit()
+
+                if claimed.rowcount == 1:
+                    session.refresh(job)
+                    return job
+
+        return None
+
+    def _fail_abandoned_job(
+        self, session: Session, job: IngestionJob, now: datetime
+    ) -> None:
+        """Give up on a job whose owner died during its final attempt."""
+        error_message = job.error_message or "Worker lease expired on the final attempt"
+        abandoned = session.exec(
+            update(IngestionJob)
+            .where(
+                IngestionJob.job_id == job.job_id,
+                IngestionJob.status == job.status,
+                IngestionJob.attempts == job.attempts,
+            )
+            .values(
+                status=JobStatus.FAILED,
+                completed_at=now,
+                error_message=error_message,
+            )
+        )
+
+        if abandoned.rowcount == 1:
+            # Nobody is left to report the failure on the document itself
+            document = session.get(Document, job.document_id)
+            if document is not None and document.status == DocumentStatus.PROCESSING:
+                document.status = DocumentStatus.FAILED
+                document.processing_completed_at = now
+                document.error_message = error_message
+                session.add(document)
+
+        session.commit()
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extend the lease on a running job. Returns False if the lease was lost."""
+        now = datetime.now()
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.status == JobStatus.RUNNING,
+                )
+                .values(
+                    heartbeat_at=now,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                )
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def complete_job(self, job_id: str, worker_id: str) -> bool:
+        """Mark a job completed. Returns False if the lease was lost."""
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.status == JobStatus.RUNNING,
+                )
+                .values(
+                    status=JobStatus.COMPLETED,
+                    completed_at=datetime.now(),
+                    lease_expires_at=None,
+                    error_message=None,
+                )
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def release_job(self, job_id: str, worker_id: str) -> bool:
+        """Hand a running job back to the queue without counting the attempt.
+
+        Used on graceful worker shutdown so the job doesn't wait out its lease.
+        """
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.status == JobStatus.RUNNING,
+                )
+                .values(
+                    status=JobStatus.QUEUED,
+                    attempts=IngestionJob.attempts - 1,
+                    worker_id=None,
+                    lease_expires_at=None,
+                    available_at=datetime.now(),
+                )
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def fail_job(
+        self, job_id: str, worker_id: str, error_message: str
+    ) -> Optional[str]:
+        """Record a failed attempt, requeueing with backoff while attempts remain.
+
+        Returns the resulting job status, or None if the lease was lost.
+        """
+        with Session(self.__db_engine) as session:
+            job = session.get(IngestionJob, job_id)
+            if (
+                job is None
+                or job.worker_id != worker_id
+                or job.status != JobStatus.RUNNING
+            ):
+                return None
+
+            now = datetime.now()
+            if job.attempts < job.max_attempts:
+                backoff = settings.ingestion_retry_backoff_seconds * (
+                    2 ** (job.attempts - 1)
+                )
+                outcome = {
+                    "status": JobStatus.QUEUED,
+                    "available_at": now + timedelta(seconds=backoff),
+                }
+            else:
+                outcome = {"status": JobStatus.FAILED, "completed_at": now}
+
+            # Conditional, like the claim: a takeover since the read wins
+            result = session.exec(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.job_id == job_id,
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.status == JobStatus.RUNNING,
+                    IngestionJob.attempts == job.attempts,
+                )
+                .values(error_message=error_message, lease_expires_at=None, **outcome)
+            )
+            session.commit()
+
+            return outcome["status"] if result.rowcount == 1 else None
+
+    def cancel_jobs(self, document_id: str) -> int:
+        """Drop queued jobs for a document (e.g. when it is deleted)."""
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.document_id == document_id,
+                    IngestionJob.status == JobStatus.QUEUED,
+                )
+                .values(
+                    status=JobStatus.FAILED,
+                    completed_at=datetime.now(),
+                    error_message="Cancelled",
+                )
+            )
+            session.commit()
+            return result.rowcount
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Count jobs by status."""
+        with Session(self.__db_engine) as session:
+            rows = session.exec(
+                select(IngestionJob.status, func.count()).group_by(IngestionJob.status)
+            ).all()
+
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({status: count for status, count in rows})
+        return counts
@@ -141,6 +141,20 @@ class OpenAIExtractionResponse(BaseModel):
     total_tokens_used: Optional[int] = Field(
         None, description="Tokens used for extraction"
     )
+    native_pages: int = Field(
+        default=0, description="Pages extracted from the PDF text layer"
+    )
+    vision_pages: int = Field(
+        default=0, description="Pages extracted with the vision model"
+    )
+    cache_hits: int = Field(
+        default=0, description="Vision pages served from the extraction cache"
+    )
+    cache_misses: int = Field(default=0, description="Vision pages sent to the API")
+    failed_pages: List[int] = Field(
+        default_factory=list,
+        description="Pages that could not be extracted and should be retried",
+    )
     extraction_timestamp: datetime = Field(
         default_factory=datetime.now, description="When extraction was completed"
     )
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Dict, NamedTuple
+
+from constants import PageStatus
+from db.models import DocumentPage
+from dto.openai_models import MarkdownPage
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+
+
+class CheckpointedPage(NamedTuple):
+    page: MarkdownPage
+    tokens_used: int
+    indexed: bool
+
+
+class DocumentPagesDto:
+    """Per-page extraction checkpoints, so interrupted documents can resume."""
+
+    def __init__(self, db_engine):
+        self.__db_engine = db_engine
+
+    def get_completed_pages(self, document_id: str) -> Dict[int, CheckpointedPage]:
+        """Return successfully extracted pages with their cost and index state."""
+        with Session(self.__db_engine) as session:
+            rows = session.exec(
+                select(DocumentPage).where(
+                    DocumentPage.document_id == document_id,
+                    DocumentPage.status == PageStatus.COMPLETED,
+                )
+            ).all()
+
+        return {
+            row.page_number: CheckpointedPage(
+                page=MarkdownPage.model_validate_json(row.page_json),
+                tokens_used=row.tokens_used,
+                indexed=bool(row.indexed),
+            )
+            for row in rows
+        }
+
+    def save_page(
+        self,
+        document_id: str,
+        page_number: int,
+        page: MarkdownPage,
+        tokens_used: int,
+        source: str,
+    ) -> None:
+        """Checkpoint a successfully extracted page."""
+        with Session(self.__db_engine) as session:
+            row = session.get(DocumentPage, (document_id, page_number))
+            if row is None:
+                row = DocumentPage(document_id=document_id, page_number=page_number)
+            else:
+                row.attempts += 1
+
+            row.status = PageStatus.COMPLETED
+            row.source = source
+            row.page_json = page.model_dump_json()
+            row.tokens_used = tokens_used
+            row.indexed = False
+            row.error_message = None
+            row.updated_at = datetime.now()
+
+            session.add(row)
+            session.commit()
+
+    def save_failed_page(
+        self, document_id: str, page_number: int, error_message: str
+    ) -> None:
+        """Record a page that must be retried on the next attempt."""
+        with Session(self.__db_engine) as session:
+            row = session.get(DocumentPage, (document_id, page_number))
+            if row is None:
+                row = DocumentPage(document_id=document_id, page_number=page_number)
+            else:
+                row.attempts += 1
+
+            row.status = PageStatus.FAILED
+            row.page_json = None
+            row.tokens_used = 0
+            row.indexed = False
+            row.error_message = error_message
+            row.updated_at = datetime.now()
+
+            session.add(row)
+            session.commit()
+
+    def mark_indexed(self, document_id: str, page_number: int) -> None:
+        """Record that a page's chunks were upserted to the vector store."""
+        with Session(self.__db_engine) as session:
+            session.exec(
+                update(DocumentPage)
+                .where(
+                    DocumentPage.document_id == document_id,
+                    DocumentPage.page_number == page_number,
+                )
+                .values(indexed=True, updated_at=datetime.now())
+            )
+            session.commit()
+
+    def delete_pages(self, document_id: str) -> int:
+        """Drop all checkpoints for a document."""
+        with Session(self.__db_engine) as session:
+            result = session.exec(
+                delete(DocumentPage).where(DocumentPage.document_id == document_id)
+            )
+            session.commit()
+            return result.rowcount
@@ -85,6 +85,12 @@ class ProcessingStatusResponse(BaseModel):
         None, description="Number of figures (if completed)"
     )
     error_message: Optional[str] = Field(None, description="Error message if failed")
+    pages_total: int = Field(0, description="Pages in the document (0 until known)")
+    pages_rendered: int = Field(0, description="Pages rendered or read as text")
+    pages_extracted: int = Field(0, description="Pages with extracted content")
+    pages_indexed: int = Field(0, description="Pages searchable in the vector store")
+    chunks_embedded: int = Field(0, description="Chunks embedded so far")
+    chunks_upserted: int = Field(0, description="Chunks stored in the vector store")
 
 
 class SummaryType(str, Enum):
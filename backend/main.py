@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from config import settings
@@ -49,6 +50,25 @@ async def lifespan(app: FastAPI):
     os.makedirs(settings.upload_dir, exist_ok=True)
     logger.info(f"📁 Upload directory ready: {settings.upload_dir}")
 
+    if settings.embedding_warm_up:
+        from utils.qdrant_client import get_vector_store
+
+        try:
+            # Shared by document processing and chat
+            await asyncio.to_thread(get_vector_store().warm_up)
+        except Exception as e:
+            logger.warning(f"⚠️  Embedding model warm-up failed: {e}")
+
+    worker_task = None
+    if settings.ingestion_embedded_worker:
+        from utils.ingestion_worker import IngestionWorker
+
+        ingestion_worker = IngestionWorker(
+            get_engine(), document_processor=documents_api.document_processor
+        )
+        worker_task = asyncio.create_task(ingestion_worker.run())
+        logger.info("⚙️  Embedded ingestion worker started")
+
     logger.info("✅ Application startup complete!")
     logger.info("🌐 Server will start at: http://localhost:8000")
     logger.info("📖 Interactive API docs: http://localhost:8000/docs")
@@ -64,6 +84,22 @@ async def lifespan(app: FastAPI):
 
     logger.info("👋 Shutting down Document Intelligence Platform...")
 
+    if worker_task is not None:
+        # Running jobs are handed back to the queue for the next worker
+        worker_task.cancel()
+        try:
+            await worker_task
+        except asyncio.CancelledError:
+            pass
+
+    from utils.pdf_renderer import shutdown_render_executor
+
+    shutdown_render_executor()
+
+    from utils.qdrant_client import close_vector_store
+
+    await close_vector_store()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -0,0 +1,61 @@
+"""Re-embed the vector collection with other models, without downtime.
+
+Builds a new collection from the chunk text already stored, embeds it with
+the given models and swaps the QDRANT_COLLECTION alias to it. The API and
+workers keep searching and indexing throughout and switch to the new
+collection (and its models) on their own:
+
+    python migrate_embeddings.py --dense-model BAAI/bge-small-en-v1.5
+
+Run it again with the same models to resume an interrupted migration.
+"""
+
+import argparse
+
+from config import settings
+from db import create_db_and_tables
+from utils.embedding_migration import EmbeddingMigration
+from utils.logging import get_logger, setup_logging
+from utils.qdrant_client import get_vector_store
+
+setup_logging(
+    debug=settings.debug,
+    structured_logs=False,
+    log_level="DEBUG" if settings.debug else "INFO",
+)
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dense-model", default=settings.embedding_dense_model)
+    parser.add_argument("--sparse-model", default=settings.embedding_sparse_model)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=None,
+        help="Wait after the alias swap before the final catch-up pass",
+    )
+    parser.add_argument(
+        "--drop-old",
+        action="store_true",
+        help="Delete the previous collection once the migration is done",
+    )
+    args = parser.parse_args()
+
+    create_db_and_tables()
+
+    migration = EmbeddingMigration(
+        get_vector_store(),
+        dense_model=args.dense_model,
+        sparse_model=args.sparse_model,
+        batch_size=args.batch_size,
+        settle_seconds=args.settle_seconds,
+    )
+    collection_name = migration.run(drop_old=args.drop_old)
+    logger.info(f"{settings.qdrant_collection} now serves {collection_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import uuid
@@ -6,7 +7,7 @@ from typing import Any, Dict, List, Optional
 from constants import ConversationType, LogMessages, MessageRole
 from db import get_engine
 from dto.chat_dto import ChatDto
-from dto.chat_models import ChatRequest, ChatResponse, SourceReference
+from dto.chat_models import ChatRequest, ChatResponse, SourceReference, TokenUsage
 from dto.documents_dto import DocumentsDto
 from exceptions import MessageSaveError
 from fastapi import APIRouter, HTTPException
@@ -79,7 +80,7 @@ class ChatAPI:
         """Refresh the RAG system to include newly processed documents."""
         try:
             logger.info("🔄 Refreshing Agentic RAG system")
-            self.rag_ready = self._initialize_rag_system()
+            self.rag_ready = await asyncio.to_thread(self._initialize_rag_system)
 
             return {
                 "message": "RAG system refreshed successfully",
@@ -100,7 +101,7 @@ class ChatAPI:
         try:
             # Get basic stats
             stats = (
-                self.agentic_rag.vector_store.get_collection_stats()
+                await self.agentic_rag.vector_store.aget_collection_stats()
                 if self.agentic_rag.vector_store
                 else {}
             )
@@ -117,9 +118,12 @@ class ChatAPI:
                 "has_documents": self.agentic_rag.has_documents,
                 "total_chunks": total_chunks,
                 "documents_count": len(
-                    self.documents_dto.list_documents(skip=0, limit=1000)
+                    await asyncio.to_thread(
+                        self.documents_dto.list_documents, skip=0, limit=1000
+                    )
                 ),
                 "session_support": True,
+                "relevance_grading": self.agentic_rag.relevance_grader.get_stats(),
             }
         except Exception as e:
             logger.error(f"System status check failed: {e}")
@@ -154,16 +158,22 @@ class ChatAPI:
             # Check if RAG system needs refresh
             if not self.rag_ready:
                 logger.info("RAG system not ready, attempting to refresh")
-                self.rag_ready = self._initialize_rag_system()
+                self.rag_ready = await asyncio.to_thread(self._initialize_rag_system)
 
-            # Ask question using Enhanced Agentic RAG with session support
-            rag_result = self.agentic_rag.ask_question(
+            # Ask question using Enhanced Agentic RAG with session support; the
+            # async graph keeps the event loop free for other questions
+            rag_result = await self.agentic_rag.aask_question(
                 question=request.question, session_id=session_id
             )
 
             # Format sources
             sources = self._format_sources(rag_result.get("sources", []), request)
 
+            documents_searched = len(
+                await asyncio.to_thread(
+                    self.documents_dto.list_documents, skip=0, limit=1000
+                )
+            )
             response_time = time.time() - start_time
 
             logger.info(
@@ -182,8 +192,11 @@ class ChatAPI:
                 response_time=response_time,
                 timestamp=time.time(),
                 conversation_type=ConversationType.MULTI_DOCUMENT,
-                documents_searched=len(
-                    self.documents_dto.list_documents(skip=0, limit=1000)
+                documents_searched=documents_searched,
+                token_usage=(
+                    TokenUsage(**rag_result["token_usage"])
+                    if rag_result.get("token_usage")
+                    else None
                 ),
             )
 
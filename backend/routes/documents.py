@@ -1,5 +1,8 @@
+import asyncio
+import json
 import os
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from config import settings
 from constants import (
@@ -7,11 +10,14 @@ from constants import (
     DocumentStatus,
     ErrorCodes,
     HTTPMessages,
+    JobStatus,
+    JobType,
     ProcessingDefaults,
 )
 from db import get_engine
-from db.models import Document
+from db.models import Document, IngestionJob
 from dto.documents_dto import DocumentsDto
+from dto.jobs_dto import JobsDto
 from dto.upload_dto import (
     DocumentListItem,
     DocumentListResponse,
@@ -27,16 +33,20 @@ from exceptions import (
     validate_document_id,
     validate_file_upload,
 )
-from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from utils.document_processor import DocumentProcessor
 from utils.openai_client import OpenAISummaryClient
+from utils.progress import get_progress_tracker
 
 
 class DocumentsAPI:
     def __init__(self) -> None:
         self.router = APIRouter()
         self.documents_dto = DocumentsDto(get_engine())
+        self.jobs_dto = JobsDto(get_engine())
         self.document_processor = DocumentProcessor(get_engine())
+        self.progress_tracker = get_progress_tracker()
         self.summary_client = OpenAISummaryClient()
 
         # Document management routes
@@ -72,6 +82,14 @@ class DocumentsAPI:
             summary="Get document processing status",
         )
 
+        self.router.add_api_route(
+            "/{document_id}/events",
+            self.stream_document_status,
+            methods=["GET"],
+            response_class=StreamingResponse,
+            summary="Stream document processing progress (server-sent events)",
+        )
+
         self.router.add_api_route(
             "/{document_id}",
             self.delete_document,
@@ -113,7 +131,7 @@ class DocumentsAPI:
         )
 
     async def upload_document(
-        self, background_tasks: BackgroundTasks, file: UploadFile = File(...)
+        self, file: UploadFile = File(...)
     ) -> DocumentUploadResponse:
         """Upload a PDF document for processing."""
         # Validate file upload using centralized validation
@@ -128,11 +146,12 @@ class DocumentsAPI:
             # Save file to disk
             file_info = self.documents_dto.save_uploaded_file(file)
 
-            # Save document to database
+            # Save document to database (detects already processed duplicates)
             result = self.documents_dto.save_document_to_db(
                 filename=file_info["filename"],
                 file_size=file_size,
                 file_path=file_info["file_path"],
+                content_hash=file_info["content_hash"],
             )
 
             document = result["document"]
@@ -142,11 +161,19 @@ class DocumentsAPI:
                 document_id=document.document_id, status=DocumentStatus.PROCESSING
             )
 
-            # Add background task for automatic processing
-            background_tasks.add_task(
-                self._process_document_background,
-                document.document_id,
-                document.file_path,
+            # Queue for the ingestion workers - duplicates reuse the content
+            # of the completed copy instead of being re-extracted
+            self.jobs_dto.enqueue_job(
+                document_id=document.document_id,
+                file_path=document.file_path,
+                job_type=JobType.CLONE if document.duplicate_of else JobType.PROCESS,
+                source_document_id=document.duplicate_of,
+            )
+
+            processing_message = (
+                HTTPMessages.DUPLICATE_REUSED
+                if document.duplicate_of
+                else HTTPMessages.PROCESSING_STARTED
             )
 
             return DocumentUploadResponse(
@@ -155,7 +182,7 @@ class DocumentsAPI:
                 file_size=document.file_size,
                 upload_time=document.upload_time,
                 status=DocumentStatus.PROCESSING,
-                message=f"{HTTPMessages.UPLOAD_SUCCESS} - {HTTPMessages.PROCESSING_STARTED}",
+                message=f"{HTTPMessages.UPLOAD_SUCCESS} - {processing_message}",
             )
 
         except Exception as e:
@@ -218,33 +245,118 @@ class DocumentsAPI:
         validated_id = validate_document_id(document_id)
 
         try:
-            progress_info = self.documents_dto.get_processing_progress(validated_id)
-
-            return ProcessingStatusResponse(
-                document_id=progress_info["document_id"],
-                status=progress_info["status"],
-                progress_percentage=progress_info["progress_percentage"],
-                current_step=progress_info["current_step"],
-                tables_count=progress_info.get("tables_count"),
-                figures_count=progress_info.get("figures_count"),
-                error_message=progress_info.get("error_message"),
-            )
+            return self._build_status_response(validated_id)
 
         except DocumentNotFoundError:
             raise  # Re-raise DocumentNotFoundError as-is
+        except HTTPException:
+            raise
         except Exception as e:
             raise DocumentProcessingError(
                 f"Failed to get document status: {str(e)}", document_id=validated_id
             )
 
+    async def stream_document_status(self, document_id: str) -> StreamingResponse:
+        """Push processing progress as server-sent events until processing ends."""
+        validated_id = validate_document_id(document_id)
+
+        # Fail with a normal 404 before the stream is opened
+        self._build_status_response(validated_id)
+
+        return StreamingResponse(
+            self._status_events(validated_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    def _build_status_response(self, document_id: str) -> ProcessingStatusResponse:
+        # Live counters are only available when the worker runs in this process
+        progress = self.progress_tracker.get(document_id)
+        progress_info = self.documents_dto.get_processing_progress(
+            document_id, live_counters=progress.counters if progress else None
+        )
+        return ProcessingStatusResponse(**progress_info)
+
+    async def _status_events(self, document_id: str) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        last_payload = None
+        last_sent = loop.time()
+        stalled_checks = 0
+
+        while True:
+            status = await asyncio.to_thread(self._build_status_response, document_id)
+            payload = status.model_dump_json()
+
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+                last_sent = loop.time()
+            elif loop.time() - last_sent >= settings.progress_events_keepalive_seconds:
+                yield ": keepalive\n\n"
+                last_sent = loop.time()
+
+            job = await asyncio.to_thread(self.jobs_dto.get_latest_job, document_id)
+            if status.status in (DocumentStatus.COMPLETED, DocumentStatus.FAILED):
+                # A failed attempt may still be retried by the queue
+                if job is None or job.status not in (
+                    JobStatus.QUEUED,
+                    JobStatus.RUNNING,
+                ):
+                    return
+            else:
+                reason = self._stall_reason(job)
+                # Seen twice in a row, since a worker updates the job and the
+                # document in separate transactions
+                stalled_checks = stalled_checks + 1 if reason else 0
+                if stalled_checks >= 2:
+                    stalled = {
+                        "document_id": document_id,
+                        "status": status.status,
+                        "reason": reason,
+                    }
+                    yield f"event: stalled\ndata: {json.dumps(stalled)}\n\n"
+                    return
+
+            progress = self.progress_tracker.get(document_id)
+            if progress is not None:
+                await progress.wait_for_change(
+                    timeout=settings.progress_events_keepalive_seconds
+                )
+            # Coalesces bursts of updates, and is the poll interval when the
+            # document is processed by a worker in another process
+            await asyncio.sleep(settings.progress_events_poll_seconds)
+
+    @staticmethod
+    def _stall_reason(job: Optional[IngestionJob]) -> Optional[str]:
+        """Why an unfinished document will not progress, or None if it may."""
+        if job is None:
+            return "No ingestion job exists for this document"
+        if job.status not in (JobStatus.QUEUED, JobStatus.RUNNING):
+            return f"The ingestion job is {job.status} but the document is not"
+
+        now = datetime.now()
+        if job.status == JobStatus.RUNNING:
+            if job.lease_expires_at is not None and job.lease_expires_at < now:
+                return "The worker processing this document stopped responding"
+        elif job.available_at < now - timedelta(
+            seconds=settings.ingestion_lease_seconds
+        ):
+            return "No ingestion worker has claimed the job; is a worker running?"
+        return None
+
     async def delete_document(self, document_id: str) -> Dict[str, str]:
         """Delete document and all associated data."""
         # Validate document ID
         validated_id = validate_document_id(document_id)
 
         try:
+            # Make sure no worker picks the document up again
+            self.jobs_dto.cancel_jobs(validated_id)
+
             # Delete from vector store and database using document processor
-            success = self.document_processor.delete_document_content(validated_id)
+            success = await self.document_processor.adelete_document_content(
+                validated_id
+            )
 
             if success:
                 return {
@@ -266,9 +378,7 @@ class DocumentsAPI:
                 f"Failed to delete document: {str(e)}", document_id=validated_id
             )
 
-    async def process_document(
-        self, document_id: str, background_tasks: BackgroundTasks
-    ) -> Dict[str, Any]:
+    async def process_document(self, document_id: str) -> Dict[str, Any]:
         """Process document using OpenAI Vision and index in Qdrant."""
         # Validate document ID
         validated_id = validate_document_id(document_id)
@@ -280,14 +390,18 @@ class DocumentsAPI:
             if not document:
                 raise DocumentNotFoundError(validated_id)
 
-            # Add processing task to background
-            background_tasks.add_task(
-                self._process_document_background, validated_id, document.file_path
+            # Queue for the ingestion workers
+            job = self.jobs_dto.enqueue_job(
+                document_id=validated_id, file_path=document.file_path
+            )
+            self.documents_dto.update_document_processing_status(
+                document_id=validated_id, status=DocumentStatus.PROCESSING
             )
 
             return {
                 "message": HTTPMessages.PROCESSING_STARTED,
                 "document_id": validated_id,
+                "job_id": job.job_id,
                 "status": DocumentStatus.PROCESSING,
             }
 
@@ -299,13 +413,17 @@ class DocumentsAPI:
                 document_id=validated_id,
             )
 
-    async def reprocess_document(self, document_id: str) -> Dict[str, Any]:
-        """Reprocess an existing document with improved extraction."""
+    async def reprocess_document(
+        self, document_id: str, force: bool = False
+    ) -> Dict[str, Any]:
+        """Reprocess an existing document, resuming from saved pages unless forced."""
+        validated_id = validate_document_id(document_id)
+
         try:
             # Get document from database
-            document = self.documents_dto.get_document_by_id(document_id)
+            document = self.documents_dto.get_document(validated_id)
             if not document:
-                raise HTTPException(status_code=404, detail="Document not found")
+                raise DocumentNotFoundError(validated_id)
 
             # Check if file still exists
             if not document.file_path or not os.path.exists(document.file_path):
@@ -313,26 +431,27 @@ class DocumentsAPI:
                     status_code=400, detail="Original document file not found"
                 )
 
-            # Update status to processing
-            self.documents_dto.update_document_processing_status(
-                document_id=document_id, status="processing"
+            # Queue for the ingestion workers
+            job = self.jobs_dto.enqueue_job(
+                document_id=validated_id, file_path=document.file_path, force=force
             )
-
-            # Reprocess with improved extraction
-            result = await self.document_processor.process_document(
-                document_id=document_id,
-                file_path=document.file_path,
-                extract_tables=True,
-                extract_figures=True,
+            self.documents_dto.update_document_processing_status(
+                document_id=validated_id, status=DocumentStatus.PROCESSING
             )
 
-            return result
+            return {
+                "message": HTTPMessages.PROCESSING_STARTED,
+                "document_id": validated_id,
+                "job_id": job.job_id,
+                "resume": not job.force,
+                "status": DocumentStatus.PROCESSING,
+            }
 
+        except DocumentNotFoundError:
+            raise
+        except HTTPException:
+            raise
         except Exception as e:
-            # Update status back to completed if reprocessing fails
-            self.documents_dto.update_document_processing_status(
-                document_id=document_id, status="completed"
-            )
             raise HTTPException(
                 status_code=500, detail=f"Reprocessing failed: {str(e)}"
             )
@@ -538,55 +657,11 @@ class DocumentsAPI:
                 status_code=500, detail=f"Failed to generate summary: {str(e)}"
             )
 
-    async def _process_document_background(self, document_id: str, file_path: str):
-        """Background task for document processing with OpenAI Vision extraction."""
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        try:
-            logger.info(f"🔄 Starting background processing for document {document_id}")
-            logger.info(f"📄 File path: {file_path}")
-
-            result = await self.document_processor.process_document(
-                document_id=document_id,
-                file_path=file_path,
-                extract_tables=True,
-                extract_figures=True,
-            )
-
-            if result.get("success"):
-                logger.info(f"✅ Document {document_id} processed successfully!")
-                logger.info(f"📊 Stats: {result['total_pages']} pages")
-                logger.info(
-                    f"📋 Extracted: {result['tables_extracted']} tables, {result['figures_extracted']} figures"
-                )
-                logger.info(f"⏱️  Processing time: {result['processing_time']:.2f}s")
-            else:
-                logger.error(
-                    f"❌ Document {document_id} processing failed: {result.get('error')}"
-                )
-
-        except Exception as e:
-            logger.error(
-                f"❌ Background processing failed for document {document_id}: {str(e)}"
-            )
-            logger.error(f"🔍 Exception details: {type(e).__name__}")
-
-            # Ensure document status is updated to failed
-            try:
-                self.documents_dto.update_document_processing_status(
-                    document_id=document_id,
-                    status=DocumentStatus.FAILED,
-                    error_message=str(e),
-                )
-            except Exception as db_error:
-                logger.error(f"Failed to update document status: {db_error}")
-
     async def get_processing_stats(self) -> Dict[str, Any]:
         """Get processing and hybrid search statistics."""
         try:
             stats = self.document_processor.get_processing_stats()
+            stats["ingestion_queue"] = self.jobs_dto.get_queue_stats()
 
             if "error" in stats:
                 raise HTTPException(
@@ -603,6 +678,12 @@ class DocumentsAPI:
                 status_code=500, detail=f"Failed to get processing stats: {str(e)}"
             )
 
-    async def reprocess_document_endpoint(self, document_id: str) -> Dict[str, Any]:
+    async def reprocess_document_endpoint(
+        self,
+        document_id: str,
+        force: bool = Query(
+            False, description="Discard saved pages and extract every page again"
+        ),
+    ) -> Dict[str, Any]:
         """Endpoint for reprocessing documents with improved extraction."""
-        return await self.reprocess_document(document_id)
+        return await self.reprocess_document(document_id, force=force)
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine
+
+
+@pytest.fixture
+def engine():
+    """Fresh in-memory SQLite database with all tables, shared across threads."""
+    import db.models  # noqa: F401  (registers the tables)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,46 @@
+from db.models import ChunkContent
+from dto.chunks_dto import ChunksDto
+
+
+def chunk(point_id, content, page_number=0, document_id="doc"):
+    row = ChunkContent(
+        point_id=point_id,
+        document_id=document_id,
+        page_number=page_number,
+        content=content,
+    )
+    row.chunk_metadata = {"chunk_index": int(point_id[-1])}
+    return row
+
+
+def test_save_and_get_chunks(engine):
+    chunks_dto = ChunksDto(engine)
+    chunks_dto.save_chunks([chunk("p1", "first"), chunk("p2", "second")])
+
+    stored = chunks_dto.get_chunks(["p1", "p2", "unknown"])
+
+    assert set(stored) == {"p1", "p2"}
+    assert stored["p2"].content == "second"
+    assert stored["p2"].chunk_metadata == {"chunk_index": 2}
+
+
+def test_save_replaces_existing_rows(engine):
+    chunks_dto = ChunksDto(engine)
+    chunks_dto.save_chunks([chunk("p1", "first"), chunk("p2", "second")])
+
+    chunks_dto.save_chunks([chunk("p2", "re-indexed", page_number=3)])
+
+    stored = chunks_dto.get_chunks(["p1", "p2"])
+    assert stored["p1"].content == "first"
+    assert stored["p2"].content == "re-indexed"
+    assert stored["p2"].page_number == 3
+
+
+def test_save_many_chunks(engine):
+    chunks_dto = ChunksDto(engine)
+    chunks = [chunk(f"p{i}", f"chunk {i}") for i in range(250)]
+
+    chunks_dto.save_chunks(chunks)
+    chunks_dto.save_chunks(chunks)
+
+    assert len(chunks_dto.get_chunks([c.point_id for c in chunks])) == 250
@@ -0,0 +1,104 @@
+import sqlite3
+
+from dto.openai_models import MarkdownPage, PageMetadata
+from utils.extraction_cache import PageExtractionCache
+
+
+def page(content, page_number=0):
+    return MarkdownPage(
+        metadata=PageMetadata(language="en", page_number=page_number),
+        content=content,
+        markdown_content=content,
+        tables=[],
+        figures=[],
+    )
+
+
+def entry_size(content):
+    return len(page(content).model_dump_json())
+
+
+def last_accessed(cache, cache_key):
+    return cache._connection.execute(
+        "SELECT last_accessed FROM page_cache WHERE cache_key = ?", (cache_key,)
+    ).fetchone()[0]
+
+
+def age(cache, cache_key, seconds):
+    cache._connection.execute(
+        "UPDATE page_cache SET last_accessed = last_accessed - ? WHERE cache_key = ?",
+        (seconds, cache_key),
+    )
+    cache._connection.commit()
+
+
+def test_put_and_get(tmp_path):
+    cache = PageExtractionCache(str(tmp_path / "pages.db"), max_bytes=1_000_000)
+    cache.put("k1", page("first"), tokens_used=42)
+
+    cached_page, tokens_used = cache.get("k1")
+
+    assert cached_page.content == "first"
+    assert tokens_used == 42
+    assert cache.get("missing") is None
+
+
+def test_recent_hits_do_not_write(tmp_path):
+    cache = PageExtractionCache(str(tmp_path / "pages.db"), max_bytes=1_000_000)
+    cache.put("k1", page("first"), tokens_used=0)
+    stored = last_accessed(cache, "k1")
+
+    cache.get("k1")
+    assert last_accessed(cache, "k1") == stored
+
+    age(cache, "k1", PageExtractionCache.TOUCH_INTERVAL_SECONDS)
+    cache.get("k1")
+    assert last_accessed(cache, "k1") >= stored
+
+
+def test_size_is_tracked_across_replace_and_delete(tmp_path):
+    cache = PageExtractionCache(str(tmp_path / "pages.db"), max_bytes=1_000_000)
+    cache.put("k1", page("first"), tokens_used=0)
+    cache.put("k2", page("second"), tokens_used=0)
+    cache.put("k1", page("first, longer"), tokens_used=0)
+    cache.delete("k2")
+    cache.delete("missing")
+
+    assert cache._total_bytes == entry_size("first, longer")
+    assert cache.get_stats()["size_bytes"] == cache._total_bytes
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    size = entry_size("page 0")
+    cache = PageExtractionCache(str(tmp_path / "pages.db"), max_bytes=size * 10)
+    for i in range(10):
+        cache.put(f"k{i}", page(f"page {i}"), tokens_used=0)
+        age(cache, f"k{i}", 1000 - i)
+    # A hit older than the touch interval moves k0 to the back of the LRU order
+    age(cache, "k0", PageExtractionCache.TOUCH_INTERVAL_SECONDS)
+    cache.get("k0")
+
+    cache.put("k10", page("page X"), tokens_used=0)
+
+    # Evicted down to 90% of the limit, oldest first
+    kept = {f"k{i}" for i in range(11) if cache.get(f"k{i}") is not None}
+    assert kept == {"k0", "k3", "k4", "k5", "k6", "k7", "k8", "k9", "k10"}
+    assert cache._total_bytes == size * len(kept)
+
+
+def test_size_includes_entries_from_other_processes(tmp_path):
+    db_path = str(tmp_path / "pages.db")
+    size = entry_size("page 0")
+    cache = PageExtractionCache(db_path, max_bytes=size * 3)
+    other = PageExtractionCache(db_path, max_bytes=size * 3)
+    for i in range(3):
+        other.put(f"k{i}", page(f"page {i}"), tokens_used=0)
+
+    # The tracked size only covers this process's writes until it resyncs
+    cache._size_synced_at -= PageExtractionCache.SIZE_RESYNC_SECONDS
+    cache.put("k3", page("page 3"), tokens_used=0)
+
+    with sqlite3.connect(db_path) as connection:
+        total = connection.execute("SELECT SUM(size_bytes) FROM page_cache").fetchone()
+    assert total[0] <= size * 3
+    assert cache._total_bytes == total[0]
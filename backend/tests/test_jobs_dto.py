@@ -0,0 +1,261 @@
+from datetime import datetime, timedelta
+
+import pytest
+from config import settings
+from constants import DocumentStatus, JobStatus
+from db.models import Document, IngestionJob
+from dto.jobs_dto import JobsDto
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, update
+
+LEASE_SECONDS = 60
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """SQLite file database, so each session gets its own connection."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def get_job(engine, job_id):
+    with Session(engine) as session:
+        return session.get(IngestionJob, job_id)
+
+
+def expire_lease(engine, job_id):
+    with Session(engine) as session:
+        session.exec(
+            update(IngestionJob)
+            .where(IngestionJob.job_id == job_id)
+            .values(lease_expires_at=datetime.now() - timedelta(seconds=1))
+        )
+        session.commit()
+
+
+def make_runnable(engine, job_id):
+    with Session(engine) as session:
+        session.exec(
+            update(IngestionJob)
+            .where(IngestionJob.job_id == job_id)
+            .values(available_at=datetime.now() - timedelta(seconds=1))
+        )
+        session.commit()
+
+
+class TestClaim:
+    def test_claim_takes_lease(self, engine):
+        jobs_dto = JobsDto(engine)
+        queued = jobs_dto.enqueue_job("doc", "doc.pdf")
+
+        job = jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+
+        assert job.job_id == queued.job_id
+        assert job.status == JobStatus.RUNNING
+        assert job.worker_id == "worker-a"
+        assert job.attempts == 1
+        assert job.lease_expires_at > datetime.now()
+        # A running job is not claimable while its lease is live
+        assert jobs_dto.claim_next_job("worker-b", LEASE_SECONDS) is None
+
+    def test_enqueue_reuses_active_job(self, engine):
+        jobs_dto = JobsDto(engine)
+        first = jobs_dto.enqueue_job("doc", "doc.pdf")
+        jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+
+        assert jobs_dto.enqueue_job("doc", "doc.pdf").job_id == first.job_id
+
+    def test_oldest_job_first(self, engine):
+        jobs_dto = JobsDto(engine)
+        first = jobs_dto.enqueue_job("doc1", "doc1.pdf")
+        second = jobs_dto.enqueue_job("doc2", "doc2.pdf")
+
+        assert jobs_dto.claim_next_job("worker-a", LEASE_SECONDS).job_id == (
+            first.job_id
+        )
+        assert jobs_dto.claim_next_job("worker-b", LEASE_SECONDS).job_id == (
+            second.job_id
+        )
+
+    def test_workers_racing_for_one_job(self, file_engine):
+        jobs_dto = JobsDto(file_engine)
+        queued = jobs_dto.enqueue_job("doc", "doc.pdf")
+        claimed_first = {}
+
+        # Worker A claims the job after worker B has read it as a candidate,
+        # right before B's conditional UPDATE runs
+        @event.listens_for(Session, "do_orm_execute")
+        def claim_first(orm_execute_state):
+            if orm_execute_state.is_update and not claimed_first:
+                # Set first, so worker A's own UPDATE doesn't trigger this again
+                claimed_first["job"] = None
+                claimed_first["job"] = jobs_dto.claim_next_job(
+                    "worker-a", LEASE_SECONDS
+                )
+
+        try:
+            assert jobs_dto.claim_next_job("worker-b", LEASE_SECONDS) is None
+        finally:
+            event.remove(Session, "do_orm_execute", claim_first)
+
+        assert claimed_first["job"].job_id == queued.job_id
+        job = get_job(file_engine, queued.job_id)
+        assert job.worker_id == "worker-a"
+        assert job.attempts == 1
+
+    def test_expired_lease_is_taken_over(self, engine):
+        jobs_dto = JobsDto(engine)
+        queued = jobs_dto.enqueue_job("doc", "doc.pdf")
+        jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+        expire_lease(engine, queued.job_id)
+
+        job = jobs_dto.claim_next_job("worker-b", LEASE_SECONDS)
+
+        assert job.job_id == queued.job_id
+        assert job.worker_id == "worker-b"
+        assert job.attempts == 2
+        # The previous owner can no longer renew or finish the job
+        assert not jobs_dto.heartbeat(queued.job_id, "worker-a", LEASE_SECONDS)
+        assert not jobs_dto.complete_job(queued.job_id, "worker-a")
+        assert jobs_dto.fail_job(queued.job_id, "worker-a", "boom") is None
+
+    def test_expired_final_attempt_fails_job(self, engine):
+        jobs_dto = JobsDto(engine)
+        with Session(engine) as session:
+            session.add(
+                Document(
+                    document_id="doc",
+                    filename="doc.pdf",
+                    file_path="doc.pdf",
+                    file_size=1,
+                    status=DocumentStatus.PROCESSING,
+                )
+            )
+            session.commit()
+        queued = jobs_dto.enqueue_job("doc", "doc.pdf")
+        for _ in range(settings.ingestion_max_attempts):
+            jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+            expire_lease(engine, queued.job_id)
+
+        assert jobs_dto.claim_next_job("worker-b", LEASE_SECONDS) is None
+
+        job = get_job(engine, queued.job_id)
+        assert job.status == JobStatus.FAILED
+        assert job.error_message == "Worker lease expired on the final attempt"
+        with Session(engine) as session:
+            document = session.get(Document, "doc")
+        assert document.status == DocumentStatus.FAILED
+        assert document.error_message == job.error_message
+
+
+class TestLease:
+    def test_heartbeat_extends_lease(self, engine):
+        jobs_dto = JobsDto(engine)
+        job = jobs_dto.enqueue_job("doc", "doc.pdf")
+        claimed = jobs_dto.claim_next_job("worker-a", 1)
+
+        assert jobs_dto.heartbeat(job.job_id, "worker-a", LEASE_SECONDS)
+
+        renewed = get_job(engine, job.job_id)
+        assert renewed.lease_expires_at > claimed.lease_expires_at
+        assert renewed.heartbeat_at >= claimed.heartbeat_at
+        assert not jobs_dto.heartbeat(job.job_id, "worker-b", LEASE_SECONDS)
+
+    def test_complete_job(self, engine):
+        jobs_dto = JobsDto(engine)
+        job = jobs_dto.enqueue_job("doc", "doc.pdf")
+        jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+
+        assert jobs_dto.complete_job(job.job_id, "worker-a")
+
+        completed = get_job(engine, job.job_id)
+        assert completed.status == JobStatus.COMPLETED
+        assert completed.lease_expires_at is None
+        assert not jobs_dto.heartbeat(job.job_id, "worker-a", LEASE_SECONDS)
+
+    def test_release_does_not_count_attempt(self, engine):
+        jobs_dto = JobsDto(engine)
+        job = jobs_dto.enqueue_job("doc", "doc.pdf")
+        jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+
+        assert jobs_dto.release_job(job.job_id, "worker-a")
+
+        released = get_job(engine, job.job_id)
+        assert released.status == JobStatus.QUEUED
+        assert released.attempts == 0
+        assert released.worker_id is None
+        assert jobs_dto.claim_next_job("worker-b", LEASE_SECONDS).attempts == 1
+
+
+class TestRetries:
+    def test_takeover_during_failure_wins(self, file_engine):
+        jobs_dto = JobsDto(file_engine)
+        queued = jobs_dto.enqueue_job("doc", "doc.pdf")
+        jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+        taken_over = {}
+
+        # Worker B takes over the expired lease after worker A has read the
+        # job, right before A records its failure
+        @event.listens_for(Session, "do_orm_execute")
+        def take_over(orm_execute_state):
+            if orm_execute_state.is_update and not taken_over:
+                # Set first, so the takeover's own UPDATEs don't trigger this
+                taken_over["job"] = None
+                expire_lease(file_engine, queued.job_id)
+                taken_over["job"] = jobs_dto.claim_next_job("worker-b", LEASE_SECONDS)
+
+        try:
+            assert jobs_dto.fail_job(queued.job_id, "worker-a", "boom") is None
+        finally:
+            event.remove(Session, "do_orm_execute", take_over)
+
+        assert taken_over["job"].worker_id == "worker-b"
+        job = get_job(file_engine, queued.job_id)
+        assert job.status == JobStatus.RUNNING
+        assert job.worker_id == "worker-b"
+        assert job.attempts == 2
+        assert job.error_message is None
+
+    def test_failed_attempts_back_off(self, engine):
+        jobs_dto = JobsDto(engine)
+        job = jobs_dto.enqueue_job("doc", "doc.pdf")
+        backoff = settings.ingestion_retry_backoff_seconds
+
+        for attempt in range(1, settings.ingestion_max_attempts):
+            jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+            before = datetime.now()
+
+            assert jobs_dto.fail_job(job.job_id, "worker-a", "boom") == JobStatus.QUEUED
+
+            retried = get_job(engine, job.job_id)
+            delay = retried.available_at - before
+            expected = timedelta(seconds=backoff * 2 ** (attempt - 1))
+            assert expected <= delay < expected + timedelta(seconds=1)
+            assert retried.error_message == "boom"
+            # Not runnable again until the backoff has passed
+            assert jobs_dto.claim_next_job("worker-a", LEASE_SECONDS) is None
+            make_runnable(engine, job.job_id)
+
+        jobs_dto.claim_next_job("worker-a", LEASE_SECONDS)
+        assert jobs_dto.fail_job(job.job_id, "worker-a", "boom") == JobStatus.FAILED
+
+        failed = get_job(engine, job.job_id)
+        assert failed.attempts == settings.ingestion_max_attempts
+        assert failed.completed_at is not None
+        make_runnable(engine, job.job_id)
+        assert jobs_dto.claim_next_job("worker-a", LEASE_SECONDS) is None
+
+    def test_cancel_drops_queued_jobs(self, engine):
+        jobs_dto = JobsDto(engine)
+        job = jobs_dto.enqueue_job("doc", "doc.pdf")
+
+        assert jobs_dto.cancel_jobs("doc") == 1
+
+        assert get_job(engine, job.job_id).status == JobStatus.FAILED
+        assert jobs_dto.claim_next_job("worker-a", LEASE_SECONDS) is None
+        assert jobs_dto.get_queue_stats()[JobStatus.FAILED.value] == 1
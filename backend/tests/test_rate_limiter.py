@@ -0,0 +1,145 @@
+import httpx
+import pytest
+from openai import APIConnectionError, APITimeoutError, InternalServerError
+from openai import RateLimitError as OpenAIRateLimitError
+from utils.rate_limiter import OpenAIRateLimiter
+
+# Refills 100 tokens per second, little enough not to blur the assertions
+TOKENS_PER_MINUTE = 6_000
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def make_limiter(max_retries=3, max_concurrency=8, tokens_per_minute=100_000):
+    return OpenAIRateLimiter(
+        requests_per_minute=1000,
+        tokens_per_minute=tokens_per_minute,
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+        backoff_base=0.0,
+        backoff_max=0.0,
+    )
+
+
+def status_error(error_class, status_code):
+    response = httpx.Response(status_code, request=REQUEST)
+    return error_class("error", response=response, body=None)
+
+
+class FlakyCall:
+    """Raises the given errors in turn, then returns ``result``."""
+
+    def __init__(self, *errors, result="ok"):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+class TestRetries:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error",
+        [
+            status_error(InternalServerError, 500),
+            status_error(InternalServerError, 503),
+            APIConnectionError(request=REQUEST),
+            APITimeoutError(request=REQUEST),
+        ],
+    )
+    async def test_transient_errors_are_retried(self, error):
+        limiter = make_limiter()
+        call = FlakyCall(error)
+
+        assert await limiter.run(call) == "ok"
+        assert call.calls == 2
+        # Only rate limits shrink the window or pause other callers
+        assert limiter.concurrency == limiter.max_concurrency
+        assert limiter._paused_until == 0.0
+
+    @pytest.mark.asyncio
+    async def test_wrapped_errors_are_retried(self):
+        limiter = make_limiter()
+        try:
+            raise APIConnectionError(request=REQUEST)
+        except APIConnectionError as e:
+            wrapped = RuntimeError("retries exhausted")
+            wrapped.__cause__ = e
+        call = FlakyCall(wrapped)
+
+        assert await limiter.run(call) == "ok"
+        assert call.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_concurrency(self):
+        limiter = make_limiter()
+        call = FlakyCall(status_error(OpenAIRateLimitError, 429))
+
+        assert await limiter.run(call) == "ok"
+        assert call.calls == 2
+        assert limiter.concurrency == limiter.max_concurrency // 2
+        assert limiter._paused_until > 0.0
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        limiter = make_limiter()
+        call = FlakyCall(ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            await limiter.run(call)
+        assert call.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        limiter = make_limiter(max_retries=2)
+        error = status_error(InternalServerError, 502)
+        call = FlakyCall(error, error, error)
+
+        with pytest.raises(InternalServerError):
+            await limiter.run(call)
+        assert call.calls == 3
+
+
+class TestTokenBudget:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("used", [200, 5_000])
+    async def test_reservation_settled_against_usage(self, used):
+        limiter = make_limiter(tokens_per_minute=TOKENS_PER_MINUTE)
+
+        await limiter.run(
+            FlakyCall(result=used), estimated_tokens=1_000, tokens_used=lambda r: r
+        )
+
+        assert limiter.tokens.available == pytest.approx(
+            TOKENS_PER_MINUTE - used, abs=50
+        )
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_attempts_are_refunded(self):
+        limiter = make_limiter(tokens_per_minute=TOKENS_PER_MINUTE)
+        error = status_error(OpenAIRateLimitError, 429)
+
+        await limiter.run(
+            FlakyCall(error, error, result=800),
+            estimated_tokens=1_000,
+            tokens_used=lambda r: r,
+        )
+
+        assert limiter.tokens.available == pytest.approx(
+            TOKENS_PER_MINUTE - 800, abs=50
+        )
+
+    @pytest.mark.asyncio
+    async def test_estimate_kept_without_usage(self):
+        limiter = make_limiter(tokens_per_minute=TOKENS_PER_MINUTE)
+
+        await limiter.run(FlakyCall(), estimated_tokens=1_000)
+
+        assert limiter.tokens.available == pytest.approx(
+            TOKENS_PER_MINUTE - 1_000, abs=50
+        )
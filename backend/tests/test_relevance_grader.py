@@ -0,0 +1,157 @@
+import pytest
+from constants import RelevanceGraderMode
+from langchain_core.documents import Document
+from utils.relevance_grader import GradeDocuments, RelevanceGrader
+
+QUESTION = "What is the warranty period for the battery pack?"
+MATCHING_TEXT = "The battery pack has a warranty period of two years."
+UNRELATED_TEXT = "Quarterly revenue grew in all regions."
+
+
+class FakeGraderModel:
+    """Chat model stand-in answering every grading request with one score."""
+
+    def __init__(self, binary_score: str = "yes"):
+        self.binary_score = binary_score
+        self.calls = 0
+
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, messages):
+        self.calls += 1
+        return GradeDocuments(binary_score=self.binary_score)
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+def hit(text, dense_score, rrf_score):
+    return Document(
+        page_content=text,
+        metadata={"dense_score": dense_score, "relevance_score": rrf_score},
+    )
+
+
+def make_grader(mode=RelevanceGraderMode.CASCADE, llm=None):
+    grader = RelevanceGrader(llm or FakeGraderModel(), mode=mode)
+    grader.accept_score = 0.6
+    grader.reject_score = 0.25
+    grader.cross_encoder_model = None
+    return grader
+
+
+class TestSignalScore:
+    def test_rank_agreement_adds_fixed_weight(self):
+        grader = make_grader()
+        # Best hit ranked by one search only, however high its RRF score
+        single = grader.signal_score(QUESTION, [hit(UNRELATED_TEXT, 0.5, 0.5)])
+        both = grader.signal_score(QUESTION, [hit(UNRELATED_TEXT, 0.5, 0.9)])
+        both_lower = grader.signal_score(QUESTION, [hit(UNRELATED_TEXT, 0.5, 0.55)])
+
+        assert single == pytest.approx(0.55 * 0.5)
+        assert both == pytest.approx(single + 0.2)
+        assert both_lower == pytest.approx(both)
+
+    def test_keyword_overlap_of_content_words(self):
+        overlap = RelevanceGrader.keyword_overlap(
+            QUESTION, [Document(page_content="Battery warranty terms")]
+        )
+        # warranty, battery out of warranty, period, battery, pack
+        assert overlap == pytest.approx(2 / 4)
+
+    def test_no_dense_scores(self):
+        documents = [Document(page_content=MATCHING_TEXT, metadata={})]
+        assert make_grader().signal_score(QUESTION, documents) is None
+
+
+class TestDecisions:
+    @pytest.mark.parametrize(
+        "documents",
+        [
+            # Similar, all keywords found and ranked by both searches
+            [hit(MATCHING_TEXT, 0.7, 1.0), hit(UNRELATED_TEXT, 0.3, 0.33)],
+            # Very similar and all keywords found, dense search only
+            [hit(MATCHING_TEXT, 0.7, 0.5)],
+        ],
+    )
+    def test_accept(self, documents):
+        llm = FakeGraderModel("no")
+        result = make_grader(llm=llm).grade(QUESTION, documents, "context")
+
+        assert result.relevant
+        assert result.grader == "signals"
+        assert llm.calls == 0
+
+    @pytest.mark.parametrize(
+        "documents",
+        [
+            # Dissimilar and no keywords
+            [hit(UNRELATED_TEXT, 0.2, 0.5), hit(UNRELATED_TEXT, 0.1, 0.33)],
+            # Dissimilar hit that both searches happened to rank first
+            [hit(UNRELATED_TEXT, 0.05, 1.0)],
+        ],
+    )
+    def test_reject(self, documents):
+        llm = FakeGraderModel("yes")
+        result = make_grader(llm=llm).grade(QUESTION, documents, "context")
+
+        assert not result.relevant
+        assert result.grader == "signals"
+        assert llm.calls == 0
+
+    @pytest.mark.parametrize(
+        "documents",
+        [
+            # Moderately similar, some keywords, one search
+            [hit("Battery pack specifications", 0.45, 0.5)],
+            # Weakly similar, no keywords, but both searches agree
+            [hit(UNRELATED_TEXT, 0.3, 0.8)],
+        ],
+    )
+    def test_escalate_to_llm(self, documents):
+        llm = FakeGraderModel("yes")
+        result = make_grader(llm=llm).grade(QUESTION, documents, "context")
+
+        assert result.relevant
+        assert result.grader == "llm"
+        assert llm.calls == 1
+
+    def test_no_documents(self):
+        result = make_grader().grade(QUESTION, [], "")
+        assert not result.relevant
+        assert result.grader == "signals"
+
+    def test_llm_mode_always_asks_the_model(self):
+        llm = FakeGraderModel("no")
+        documents = [hit(MATCHING_TEXT, 0.9, 1.0)]
+        result = make_grader(RelevanceGraderMode.LLM, llm).grade(
+            QUESTION, documents, "context"
+        )
+
+        assert not result.relevant
+        assert result.grader == "llm"
+
+    def test_signals_mode_settles_the_unsure_band(self):
+        llm = FakeGraderModel("yes")
+        grader = make_grader(RelevanceGraderMode.SIGNALS, llm)
+
+        above_middle = grader.grade(
+            QUESTION, [hit("Battery pack specifications", 0.6, 0.5)], ""
+        )
+        below_middle = grader.grade(QUESTION, [hit(UNRELATED_TEXT, 0.3, 0.8)], "")
+
+        assert above_middle.relevant and above_middle.grader == "signals"
+        assert not below_middle.relevant and below_middle.grader == "signals"
+        assert llm.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_async_grading_matches_sync(self):
+        llm = FakeGraderModel("yes")
+        grader = make_grader(llm=llm)
+        documents = [hit("Battery pack specifications", 0.45, 0.5)]
+
+        result = await grader.agrade(QUESTION, documents, "context")
+
+        assert result == grader.grade(QUESTION, documents, "context")
+        assert grader.get_stats()["by_grader"] == {"llm": 2}
@@ -0,0 +1,326 @@
+from datetime import datetime, timedelta
+
+import pytest
+from db.models import SessionCheckpoint
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.serde.types import ERROR
+from sqlmodel import Session, update
+from utils.context_builder import question_message
+from utils.session_checkpointer import SessionCheckpointer
+
+
+def make_checkpointer(engine, **kwargs):
+    kwargs.setdefault("max_turns", 10)
+    kwargs.setdefault("tool_content_chars", 20)
+    kwargs.setdefault("cache_size", 8)
+    kwargs.setdefault("ttl_seconds", 3600)
+    kwargs.setdefault("purge_interval_seconds", 3600)
+    return SessionCheckpointer(engine, **kwargs)
+
+
+def session_config(thread_id, checkpoint_id=None):
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    if checkpoint_id:
+        config["configurable"]["checkpoint_id"] = checkpoint_id
+    return config
+
+
+def save(checkpointer, thread_id, messages=None, parent_id=None):
+    checkpoint = empty_checkpoint()
+    if messages is not None:
+        checkpoint["channel_values"] = {"messages": messages}
+    return checkpointer.put(
+        session_config(thread_id, parent_id), checkpoint, {"step": 1}, {}
+    )
+
+
+def turn(question, answer, retrieved=None):
+    messages = [question_message(question)]
+    if retrieved is not None:
+        messages += [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "retrieve_documents",
+                        "args": {"query": question},
+                        "id": "c",
+                    }
+                ],
+            ),
+            ToolMessage(
+                content=retrieved,
+                tool_call_id="c",
+                artifact=[Document(page_content=retrieved)],
+            ),
+        ]
+    return messages + [AIMessage(content=answer)]
+
+
+def stored_messages(checkpointer, thread_id):
+    checkpoint_tuple = checkpointer.get_tuple(session_config(thread_id))
+    return checkpoint_tuple.checkpoint["channel_values"]["messages"]
+
+
+class TestCheckpoints:
+    def test_missing_session(self, engine):
+        assert make_checkpointer(engine).get_tuple(session_config("none")) is None
+
+    def test_put_and_get_latest(self, engine):
+        checkpointer = make_checkpointer(engine)
+        first = save(checkpointer, "s1", turn("q1", "a1"))
+        second = save(
+            checkpointer,
+            "s1",
+            turn("q1", "a1") + turn("q2", "a2"),
+            parent_id=first["configurable"]["checkpoint_id"],
+        )
+
+        checkpoint_tuple = checkpointer.get_tuple(session_config("s1"))
+        assert checkpoint_tuple.config == second
+        assert checkpoint_tuple.parent_config == first
+        assert checkpoint_tuple.metadata["step"] == 1
+        assert [m.content for m in stored_messages(checkpointer, "s1")] == [
+            "q1",
+            "a1",
+            "q2",
+            "a2",
+        ]
+
+    def test_only_latest_checkpoint_is_kept(self, engine):
+        checkpointer = make_checkpointer(engine)
+        first = save(checkpointer, "s1", turn("q1", "a1"))
+        second = save(checkpointer, "s1", turn("q2", "a2"))
+
+        assert checkpointer.get_tuple(first) is None
+        assert checkpointer.get_tuple(second).config == second
+
+    def test_put_writes(self, engine):
+        checkpointer = make_checkpointer(engine)
+        config = save(checkpointer, "s1", [])
+
+        checkpointer.put_writes(config, [("messages", "first")], "task")
+        # Regular writes are stored once
+        checkpointer.put_writes(config, [("messages", "second")], "task")
+        checkpointer.put_writes(config, [(ERROR, "boom")], "task")
+        # Special writes replace the previous value
+        checkpointer.put_writes(config, [(ERROR, "boom again")], "task")
+
+        pending = make_checkpointer(engine).get_tuple(session_config("s1"))
+        assert sorted(pending.pending_writes) == [
+            ("task", ERROR, "boom again"),
+            ("task", "messages", "first"),
+        ]
+        # The cached copy agrees with the database
+        assert sorted(checkpointer.get_tuple(config).pending_writes) == sorted(
+            pending.pending_writes
+        )
+
+    def test_new_checkpoint_drops_previous_writes(self, engine):
+        checkpointer = make_checkpointer(engine)
+        config = save(checkpointer, "s1", [])
+        checkpointer.put_writes(config, [("messages", "pending")], "task")
+
+        save(checkpointer, "s1", [], parent_id=config["configurable"]["checkpoint_id"])
+
+        fresh = make_checkpointer(engine)
+        assert fresh.get_tuple(session_config("s1")).pending_writes == []
+
+    def test_list(self, engine):
+        checkpointer = make_checkpointer(engine)
+        config = save(checkpointer, "s1", [])
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        assert [t.config for t in checkpointer.list(session_config("s1"))] == [config]
+        assert list(checkpointer.list(session_config("s1"), limit=0)) == []
+        assert list(checkpointer.list(session_config("s1"), filter={"step": 2})) == []
+        assert (
+            list(
+                checkpointer.list(
+                    session_config("s1"), before=session_config("s1", checkpoint_id)
+                )
+            )
+            == []
+        )
+        assert list(checkpointer.list(session_config("s1", "other"))) == []
+        assert list(checkpointer.list(session_config("none"))) == []
+
+    def test_delete_thread(self, engine):
+        checkpointer = make_checkpointer(engine)
+        config = save(checkpointer, "s1", [])
+        checkpointer.put_writes(config, [("messages", "pending")], "task")
+        save(checkpointer, "s2", [])
+
+        checkpointer.delete_thread("s1")
+
+        assert checkpointer.get_tuple(session_config("s1")) is None
+        assert checkpointer.get_tuple(session_config("s2")) is not None
+
+    @pytest.mark.asyncio
+    async def test_async_api(self, engine):
+        checkpointer = make_checkpointer(engine)
+        config = await checkpointer.aput(
+            session_config("s1"), empty_checkpoint(), {"step": 1}, {}
+        )
+        await checkpointer.aput_writes(config, [("messages", "pending")], "task")
+
+        checkpoint_tuple = await checkpointer.aget_tuple(session_config("s1"))
+        assert checkpoint_tuple.pending_writes == [("task", "messages", "pending")]
+        assert [t.config async for t in checkpointer.alist(session_config("s1"))] == [
+            config
+        ]
+
+        await checkpointer.adelete_thread("s1")
+        assert await checkpointer.aget_tuple(session_config("s1")) is None
+
+
+class TestCache:
+    def test_least_recently_used_session_is_evicted(self, engine):
+        checkpointer = make_checkpointer(engine, cache_size=2)
+        for thread_id in ("s1", "s2", "s3"):
+            save(checkpointer, thread_id, [])
+
+        assert [key[0] for key in checkpointer._cache] == ["s2", "s3"]
+
+        checkpointer.get_tuple(session_config("s2"))
+        save(checkpointer, "s4", [])
+        assert [key[0] for key in checkpointer._cache] == ["s2", "s4"]
+
+    def test_disabled_cache(self, engine):
+        checkpointer = make_checkpointer(engine, cache_size=0)
+        save(checkpointer, "s1", turn("q1", "a1"))
+
+        assert not checkpointer._cache
+        assert stored_messages(checkpointer, "s1")[0].content == "q1"
+
+    def test_write_by_another_worker_invalidates_cache(self, engine):
+        worker_a = make_checkpointer(engine)
+        worker_b = make_checkpointer(engine)
+        first = save(worker_a, "s1", turn("q1", "a1"))
+        worker_b.get_tuple(session_config("s1"))
+
+        second = save(worker_a, "s1", turn("q2", "a2"))
+
+        assert worker_b.get_tuple(session_config("s1")).config == second
+        assert stored_messages(worker_b, "s1")[0].content == "q2"
+        assert first != second
+
+    def test_delete_by_another_worker_invalidates_cache(self, engine):
+        worker_a = make_checkpointer(engine)
+        worker_b = make_checkpointer(engine)
+        save(worker_a, "s1", [])
+        worker_b.get_tuple(session_config("s1"))
+
+        worker_a.delete_thread("s1")
+
+        assert worker_b.get_tuple(session_config("s1")) is None
+        assert ("s1", "") not in worker_b._cache
+
+
+class TestPurge:
+    @staticmethod
+    def age(engine, thread_id, seconds):
+        with Session(engine) as session:
+            session.exec(
+                update(SessionCheckpoint)
+                .where(SessionCheckpoint.thread_id == thread_id)
+                .values(updated_at=datetime.now() - timedelta(seconds=seconds))
+            )
+            session.commit()
+
+    def test_idle_sessions_are_purged(self, engine):
+        checkpointer = make_checkpointer(engine, ttl_seconds=60)
+        config = save(checkpointer, "idle", [])
+        checkpointer.put_writes(config, [("messages", "pending")], "task")
+        save(checkpointer, "active", [])
+        self.age(engine, "idle", 120)
+
+        assert checkpointer.purge_idle_sessions() == 1
+        assert checkpointer.get_tuple(session_config("idle")) is None
+        assert checkpointer.get_tuple(session_config("active")) is not None
+        assert ("idle", "") not in checkpointer._cache
+
+    def test_purge_runs_at_most_once_per_interval(self, engine):
+        checkpointer = make_checkpointer(
+            engine, ttl_seconds=60, purge_interval_seconds=3600
+        )
+        save(checkpointer, "idle", [])  # First write purges
+        self.age(engine, "idle", 120)
+
+        save(checkpointer, "other", [])
+        assert checkpointer.get_tuple(session_config("idle")) is not None
+
+        checkpointer._next_purge = 0
+        save(checkpointer, "other", [])
+        assert checkpointer.get_tuple(session_config("idle")) is None
+
+
+class TestHistoryTrimming:
+    def test_keeps_last_turns(self, engine):
+        checkpointer = make_checkpointer(engine, max_turns=2)
+        save(
+            checkpointer,
+            "s1",
+            turn("q1", "a1") + turn("q2", "a2") + turn("q3", "a3"),
+        )
+
+        assert [m.content for m in stored_messages(checkpointer, "s1")] == [
+            "q2",
+            "a2",
+            "q3",
+            "a3",
+        ]
+
+    def test_shortens_earlier_retrievals(self, engine):
+        checkpointer = make_checkpointer(engine, tool_content_chars=5)
+        save(
+            checkpointer,
+            "s1",
+            turn("q1", "a1", retrieved="first retrieval")
+            + turn("q2", "a2", retrieved="second retrieval"),
+        )
+
+        tool_messages = [
+            m for m in stored_messages(checkpointer, "s1") if isinstance(m, ToolMessage)
+        ]
+        assert tool_messages[0].content == "first..."
+        assert tool_messages[0].artifact is None
+        # The latest retrieval is kept whole
+        assert tool_messages[1].content == "second retrieval"
+        assert tool_messages[1].artifact is not None
+
+    def test_rewrites_stay_in_their_turn(self, engine):
+        checkpointer = make_checkpointer(engine, max_turns=1)
+        messages = turn("q1", "a1") + [
+            question_message("q2"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "retrieve_documents", "args": {}, "id": "c"}],
+            ),
+            ToolMessage(content="nothing", tool_call_id="c"),
+            HumanMessage(content="q2 rewritten"),
+            AIMessage(content="a2"),
+        ]
+        save(checkpointer, "s1", messages)
+
+        assert stored_messages(checkpointer, "s1")[0].content == "q2"
+
+    def test_failed_turn_does_not_absorb_next_question(self, engine):
+        checkpointer = make_checkpointer(engine, max_turns=1)
+        # The first turn failed after retrieval, leaving a trailing tool message
+        messages = [
+            question_message("q1"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "retrieve_documents", "args": {}, "id": "c"}],
+            ),
+            ToolMessage(content="context", tool_call_id="c"),
+        ] + turn("q2", "a2")
+        save(checkpointer, "s1", messages)
+
+        assert [m.content for m in stored_messages(checkpointer, "s1")] == [
+            "q2",
+            "a2",
+        ]
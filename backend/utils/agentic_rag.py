@@ -1,35 +1,55 @@
 import json
 import logging
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from config import settings
+from db import get_engine
 from dto.documents_dto import DocumentsDto
 from langchain.tools.retriever import create_retriever_tool
+from langchain_core.callbacks import UsageMetadataCallbackHandler
 from langchain_core.documents import Document
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, MessagesState, StateGraph
 from langgraph.prebuilt import ToolNode, tools_condition
-from pydantic import BaseModel, Field
-from utils.qdrant_client import QdrantOfficialHybridStore
+from utils.context_builder import ContextBuilder, question_message, turn_start_indexes
+from utils.qdrant_client import QdrantOfficialHybridStore, get_vector_store
+from utils.relevance_grader import GradeResult, RelevanceGrader
+from utils.session_checkpointer import SessionCheckpointer
 
 logger = logging.getLogger(__name__)
 
+REWRITE_PROMPT = (
+    "Look at the input and try to reason about the underlying semantic intent / meaning. \n "
+    "Here is the initial question:\n"
+    "------- \n"
+    "{question} \n"
+    "------- \n"
+    "Formulate an improved question:"
+)
 
-class GradeDocuments(BaseModel):
-    """Grade documents using a binary score for relevance check."""
+GENERATE_PROMPT = (
+    "You are an assistant for question-answering tasks. "
+    "Use the following pieces of retrieved context to answer the question. "
+    "If you don't know the answer, just say that you don't know. "
+    "Use three sentences maximum and keep the answer concise.\n"
+    "Question: {question} \n"
+    "Context: {context}"
+)
 
-    binary_score: str = Field(
-        description="Relevance score: 'yes' if relevant, or 'no' if not relevant"
-    )
+
+class RAGState(MessagesState):
+    """Conversation messages plus the current turn's token accounting."""
+
+    context_tokens: int
+    history_tokens: int
 
 
 class HybridSearchRetriever:
 
     def __init__(self, vector_store: QdrantOfficialHybridStore):
         self.vector_store = vector_store
-        self.last_retrieved_docs = []  # Store documents for source attribution
 
     def get_relevant_documents(self, query: str, **kwargs) -> List[Document]:
         """Perform hybrid search and return LangChain Document objects."""
@@ -38,41 +58,58 @@ class HybridSearchRetriever:
                 query=query,
                 limit=8,
                 score_threshold=0.2,  # Lower threshold for better recall
+                with_dense_scores=True,  # Signal for the relevance grader
             )
+            return self._to_documents(query, search_results)
 
-            # Convert to LangChain Document format
-            documents = []
-            for result in search_results:
-                # Create rich metadata for source attribution
-                metadata = {
-                    "chunk_id": result["chunk_id"],
-                    "document_id": result["document_id"],
-                    "content_type": result["content_type"],
-                    "page_number": result["page_number"],
-                    "chunk_index": result["chunk_index"],
-                    "relevance_score": result["score"],
-                    "search_type": result["search_type"],
-                    "source": f"Document: {result.get('metadata', {}).get('filename', 'Unknown')} (Page {result['page_number'] + 1})",
-                    # Include additional metadata
-                    **result.get("metadata", {}),
-                }
-
-                doc = Document(page_content=result["content"], metadata=metadata)
-                documents.append(doc)
-
-            # Store documents for source attribution
-            self.last_retrieved_docs = documents
+        except Exception as e:
+            logger.error(f"Hybrid search failed: {e}")
+            return []
 
-            logger.info(
-                f"Hybrid search returned {len(documents)} documents for query: {query[:50]}..."
+    async def aget_relevant_documents(self, query: str, **kwargs) -> List[Document]:
+        """Async ``get_relevant_documents`` over the pooled async client."""
+        try:
+            search_results = await self.vector_store.ahybrid_search(
+                query=query,
+                limit=8,
+                score_threshold=0.2,  # Lower threshold for better recall
+                with_dense_scores=True,  # Signal for the relevance grader
             )
-            return documents
+            return self._to_documents(query, search_results)
 
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
-            self.last_retrieved_docs = []
             return []
 
+    def _to_documents(
+        self, query: str, search_results: List[Dict[str, Any]]
+    ) -> List[Document]:
+        # Convert to LangChain Document format
+        documents = []
+        for result in search_results:
+            # Create rich metadata for source attribution
+            metadata = {
+                "chunk_id": result["chunk_id"],
+                "document_id": result["document_id"],
+                "content_type": result["content_type"],
+                "page_number": result["page_number"],
+                "chunk_index": result["chunk_index"],
+                "relevance_score": result["score"],
+                "dense_score": result.get("dense_score"),
+                "search_type": result["search_type"],
+                "source": f"Document: {result.get('metadata', {}).get('filename', 'Unknown')} (Page {result['page_number'] + 1})",
+                # Include additional metadata
+                **result.get("metadata", {}),
+            }
+
+            doc = Document(page_content=result["content"], metadata=metadata)
+            documents.append(doc)
+
+        logger.info(
+            f"Hybrid search returned {len(documents)} documents for query: {query[:50]}..."
+        )
+        return documents
+
     def invoke(self, input_data, **kwargs):
         """LangChain Runnable interface - required for create_retriever_tool."""
         if isinstance(input_data, dict):
@@ -82,19 +119,31 @@ class HybridSearchRetriever:
 
         return self.get_relevant_documents(query, **kwargs)
 
+    async def ainvoke(self, input_data, **kwargs):
+        """Async LangChain Runnable interface."""
+        if isinstance(input_data, dict):
+            query = input_data.get("query", "")
+        else:
+            query = str(input_data)
+
+        return await self.aget_relevant_documents(query, **kwargs)
+
 
 class AgenticRAG:
 
     def __init__(self, documents_dto: DocumentsDto):
         self.documents_dto = documents_dto
-        self.vector_store = QdrantOfficialHybridStore()
+        self.vector_store = get_vector_store()
 
-        # Create custom retriever and tool following LangGraph pattern
+        # Create custom retriever and tool following LangGraph pattern. The
+        # retrieved documents ride along as the tool message artifact, so each
+        # question's sources stay in its own graph state
         self.retriever = HybridSearchRetriever(self.vector_store)
         self.retriever_tool = create_retriever_tool(
             self.retriever,
             "retrieve_documents",
             "Search and return information from uploaded PDF documents using advanced hybrid search (semantic + keyword matching).",
+            response_format="content_and_artifact",
         )
 
         # Initialize models following tutorial
@@ -102,11 +151,19 @@ class AgenticRAG:
             model="gpt-4.1", temperature=0, api_key=settings.openai_api_key
         )
         self.grader_model = ChatOpenAI(
-            model="gpt-4.1", temperature=0, api_key=settings.openai_api_key
+            model=settings.relevance_grader_model,
+            temperature=0,
+            api_key=settings.openai_api_key,
         )
 
-        # Add memory saver for session support
-        self.checkpointer = MemorySaver()
+        # Grades from retrieval signals, the LLM only decides unclear cases
+        self.relevance_grader = RelevanceGrader(self.grader_model)
+
+        # Token budgets for retrieved context and conversation history
+        self.context_builder = ContextBuilder(self.response_model.model_name)
+
+        # Sessions are persisted in the database, shared by all workers
+        self.checkpointer = SessionCheckpointer(get_engine())
         self.graph = None
         self.has_documents = False
 
@@ -129,109 +186,150 @@ class AgenticRAG:
             self.has_documents = False
             return False
 
-    def _generate_query_or_respond(self, state: MessagesState):
-        """Generate a response or decide to retrieve documents - following LangGraph tutorial."""
+    def _query_model(self):
+        """Response model, with the retriever tool once documents exist."""
         if not self.has_documents:
             # No documents available, respond directly
-            response = self.response_model.invoke(state["messages"])
-            return {"messages": [response]}
-
+            return self.response_model
         # Following tutorial: bind tools and let model decide
-        response = self.response_model.bind_tools([self.retriever_tool]).invoke(
-            state["messages"]
-        )
-        return {"messages": [response]}
-
-    def _grade_documents(
-        self, state: MessagesState
-    ) -> Literal["generate_answer", "rewrite_question"]:
-        """Determine whether retrieved documents are relevant - following LangGraph tutorial."""
-        GRADE_PROMPT = (
-            "You are a grader assessing relevance of a retrieved document to a user question. \n "
-            "Here is the retrieved document: \n\n {context} \n\n"
-            "Here is the user question: {question} \n"
-            "If the document contains keyword(s) or semantic meaning related to the user question, grade it as relevant. \n"
-            "Give a binary score 'yes' or 'no' score to indicate whether the document is relevant to the question."
-        )
-
-        question = state["messages"][0].content
+        return self.response_model.bind_tools([self.retriever_tool])
 
-        # Get the last tool message (retrieved content)
-        context = ""
-        for msg in reversed(state["messages"]):
-            if hasattr(msg, "content") and hasattr(msg, "type") and msg.type == "tool":
-                context = msg.content
-                break
+    def _history(self, state: RAGState) -> Tuple[List[BaseMessage], Dict[str, int]]:
+        """Current turn plus the recent history that fits the token budget."""
+        messages, tokens = self.context_builder.build_history(state["messages"])
+        return messages, {"history_tokens": state.get("history_tokens", 0) + tokens}
 
+    def _generate_query_or_respond(self, state: RAGState):
+        """Generate a response or decide to retrieve documents - following LangGraph tutorial."""
+        messages, usage = self._history(state)
+        response = self._query_model().invoke(messages)
+        return {"messages": [response], **usage}
+
+    async def _agenerate_query_or_respond(self, state: RAGState):
+        messages, usage = self._history(state)
+        response = await self._query_model().ainvoke(messages)
+        return {"messages": [response], **usage}
+
+    @staticmethod
+    def _current_question(messages: List[BaseMessage]) -> str:
+        """Question that started the current turn (not a rewrite of it)."""
+        turn_starts = turn_start_indexes(messages)
+        return messages[turn_starts[-1] if turn_starts else 0].content
+
+    def _retrieved_context(self, messages: List[BaseMessage]) -> Tuple[str, int]:
+        """Context of the last retrieval, packed into the token budget."""
+        context, _, tokens = self._retrieval(messages)
+        return context, tokens
+
+    def _retrieval(
+        self, messages: List[BaseMessage]
+    ) -> Tuple[str, List[Document], int]:
+        """Packed context, documents and token count of the last retrieval."""
+        for msg in reversed(messages):
+            if isinstance(msg, ToolMessage):
+                if msg.artifact:
+                    return self.context_builder.pack_documents(msg.artifact)
+                context, tokens = self.context_builder.pack_text(msg.content)
+                return context, [], tokens
+        return "", [], 0
+
+    def _grade_input(
+        self, state: RAGState
+    ) -> Optional[Tuple[str, List[Document], str]]:
+        context, documents, _ = self._retrieval(state["messages"])
         if not context:
             logger.warning("No tool message found for grading")
-            return "rewrite_question"
+            return None
 
-        prompt = GRADE_PROMPT.format(question=question, context=context)
+        question = self._current_question(state["messages"])
+        return question, documents, context
 
-        response = self.grader_model.with_structured_output(GradeDocuments).invoke(
-            [{"role": "user", "content": prompt}]
-        )
-
-        if response.binary_score == "yes":
-            logger.info("Retrieved documents are relevant - generating answer")
+    @staticmethod
+    def _route_grade(
+        result: Optional[GradeResult],
+    ) -> Literal["generate_answer", "rewrite_question"]:
+        if result is not None and result.relevant:
+            logger.info(
+                f"Retrieved documents are relevant ({result.grader}) - generating answer"
+            )
             return "generate_answer"
         else:
             logger.info("Retrieved documents not relevant - rewriting question")
             return "rewrite_question"
 
-    def _rewrite_question(self, state: MessagesState):
-        """Rewrite the original user question - following LangGraph tutorial."""
-        REWRITE_PROMPT = (
-            "Look at the input and try to reason about the underlying semantic intent / meaning. \n "
-            "Here is the initial question:\n"
-            "------- \n"
-            "{question} \n"
-            "------- \n"
-            "Formulate an improved question:"
-        )
+    def _grade_documents(
+        self, state: RAGState
+    ) -> Literal["generate_answer", "rewrite_question"]:
+        """Determine whether retrieved documents are relevant - following LangGraph tutorial."""
+        grade_input = self._grade_input(state)
+        if grade_input is None:
+            return "rewrite_question"
 
-        messages = state["messages"]
-        question = messages[0].content
-        prompt = REWRITE_PROMPT.format(question=question)
+        return self._route_grade(self.relevance_grader.grade(*grade_input))
 
-        response = self.response_model.invoke([{"role": "user", "content": prompt}])
-        return {"messages": [{"role": "user", "content": response.content}]}
+    async def _agrade_documents(
+        self, state: RAGState
+    ) -> Literal["generate_answer", "rewrite_question"]:
+        grade_input = self._grade_input(state)
+        if grade_input is None:
+            return "rewrite_question"
 
-    def _generate_answer(self, state: MessagesState):
-        """Generate answer based on retrieved context - following LangGraph tutorial."""
-        GENERATE_PROMPT = (
-            "You are an assistant for question-answering tasks. "
-            "Use the following pieces of retrieved context to answer the question. "
-            "If you don't know the answer, just say that you don't know. "
-            "Use three sentences maximum and keep the answer concise.\n"
-            "Question: {question} \n"
-            "Context: {context}"
-        )
+        return self._route_grade(await self.relevance_grader.agrade(*grade_input))
 
-        question = state["messages"][0].content
+    def _rewrite_prompt(self, state: RAGState) -> List[Dict[str, str]]:
+        question = self._current_question(state["messages"])
+        return [{"role": "user", "content": REWRITE_PROMPT.format(question=question)}]
 
-        # Get the last tool message (retrieved context)
-        context = ""
-        for msg in reversed(state["messages"]):
-            if hasattr(msg, "content") and hasattr(msg, "type") and msg.type == "tool":
-                context = msg.content
-                break
+    def _rewrite_question(self, state: RAGState):
+        """Rewrite the original user question - following LangGraph tutorial."""
+        response = self.response_model.invoke(self._rewrite_prompt(state))
+        return {"messages": [{"role": "user", "content": response.content}]}
+
+    async def _arewrite_question(self, state: RAGState):
+        response = await self.response_model.ainvoke(self._rewrite_prompt(state))
+        return {"messages": [{"role": "user", "content": response.content}]}
 
+    def _answer_prompt(
+        self, state: RAGState
+    ) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+        question = self._current_question(state["messages"])
+        context, tokens = self._retrieved_context(state["messages"])
         prompt = GENERATE_PROMPT.format(question=question, context=context)
+        return [{"role": "user", "content": prompt}], {"context_tokens": tokens}
 
-        response = self.response_model.invoke([{"role": "user", "content": prompt}])
-        return {"messages": [response]}
+    def _generate_answer(self, state: RAGState):
+        """Generate answer based on retrieved context - following LangGraph tutorial."""
+        messages, usage = self._answer_prompt(state)
+        response = self.response_model.invoke(messages)
+        return {"messages": [response], **usage}
+
+    async def _agenerate_answer(self, state: RAGState):
+        messages, usage = self._answer_prompt(state)
+        response = await self.response_model.ainvoke(messages)
+        return {"messages": [response], **usage}
 
     def _build_graph(self):
         """Build the agentic RAG workflow graph with checkpointer for session support."""
-        workflow = StateGraph(MessagesState)
+        workflow = StateGraph(RAGState)
 
-        # Define nodes following tutorial
-        workflow.add_node("generate_query_or_respond", self._generate_query_or_respond)
+        # Define nodes following tutorial. Each node has a sync and an async
+        # implementation, used by graph.invoke and graph.ainvoke respectively
+        workflow.add_node(
+            "generate_query_or_respond",
+            RunnableLambda(
+                self._generate_query_or_respond,
+                afunc=self._agenerate_query_or_respond,
+            ),
+        )
         workflow.add_node("retrieve", ToolNode([self.retriever_tool]))
-        workflow.add_node("rewrite_question", self._rewrite_question)
-        workflow.add_node("generate_answer", self._generate_answer)
+        workflow.add_node(
+            "rewrite_question",
+            RunnableLambda(self._rewrite_question, afunc=self._arewrite_question),
+        )
+        workflow.add_node(
+            "generate_answer",
+            RunnableLambda(self._generate_answer, afunc=self._agenerate_answer),
+        )
 
         # Define edges following tutorial
         workflow.add_edge(START, "generate_query_or_respond")
@@ -251,7 +349,8 @@ class AgenticRAG:
         # Conditional edge after retrieval for document grading - following tutorial
         workflow.add_conditional_edges(
             "retrieve",
-            self._grade_documents,
+            RunnableLambda(self._grade_documents, afunc=self._agrade_documents),
+            ["generate_answer", "rewrite_question"],
         )
 
         workflow.add_edge("generate_answer", END)
@@ -288,53 +387,145 @@ class AgenticRAG:
         conversation_history: List[BaseMessage] = None,
     ) -> Dict[str, Any]:
         """Ask a question using the enhanced agentic RAG system with session support."""
-        if not self.graph:
-            raise ValueError(
-                "RAG system not initialized. Call setup_for_all_documents() first."
-            )
-
-        # Create config with thread_id for session support
-        config = {"configurable": {"thread_id": session_id}}
+        self._check_graph()
 
         try:
             # Run the graph with session config - LangGraph handles conversation history automatically
+            question_msg = question_message(question)
+            usage = UsageMetadataCallbackHandler()
             result = self.graph.invoke(
-                {"messages": [{"role": "user", "content": question}]}, config=config
+                self._turn_input(question_msg),
+                config=self._session_config(session_id, callbacks=[usage]),
             )
+            return self._answer_from_result(result, question_msg, session_id, usage)
 
-            # Extract final response
-            final_message = result["messages"][-1]
+        except Exception as e:
+            logger.error(f"Error in agentic RAG: {e}")
+            return self._error_answer(question, session_id)
 
-            return {
-                "answer": final_message.content,
-                "sources": self._extract_sources_from_tool_messages(result["messages"]),
-                "conversation": result["messages"],
-                "session_id": session_id,
-            }
+    async def aask_question(
+        self,
+        question: str,
+        session_id: str = "default",
+        conversation_history: List[BaseMessage] = None,
+    ) -> Dict[str, Any]:
+        """Async ``ask_question``; model and Qdrant calls don't block the event loop."""
+        self._check_graph()
+
+        try:
+            question_msg = question_message(question)
+            usage = UsageMetadataCallbackHandler()
+            result = await self.graph.ainvoke(
+                self._turn_input(question_msg),
+                config=self._session_config(session_id, callbacks=[usage]),
+            )
+            return self._answer_from_result(result, question_msg, session_id, usage)
 
         except Exception as e:
             logger.error(f"Error in agentic RAG: {e}")
-            return {
-                "answer": "I apologize, but I encountered an error while processing your question. Please try again.",
-                "sources": [],
-                "conversation": [{"role": "user", "content": question}],
-                "session_id": session_id,
-            }
+            return self._error_answer(question, session_id)
+
+    def _check_graph(self) -> None:
+        if not self.graph:
+            raise ValueError(
+                "RAG system not initialized. Call setup_for_all_documents() first."
+            )
+
+    @staticmethod
+    def _session_config(
+        session_id: str, callbacks: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        # Create config with thread_id for session support
+        config = {"configurable": {"thread_id": session_id}}
+        if callbacks:
+            config["callbacks"] = callbacks
+        return config
+
+    @staticmethod
+    def _turn_input(question_msg: HumanMessage) -> Dict[str, Any]:
+        # Token counters restart with every question
+        return {
+            "messages": [question_msg],
+            "context_tokens": 0,
+            "history_tokens": 0,
+        }
+
+    @staticmethod
+    def _token_usage(
+        result: Dict[str, Any], usage: UsageMetadataCallbackHandler
+    ) -> Dict[str, int]:
+        """Tokens reported by the model calls of a turn, summed over models."""
+        calls = usage.usage_metadata.values()
+        return {
+            "prompt_tokens": sum(call.get("input_tokens", 0) for call in calls),
+            "completion_tokens": sum(call.get("output_tokens", 0) for call in calls),
+            "total_tokens": sum(call.get("total_tokens", 0) for call in calls),
+            "context_tokens": result.get("context_tokens", 0),
+            "history_tokens": result.get("history_tokens", 0),
+        }
+
+    def _answer_from_result(
+        self,
+        result: Dict[str, Any],
+        question_msg: HumanMessage,
+        session_id: str,
+        usage: UsageMetadataCallbackHandler,
+    ) -> Dict[str, Any]:
+        # Extract final response
+        final_message = result["messages"][-1]
+
+        turn_start = next(
+            (
+                index
+                for index, msg in enumerate(result["messages"])
+                if msg.id == question_msg.id
+            ),
+            0,
+        )
+
+        return {
+            "answer": final_message.content,
+            "sources": self._extract_sources_from_tool_messages(
+                result["messages"][turn_start:]
+            ),
+            "conversation": result["messages"],
+            "session_id": session_id,
+            "token_usage": self._token_usage(result, usage),
+        }
+
+    @staticmethod
+    def _error_answer(question: str, session_id: str) -> Dict[str, Any]:
+        return {
+            "answer": "I apologize, but I encountered an error while processing your question. Please try again.",
+            "sources": [],
+            "conversation": [{"role": "user", "content": question}],
+            "session_id": session_id,
+        }
 
     def _extract_sources_from_tool_messages(
         self, messages: List
     ) -> List[Dict[str, Any]]:
-        """Extract source references using stored documents from retriever."""
+        """Extract source references from the documents of the last retrieval."""
         sources = []
 
-        # Use stored documents from retriever instead of parsing tool messages
-        # This preserves all the rich metadata that gets lost in tool message conversion
-        if (
-            hasattr(self.retriever, "last_retrieved_docs")
-            and self.retriever.last_retrieved_docs
-        ):
+        tool_message = next(
+            (
+                msg
+                for msg in reversed(messages)
+                if hasattr(msg, "type") and msg.type == "tool"
+            ),
+            None,
+        )
+        if tool_message is None:
+            return sources
+
+        # Use the documents carried as the tool message artifact instead of
+        # parsing its content. This preserves all the rich metadata that gets
+        # lost in tool message conversion
+        retrieved_docs = getattr(tool_message, "artifact", None)
+        if retrieved_docs:
             try:
-                for doc in self.retriever.last_retrieved_docs[:5]:  # Limit to 5 sources
+                for doc in retrieved_docs[:5]:  # Limit to 5 sources
                     metadata = doc.metadata
                     content_preview = (
                         doc.page_content[:300] + "..."
@@ -366,37 +557,27 @@ class AgenticRAG:
             except Exception as e:
                 logger.error(f"Error extracting sources from stored documents: {e}")
 
-        # Fallback: if no stored documents, check tool messages (legacy behavior)
-        if not sources:
+        # Fallback: if no stored documents, use the tool message content (legacy behavior)
+        if not sources and tool_message.content:
             logger.warning(
                 "No stored documents found, falling back to tool message parsing"
             )
-            for msg in messages:
-                if (
-                    hasattr(msg, "type")
-                    and msg.type == "tool"
-                    and hasattr(msg, "content")
-                ):
-                    content = msg.content
-                    if content:
-                        sources.append(
-                            {
-                                "content_preview": (
-                                    content[:300] + "..."
-                                    if len(content) > 300
-                                    else content
-                                ),
-                                "source_document": "Retrieved from document search",
-                                "content_type": "text",
-                                "page_number": 0,
-                                "chunk_index": 0,
-                                "relevance_score": 0.85,
-                                "document_id": "",
-                                "chunk_id": "",
-                                "search_type": "unknown",
-                            }
-                        )
-                        break
+            content = tool_message.content
+            sources.append(
+                {
+                    "content_preview": (
+                        content[:300] + "..." if len(content) > 300 else content
+                    ),
+                    "source_document": "Retrieved from document search",
+                    "content_type": "text",
+                    "page_number": 0,
+                    "chunk_index": 0,
+                    "relevance_score": 0.85,
+                    "document_id": "",
+                    "chunk_id": "",
+                    "search_type": "unknown",
+                }
+            )
 
         return sources
 
@@ -407,18 +588,13 @@ class AgenticRAG:
         conversation_history: List[BaseMessage] = None,
     ):
         """Stream the agentic RAG response for real-time updates with session support."""
-        if not self.graph:
-            raise ValueError(
-                "RAG system not initialized. Call setup_for_all_documents() first."
-            )
-
-        # Create config with thread_id for session support
-        config = {"configurable": {"thread_id": session_id}}
+        self._check_graph()
+        config = self._session_config(session_id)
 
         try:
             # Stream the graph execution with session config
             for chunk in self.graph.stream(
-                {"messages": [{"role": "user", "content": question}]}, config=config
+                self._turn_input(question_message(question)), config=config
             ):
                 for node, update in chunk.items():
                     yield {
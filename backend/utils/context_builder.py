@@ -0,0 +1,226 @@
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from typing import List, Optional, Sequence, Tuple
+
+import tiktoken
+from config import settings
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, trim_messages
+
+logger = logging.getLogger(__name__)
+
+# Fallback encoding for models tiktoken doesn't know yet (GPT-4o family)
+DEFAULT_ENCODING = "o200k_base"
+
+# Chat format overhead, per message and per reply
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_OVERHEAD_TOKENS = 3
+
+DOCUMENT_SEPARATOR = "\n\n"
+
+
+# Marks the user's own questions, as opposed to rewrites made by the graph
+QUESTION_FLAG = "question"
+
+
+def question_message(question: str) -> HumanMessage:
+    """A user question, starting a new conversation turn."""
+    return HumanMessage(
+        content=question,
+        id=str(uuid.uuid4()),
+        additional_kwargs={QUESTION_FLAG: True},
+    )
+
+
+def is_question(msg: BaseMessage) -> bool:
+    return isinstance(msg, HumanMessage) and bool(
+        msg.additional_kwargs.get(QUESTION_FLAG)
+    )
+
+
+def turn_start_indexes(messages: Sequence[BaseMessage]) -> List[int]:
+    """Indexes of the questions that start a conversation turn.
+
+    Sessions saved before questions were flagged fall back to the message
+    order: a question following the previous final answer.
+    """
+    flagged = [index for index, msg in enumerate(messages) if is_question(msg)]
+    if flagged:
+        return flagged
+
+    return [
+        index
+        for index, msg in enumerate(messages)
+        if isinstance(msg, HumanMessage)
+        and (
+            index == 0
+            or (
+                isinstance(messages[index - 1], AIMessage)
+                and not messages[index - 1].tool_calls
+            )
+        )
+    ]
+
+
+class TokenCounter:
+    """tiktoken counts for a chat model.
+
+    Falls back to ~4 characters per token when the encoding can't be loaded
+    (tiktoken downloads it on first use).
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding: Optional[tiktoken.Encoding] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> Optional[tiktoken.Encoding]:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._encoding = self._load_encoding()
+                    self._loaded = True
+        return self._encoding
+
+    def _load_encoding(self) -> Optional[tiktoken.Encoding]:
+        try:
+            return tiktoken.encoding_for_model(self.model)
+        except KeyError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load tiktoken encoding for {self.model}: {e}")
+            return None
+
+        try:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+        except Exception as e:
+            logger.warning(f"Could not load tiktoken encoding {DEFAULT_ENCODING}: {e}")
+            return None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is None:
+            return len(text) // 4 + 1
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is None:
+            return text[: max_tokens * 4]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return self.encoding.decode(tokens[:max_tokens])
+
+    def count_messages(self, messages: Sequence[BaseMessage]) -> int:
+        total = REPLY_OVERHEAD_TOKENS
+        for msg in messages:
+            total += MESSAGE_OVERHEAD_TOKENS
+            content = msg.content
+            total += self.count(
+                content if isinstance(content, str) else json.dumps(content)
+            )
+            if isinstance(msg, AIMessage) and msg.tool_calls:
+                total += self.count(json.dumps(msg.tool_calls))
+        return total
+
+
+class ContextBuilder:
+    """Packs retrieved chunks and conversation history into token budgets."""
+
+    def __init__(
+        self,
+        model: str,
+        context_tokens: Optional[int] = None,
+        history_tokens: Optional[int] = None,
+    ):
+        self.counter = TokenCounter(model)
+        self.context_tokens = context_tokens or settings.chat_context_token_budget
+        self.history_tokens = history_tokens or settings.chat_history_token_budget
+
+    def pack_documents(
+        self, documents: Sequence[Document]
+    ) -> Tuple[str, List[Document], int]:
+        """Best-scoring distinct chunks that fit the context budget.
+
+        Returns the context text, the documents used and its token count.
+        """
+        ranked = sorted(
+            documents,
+            key=lambda doc: doc.metadata.get("relevance_score", 0.0),
+            reverse=True,
+        )
+
+        seen = set()
+        packed: List[Document] = []
+        parts: List[str] = []
+        used = 0
+        separator_tokens = self.counter.count(DOCUMENT_SEPARATOR)
+
+        for doc in ranked:
+            # Clones of a document share chunk text under other chunk ids
+            key = hashlib.sha256(
+                " ".join(doc.page_content.split()).lower().encode()
+            ).hexdigest()
+            chunk_id = doc.metadata.get("chunk_id")
+            if key in seen or (chunk_id and chunk_id in seen):
+                continue
+            seen.add(key)
+            if chunk_id:
+                seen.add(chunk_id)
+
+            cost = self.counter.count(doc.page_content) + (
+                separator_tokens if parts else 0
+            )
+            if used + cost <= self.context_tokens:
+                parts.append(doc.page_content)
+                packed.append(doc)
+                used += cost
+            elif not parts:
+                # Never leave the answer without context
+                text = self.counter.truncate(doc.page_content, self.context_tokens)
+                parts.append(text)
+                packed.append(doc)
+                used = self.counter.count(text)
+
+        return DOCUMENT_SEPARATOR.join(parts), packed, used
+
+    def pack_text(self, text: str) -> Tuple[str, int]:
+        """Context text cut to the budget, for retrievals without documents."""
+        text = self.counter.truncate(text, self.context_tokens)
+        return text, self.counter.count(text)
+
+    def build_history(
+        self, messages: Sequence[BaseMessage]
+    ) -> Tuple[List[BaseMessage], int]:
+        """The current turn, preceded by as much recent history as fits.
+
+        Returns the messages to send and their token count.
+        """
+        turn_starts = turn_start_indexes(messages)
+        current_start = turn_starts[-1] if turn_starts else 0
+        current = list(messages[current_start:])
+
+        earlier = []
+        budget = self.history_tokens - self.counter.count_messages(current)
+        if current_start and budget > 0:
+            earlier = trim_messages(
+                list(messages[:current_start]),
+                max_tokens=budget,
+                token_counter=self.counter.count_messages,
+                strategy="last",
+                start_on="human",
+                allow_partial=False,
+            )
+            # Don't start on a rewrite in the middle of a turn
+            first = current_start - len(earlier)
+            first = next((i for i in turn_starts if i >= first), current_start)
+            earlier = list(messages[first:current_start])
+
+        selected = earlier + current
+        return selected, self.counter.count_messages(selected)
@@ -1,14 +1,21 @@
 import asyncio
 import json
+import logging
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from config import settings
 from dto.documents_dto import DocumentsDto
 from dto.openai_models import MarkdownDocument, OpenAIExtractionRequest
-from utils.openai_client import OpenAIVisionClient
-from utils.qdrant_client import QdrantOfficialHybridStore
+from dto.pages_dto import DocumentPagesDto
+from utils.indexing_pipeline import PageIndexingPipeline
+from utils.openai_client import ExtractedPage, OpenAIVisionClient
+from utils.pdf_renderer import count_pages
+from utils.progress import get_progress_tracker
+from utils.qdrant_client import get_vector_store
+
+logger = logging.getLogger(__name__)
 
 
 class DocumentProcessor:
@@ -16,8 +23,10 @@ class DocumentProcessor:
 
     def __init__(self, db_engine):
         self.openai_client = OpenAIVisionClient()
-        self.vector_store = QdrantOfficialHybridStore()
+        self.vector_store = get_vector_store()
         self.documents_dto = DocumentsDto(db_engine)
+        self.pages_dto = DocumentPagesDto(db_engine)
+        self.progress_tracker = get_progress_tracker()
 
     async def process_document(
         self,
@@ -25,132 +34,201 @@ class DocumentProcessor:
         file_path: str,
         extract_tables: bool = True,
         extract_figures: bool = True,
+        force: bool = False,
+        allow_failed_pages: bool = False,
     ) -> Dict[str, Any]:
         """
         Complete document processing pipeline:
-        1. Extract content using OpenAI Vision
-        2. Index content in Qdrant
+        1. Extract content using OpenAI Vision, checkpointing every page
+        2. Index each page in Qdrant as soon as it is extracted
         3. Update database with results
+
+        Pages checkpointed by an earlier attempt are reused unless ``force`` is
+        set. If any page fails, the attempt fails (completed pages stay saved
+        for the retry) unless ``allow_failed_pages`` is set, in which case the
+        document completes without them.
         """
         start_time = time.time()
 
         try:
             # Update status to processing
-            self.documents_dto.update_document_processing_status(
-                document_id=document_id, status="processing"
+            await asyncio.to_thread(
+                self.documents_dto.update_document_processing_status,
+                document_id=document_id,
+                status="processing",
             )
 
-            # Step 1: Extract content using OpenAI Vision
-            print(f"Starting OpenAI vision extraction for document {document_id}")
+            if force:
+                await asyncio.to_thread(self.pages_dto.delete_pages, document_id)
 
-            extraction_request = OpenAIExtractionRequest(
-                file_path=file_path,
-                document_id=document_id,
-                extract_tables=extract_tables,
-                extract_figures=extract_figures,
+            # Loads and deserializes every saved page
+            checkpoints = await asyncio.to_thread(
+                self.pages_dto.get_completed_pages, document_id
             )
+            resumed_pages = len(checkpoints)
+            if resumed_pages:
+                print(
+                    f"Resuming document {document_id}: {resumed_pages} pages already extracted"
+                )
 
-            extraction_response = await self.openai_client.extract_document_content(
-                extraction_request
-            )
-            markdown_document = extraction_response.markdown_document
+            extracted_pages = {
+                page_number: (checkpoint.page, checkpoint.tokens_used)
+                for page_number, checkpoint in checkpoints.items()
+            }
 
-            print(
-                f"OpenAI extraction completed in {extraction_response.processing_time:.2f}s"
+            indexed_chunks = (
+                await asyncio.to_thread(
+                    self.vector_store.count_document_chunks, document_id
+                )
+                if resumed_pages
+                else 0
+            )
+            progress = self.progress_tracker.start(
+                document_id,
+                pages_total=await asyncio.to_thread(count_pages, file_path),
+                pages_rendered=resumed_pages,
+                pages_extracted=resumed_pages,
+                pages_indexed=sum(
+                    1 for checkpoint in checkpoints.values() if checkpoint.indexed
+                ),
+                chunks_embedded=indexed_chunks,
+                chunks_upserted=indexed_chunks,
             )
-            print(f"Extracted {extraction_response.total_pages} pages")
 
-            # Check if we have valid content to index
-            if not markdown_document or not markdown_document.pages:
-                print(
-                    f"No content extracted from document {document_id}, skipping Qdrant indexing"
+            async def mark_indexed(page_number: int, chunks: int) -> None:
+                await asyncio.to_thread(
+                    self.pages_dto.mark_indexed, document_id, page_number
                 )
-                total_chunks = 0
-            else:
-                # Check if pages have actual content (text, tables, or figures)
-                pages_with_content = []
-                for page in markdown_document.pages:
-                    # Check for text content
-                    page_content = getattr(page, "markdown_content", "") or getattr(
-                        page, "content", ""
+
+            # Step 2 runs alongside step 1: each page is indexed once extracted
+            pipeline = PageIndexingPipeline(
+                vector_store=self.vector_store,
+                document_id=document_id,
+                filename=file_path.split("/")[-1],
+                on_page_indexed=mark_indexed,
+                progress=progress,
+            ).start()
+
+            async def checkpoint_page(extracted: ExtractedPage) -> None:
+                if extracted.page is None:
+                    await asyncio.to_thread(
+                        self.pages_dto.save_failed_page,
+                        document_id,
+                        extracted.page_number,
+                        extracted.error or "Unknown error",
                     )
-                    has_text = page_content and page_content.strip()
+                    return
 
-                    # Check for tables
-                    tables = getattr(page, "tables", []) or []
-                    has_tables = len(tables) > 0
+                extracted_pages[extracted.page_number] = (
+                    extracted.page,
+                    extracted.tokens_used,
+                )
+                await asyncio.to_thread(
+                    self.pages_dto.save_page,
+                    document_id,
+                    extracted.page_number,
+                    extracted.page,
+                    extracted.tokens_used,
+                    extracted.source,
+                )
+                progress.add(pages_extracted=1)
+                await pipeline.put(extracted.page_number, extracted.page)
 
-                    # Check for figures
-                    figures = getattr(page, "figures", []) or []
-                    has_figures = len(figures) > 0
+            async def index_checkpoints() -> None:
+                # Pages extracted by an earlier attempt that never reached Qdrant
+                for page_number, checkpoint in sorted(checkpoints.items()):
+                    if not checkpoint.indexed:
+                        await pipeline.put(page_number, checkpoint.page)
 
-                    # Page has content if it has text, tables, or figures
-                    if has_text or has_tables or has_figures:
-                        pages_with_content.append(page)
+            # Step 1: Extract content using OpenAI Vision
+            print(f"Starting OpenAI vision extraction for document {document_id}")
 
-                if not pages_with_content:
-                    print(
-                        f"No pages with content found in document {document_id}, skipping Qdrant indexing"
-                    )
-                    total_chunks = 0
-                else:
-                    # Step 2: Index content in Qdrant
-                    print(
-                        f"Starting Qdrant indexing for document {document_id} with {len(pages_with_content)} pages"
+            extraction_request = OpenAIExtractionRequest(
+                file_path=file_path,
+                document_id=document_id,
+                extract_tables=extract_tables,
+                extract_figures=extract_figures,
+            )
+
+            try:
+                _, extraction_response = await asyncio.gather(
+                    index_checkpoints(),
+                    self.openai_client.extract_document_content(
+                        extraction_request,
+                        skip_pages=set(checkpoints),
+                        on_page=checkpoint_page,
+                        on_rendered=lambda _: progress.add(pages_rendered=1),
+                    ),
+                )
+            except BaseException:
+                await pipeline.abort()
+                raise
+
+            # Wait for the last pages to be indexed
+            await pipeline.close()
+
+            failed_pages = extraction_response.failed_pages
+            failed_pages_message = None
+            if failed_pages:
+                failed_pages_message = (
+                    f"Extraction failed for {len(failed_pages)} page(s): "
+                    f"{', '.join(str(page_number + 1) for page_number in failed_pages)}"
+                )
+                if not allow_failed_pages:
+                    raise Exception(
+                        f"{failed_pages_message}. {len(extracted_pages)} extracted pages "
+                        "were saved and will be reused on retry"
                     )
 
-                    try:
-                        total_chunks = self.vector_store.index_document(
-                            document_id=document_id,
-                            filename=file_path.split("/")[
-                                -1
-                            ],  # Extract filename from path
-                            markdown_doc_data=markdown_document.dict(),
-                        )
+            # Chunks indexed by earlier runs for pages the document doesn't have now
+            await asyncio.to_thread(
+                self.vector_store.delete_other_pages, document_id, list(extracted_pages)
+            )
+            total_chunks = await asyncio.to_thread(
+                self.vector_store.count_document_chunks, document_id
+            )
 
-                        print(f"Indexed {total_chunks} chunks in Qdrant")
+            # Assemble the document from this attempt and earlier checkpoints
+            markdown_document = MarkdownDocument(
+                pages=[page for _, (page, _) in sorted(extracted_pages.items())]
+            )
+            total_tokens_used = sum(tokens for _, tokens in extracted_pages.values())
 
-                    except Exception as qdrant_error:
-                        print(f"Qdrant indexing failed: {qdrant_error}")
-                        # Continue with processing even if Qdrant indexing fails
-                        total_chunks = 0
+            print(
+                f"OpenAI extraction completed in {extraction_response.processing_time:.2f}s"
+            )
+            print(
+                f"Extracted {len(markdown_document.pages)} pages "
+                f"({resumed_pages} resumed from checkpoints)"
+            )
+            print(
+                f"Page extraction cache: {extraction_response.cache_hits} hits, "
+                f"{extraction_response.cache_misses} misses"
+            )
+            print(
+                f"Indexed {pipeline.chunks_indexed} chunks from {pipeline.pages_indexed} "
+                f"pages in Qdrant ({total_chunks} chunks total)"
+            )
 
             # Step 3: Calculate document statistics
             processing_time = time.time() - start_time
 
             # Step 4: Update document with processing results
-            updated_doc = self.documents_dto.update_document_processing_status(
+            await asyncio.to_thread(
+                self.documents_dto.update_document_processing_status,
                 document_id=document_id,
                 status="completed",
                 processing_time=processing_time,
                 tables_count=len(markdown_document.get_all_tables()),
                 figures_count=len(markdown_document.get_all_figures()),
-                openai_tokens_used=extraction_response.total_tokens_used,
+                openai_tokens_used=total_tokens_used,
+                error_message=failed_pages_message,
             )
 
-            # Update document metadata if extracted
-            if markdown_document.pages:
-                first_page = markdown_document.pages[0]
-
-                # Serialize MarkdownDocument to JSON for storage
-                markdown_content_json = json.dumps(markdown_document.dict())
-
-                self.documents_dto.update_document_metadata(
-                    document_id=document_id,
-                    page_count=len(markdown_document.pages),
-                    language=(
-                        first_page.metadata.language if first_page.metadata else "en"
-                    ),
-                    markdown_content=markdown_content_json,
-                )
-            else:
-                # Update with minimal metadata if no content was extracted
-                self.documents_dto.update_document_metadata(
-                    document_id=document_id,
-                    page_count=0,
-                    language="unknown",
-                    markdown_content=None,
-                )
+            # Serializing the whole document is too slow for the event loop
+            await asyncio.to_thread(
+                self._save_document_metadata, document_id, markdown_document
+            )
 
             return {
                 "success": True,
@@ -158,7 +236,11 @@ class DocumentProcessor:
                 "processing_time": processing_time,
                 "total_pages": len(markdown_document.pages),
                 "total_chunks": total_chunks,
-                "openai_tokens": extraction_response.total_tokens_used,
+                "openai_tokens": total_tokens_used,
+                "extraction_cache_hits": extraction_response.cache_hits,
+                "extraction_cache_misses": extraction_response.cache_misses,
+                "resumed_pages": resumed_pages,
+                "failed_pages": failed_pages,
                 "tables_extracted": len(markdown_document.get_all_tables()),
                 "figures_extracted": len(markdown_document.get_all_figures()),
                 "status": "completed",
@@ -169,7 +251,122 @@ class DocumentProcessor:
             error_message = str(e)
             processing_time = time.time() - start_time
 
-            self.documents_dto.update_document_processing_status(
+            await asyncio.to_thread(
+                self.documents_dto.update_document_processing_status,
+                document_id=document_id,
+                status="failed",
+                processing_time=processing_time,
+                error_message=error_message,
+            )
+
+            return {
+                "success": False,
+                "document_id": document_id,
+                "error": error_message,
+                "processing_time": processing_time,
+            }
+
+        finally:
+            await self.progress_tracker.finish(document_id)
+
+    def _save_document_metadata(
+        self, document_id: str, markdown_document: MarkdownDocument
+    ) -> None:
+        # Update document metadata if extracted
+        if markdown_document.pages:
+            first_page = markdown_document.pages[0]
+
+            # Serialize MarkdownDocument to JSON for storage
+            markdown_content_json = json.dumps(markdown_document.dict())
+
+            self.documents_dto.update_document_metadata(
+                document_id=document_id,
+                page_count=len(markdown_document.pages),
+                language=(
+                    first_page.metadata.language if first_page.metadata else "en"
+                ),
+                markdown_content=markdown_content_json,
+            )
+        else:
+            # Update with minimal metadata if no content was extracted
+            self.documents_dto.update_document_metadata(
+                document_id=document_id,
+                page_count=0,
+                language="unknown",
+                markdown_content=None,
+            )
+
+    async def clone_document(
+        self, document_id: str, source_document_id: str, file_path: str
+    ) -> Dict[str, Any]:
+        """Complete a duplicate upload by reusing an already processed document.
+
+        Copies the extracted markdown and the indexed Qdrant points instead of
+        running vision extraction again.
+        """
+        start_time = time.time()
+
+        try:
+            source_document = await asyncio.to_thread(
+                self.documents_dto.get_document, source_document_id
+            )
+            if source_document is None or not source_document.is_processed:
+                raise ValueError(
+                    f"Source document {source_document_id} is not available for reuse"
+                )
+
+            await asyncio.to_thread(
+                self.documents_dto.update_document_processing_status,
+                document_id=document_id,
+                status="processing",
+            )
+
+            print(f"Reusing content of document {source_document_id} for {document_id}")
+            # Scrolls and re-upserts every source point
+            total_chunks = await asyncio.to_thread(
+                self.vector_store.clone_document,
+                source_document_id=source_document_id,
+                document_id=document_id,
+                filename=file_path.split("/")[-1],
+            )
+
+            processing_time = time.time() - start_time
+
+            await asyncio.to_thread(
+                self.documents_dto.update_document_processing_status,
+                document_id=document_id,
+                status="completed",
+                processing_time=processing_time,
+                tables_count=source_document.tables_count,
+                figures_count=source_document.figures_count,
+            )
+            await asyncio.to_thread(
+                self.documents_dto.update_document_metadata,
+                document_id=document_id,
+                page_count=source_document.page_count,
+                language=source_document.language,
+                markdown_content=source_document.markdown_content,
+            )
+
+            return {
+                "success": True,
+                "document_id": document_id,
+                "duplicate_of": source_document_id,
+                "processing_time": processing_time,
+                "total_pages": source_document.page_count,
+                "total_chunks": total_chunks,
+                "openai_tokens": 0,
+                "tables_extracted": source_document.tables_count,
+                "figures_extracted": source_document.figures_count,
+                "status": "completed",
+            }
+
+        except Exception as e:
+            error_message = str(e)
+            processing_time = time.time() - start_time
+
+            await asyncio.to_thread(
+                self.documents_dto.update_document_processing_status,
                 document_id=document_id,
                 status="failed",
                 processing_time=processing_time,
@@ -186,24 +383,28 @@ class DocumentProcessor:
     def search_document_content(
         self,
         query: str,
-        document_id: Optional[str] = None,
+        document_id: Optional[Union[str, List[str]]] = None,
         limit: int = 10,
         include_tables: bool = True,
         include_figures: bool = True,
         use_hybrid_search: bool = True,
         score_threshold: float = None,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search document content using official Qdrant hybrid search or dense-only search.
 
         Args:
             query: Search query
-            document_id: Limit search to specific document
+            document_id: Limit search to a document or a list of documents
             limit: Maximum results to return
             include_tables: Include table content in search
             include_figures: Include figure content in search
             use_hybrid_search: Whether to use hybrid search (official Qdrant approach)
             score_threshold: Minimum score threshold (uses defaults if None)
+            language: Limit search to chunks in this language
+            page_range: Inclusive (first, last) zero-based page numbers
         """
 
         # Determine chunk types to search
@@ -226,6 +427,8 @@ class DocumentProcessor:
                     chunk_types=chunk_types,
                     limit=limit,
                     score_threshold=score_threshold,
+                    language=language,
+                    page_range=page_range,
                 )
             else:
                 # Fallback to dense-only search
@@ -235,6 +438,8 @@ class DocumentProcessor:
                     chunk_types=chunk_types,
                     limit=limit,
                     score_threshold=score_threshold,
+                    language=language,
+                    page_range=page_range,
                 )
 
         except Exception as e:
@@ -246,32 +451,36 @@ class DocumentProcessor:
                 chunk_types=chunk_types,
                 limit=limit,
                 score_threshold=0.7,
+                language=language,
+                page_range=page_range,
             )
 
     def delete_document_content(self, document_id: str) -> bool:
         """Delete document content from Qdrant and database."""
-        qdrant_success = False
-        database_success = False
-
-        try:
-            # Delete from Qdrant first
-            print(f"Deleting document {document_id} from Qdrant vector store...")
-            qdrant_success = self.vector_store.delete_document(document_id)
+        # Delete from Qdrant first
+        print(f"Deleting document {document_id} from Qdrant vector store...")
+        qdrant_success = self.vector_store.delete_document(document_id)
+        return self._delete_database_content(document_id, qdrant_success)
+
+    async def adelete_document_content(self, document_id: str) -> bool:
+        """Async ``delete_document_content`` for request handlers."""
+        print(f"Deleting document {document_id} from Qdrant vector store...")
+        qdrant_success = await self.vector_store.adelete_document(document_id)
+        return await asyncio.to_thread(
+            self._delete_database_content, document_id, qdrant_success
+        )
 
-            if qdrant_success:
-                print(f"✅ Successfully deleted document {document_id} from Qdrant")
-            else:
-                print(f"⚠️ Failed to delete document {document_id} from Qdrant")
-
-        except Exception as qdrant_error:
-            print(
-                f"❌ Qdrant deletion error for document {document_id}: {qdrant_error}"
-            )
-            qdrant_success = False
+    def _delete_database_content(self, document_id: str, qdrant_success: bool) -> bool:
+        if qdrant_success:
+            print(f"✅ Successfully deleted document {document_id} from Qdrant")
+        else:
+            print(f"⚠️ Failed to delete document {document_id} from Qdrant")
 
+        database_success = False
         try:
             # Delete from database (always attempt this even if Qdrant fails)
             print(f"Deleting document {document_id} from database...")
+            self.pages_dto.delete_pages(document_id)
             self.documents_dto.delete_document(document_id)
             database_success = True
             print(f"✅ Successfully deleted document {document_id} from database")
@@ -304,12 +513,27 @@ class DocumentProcessor:
                 "qdrant_collection_stats": qdrant_stats,
                 "hybrid_search": {
                     "approach": "official_qdrant_fastembed",
-                    "dense_model": self.vector_store.DENSE_MODEL,
-                    "sparse_model": self.vector_store.SPARSE_MODEL,
+                    "dense_model": self.vector_store.embeddings.dense_model_name,
+                    "sparse_model": self.vector_store.embeddings.sparse_model_name,
                     "fusion_method": "reciprocal_rank_fusion",
                     "native_qdrant_fusion": True,
                 },
                 "openai_vision_model": self.openai_client.model,
+                "query_embedding_cache": (
+                    self.vector_store.embeddings.get_query_cache_stats()
+                ),
+                "extraction_cache": (
+                    self.openai_client.page_cache.get_stats()
+                    if self.openai_client.page_cache
+                    else {"enabled": False}
+                ),
+                "embedding": {
+                    "batch_size": settings.embedding_batch_size,
+                    "threads": settings.embedding_threads,
+                    "parallel": settings.embedding_parallel,
+                    "providers": settings.embedding_providers,
+                    "upload_batch_size": settings.qdrant_upload_batch_size,
+                },
                 "smart_chunking": {
                     "chunk_size": 600,
                     "chunk_overlap": 100,
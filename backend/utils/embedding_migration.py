@@ -0,0 +1,141 @@
+import logging
+import time
+from typing import List, Optional
+
+from config import settings
+from qdrant_client import models
+from utils.embeddings import get_embedding_models
+from utils.qdrant_client import ActiveCollection, QdrantOfficialHybridStore
+
+logger = logging.getLogger(__name__)
+
+# Catch-up passes before the swap, until one changes at most this many chunks
+MAX_CATCH_UP_PASSES = 5
+CATCH_UP_THRESHOLD = 100
+
+
+class EmbeddingMigration:
+    """Rebuilds the aliased collection with other embedding models.
+
+    Chunk text is read from the chunk store (or from the payload of points
+    indexed before it existed), so no page is extracted again. The old
+    collection keeps serving searches and writes while the new one is filled;
+    catch-up passes copy what changed meanwhile, the alias is swapped in one
+    request, and a last pass picks up writes that were still in flight.
+
+    Chunk ids are stable, so an interrupted migration resumes where it
+    stopped when run again with the same models.
+    """
+
+    def __init__(
+        self,
+        vector_store: QdrantOfficialHybridStore,
+        dense_model: str,
+        sparse_model: str,
+        batch_size: Optional[int] = None,
+        settle_seconds: Optional[float] = None,
+    ):
+        self.vector_store = vector_store
+        self.client = vector_store.client
+        self.dense_model = dense_model
+        self.sparse_model = sparse_model
+        self.batch_size = batch_size or settings.qdrant_upload_batch_size
+        # Long enough for every process to have followed the alias swap
+        self.settle_seconds = (
+            settle_seconds
+            if settle_seconds is not None
+            else settings.qdrant_alias_refresh_seconds * 2 + 30
+        )
+
+    def run(self, drop_old: bool = False) -> str:
+        """Build, fill and activate the new collection. Returns its name."""
+        source = self.vector_store.active_collection().name
+        target = ActiveCollection(
+            self.vector_store.create_collection(self.dense_model, self.sparse_model),
+            get_embedding_models(self.dense_model, self.sparse_model),
+        )
+        if target.name == source:
+            logger.info(f"Collection {source} already uses these models")
+            return source
+
+        logger.info(f"Migrating {source} to {target.name}")
+        for pass_number in range(1, MAX_CATCH_UP_PASSES + 1):
+            changed = self._sync(source, target)
+            logger.info(f"Pass {pass_number}: {changed} chunks changed")
+            if changed <= CATCH_UP_THRESHOLD:
+                break
+
+        self.vector_store.point_alias(target.name)
+
+        # Writers that resolved the alias before the swap still write to source
+        time.sleep(self.settle_seconds)
+        changed = self._sync(source, target)
+        logger.info(f"Final pass: {changed} chunks changed")
+
+        if drop_old:
+            self.client.delete_collection(source)
+            logger.info(f"Dropped collection {source}")
+
+        return target.name
+
+    def _sync(self, source: str, target: ActiveCollection) -> int:
+        """Copy chunks missing from ``target`` and drop ones deleted since."""
+        source_ids = self.vector_store.get_point_ids(None, collection_name=source)
+        target_ids = self.vector_store.get_point_ids(None, collection_name=target.name)
+
+        # Deleted chunks lose their stored content; anything else in target
+        # only (written after the swap) is kept
+        extra_ids = list(target_ids - source_ids)
+        stored = self.vector_store.chunks_dto.get_chunks(extra_ids)
+        deleted_ids = [point_id for point_id in extra_ids if point_id not in stored]
+        if deleted_ids:
+            self.client.delete(
+                collection_name=target.name,
+                points_selector=models.PointIdsList(points=deleted_ids),
+            )
+
+        missing_ids = sorted(source_ids - target_ids)
+        for start in range(0, len(missing_ids), self.batch_size):
+            self._copy(source, target, missing_ids[start : start + self.batch_size])
+
+        return len(missing_ids) + len(deleted_ids)
+
+    def _copy(
+        self, source: str, target: ActiveCollection, point_ids: List[str]
+    ) -> None:
+        points = self.client.retrieve(
+            collection_name=source, ids=point_ids, with_payload=True
+        )
+        stored = self.vector_store.chunks_dto.get_chunks(point_ids)
+
+        texts, payloads, ids, legacy_chunks = [], [], [], []
+        for point in points:
+            point_id = str(point.id)
+            payload = point.payload
+            if "content" in payload:
+                # Indexed before content moved out of Qdrant
+                payload, chunk = self.vector_store._split_payload(point_id, payload)
+                legacy_chunks.append(chunk)
+            elif point_id in stored:
+                chunk = stored[point_id]
+            else:
+                continue  # Deleted since the ids were listed
+
+            texts.append(chunk.content)
+            payloads.append(payload)
+            ids.append(point_id)
+
+        if not ids:
+            return
+
+        self.vector_store.chunks_dto.save_chunks(legacy_chunks)
+        vectors = self.vector_store.embed_texts(texts, target)
+        self.client.upload_points(
+            collection_name=target.name,
+            points=[
+                models.PointStruct(id=point_id, vector=vector, payload=payload)
+                for point_id, vector, payload in zip(ids, vectors, payloads)
+            ],
+            batch_size=self.batch_size,
+            wait=True,
+        )
@@ -0,0 +1,297 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from config import settings
+from constants import QdrantDefaults
+from fastembed import SparseEmbedding, SparseTextEmbedding, TextEmbedding
+from qdrant_client import models
+
+logger = logging.getLogger(__name__)
+
+# Official models from Qdrant documentation; collections created before
+# embedding migrations were built with these
+DENSE_MODEL = QdrantDefaults.DENSE_MODEL
+SPARSE_MODEL = QdrantDefaults.SPARSE_MODEL
+
+
+def to_sparse_vector(embedding: SparseEmbedding) -> models.SparseVector:
+    return models.SparseVector(
+        indices=embedding.indices.tolist(), values=embedding.values.tolist()
+    )
+
+
+QueryVectors = Tuple[List[float], models.SparseVector]
+CachedVectors = Union[QueryVectors, List[float]]
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Prefix of cache keys holding dense-only query vectors
+_DENSE_KEY_PREFIX = "dense:"
+
+
+def normalize_query(query: str) -> str:
+    """Query text as sent to the models, with whitespace collapsed."""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def query_cache_key(query: str) -> str:
+    # Case is ignored only for cache lookups; cased models still see it
+    return normalize_query(query).lower()
+
+
+class QueryEmbeddingCache:
+    """LRU cache of query vectors, bounded by entry count and age.
+
+    Keyed by normalized query text, so repeated questions (and the same
+    question across sessions) skip dense and SPLADE inference entirely.
+    Dense-only lookups are cached under their own keys.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedVectors]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedVectors]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vectors: CachedVectors) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vectors)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class EmbeddingModels:
+    """Dense and sparse fastembed models, loaded once and shared by the process.
+
+    Indexing and search both embed through this registry, so each API worker
+    holds a single copy of every model no matter how many stores or RAG
+    instances it creates.
+    """
+
+    def __init__(
+        self, dense_model: str = DENSE_MODEL, sparse_model: str = SPARSE_MODEL
+    ):
+        self.dense_model_name = dense_model
+        self.sparse_model_name = sparse_model
+        self._dense: Optional[TextEmbedding] = None
+        self._sparse: Optional[SparseTextEmbedding] = None
+        self._lock = threading.Lock()
+        # Dense half of embed_documents; sized for a few concurrent documents
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="embed")
+        self.query_cache = (
+            QueryEmbeddingCache(
+                max_entries=settings.query_embedding_cache_size,
+                ttl_seconds=settings.query_embedding_cache_ttl_seconds,
+            )
+            if settings.query_embedding_cache_size > 0
+            else None
+        )
+
+    @property
+    def dense(self) -> TextEmbedding:
+        if self._dense is None:
+            with self._lock:
+                if self._dense is None:
+                    self._dense = TextEmbedding(
+                        model_name=self.dense_model_name, **self._model_options()
+                    )
+        return self._dense
+
+    @property
+    def sparse(self) -> SparseTextEmbedding:
+        if self._sparse is None:
+            with self._lock:
+                if self._sparse is None:
+                    self._sparse = SparseTextEmbedding(
+                        model_name=self.sparse_model_name, **self._model_options()
+                    )
+        return self._sparse
+
+    @staticmethod
+    def _model_options() -> Dict[str, Any]:
+        return {
+            "threads": settings.embedding_threads,
+            "providers": settings.embedding_providers,
+        }
+
+    def _embed_dense(self, texts: List[str]) -> List[List[float]]:
+        return [
+            vector.tolist()
+            for vector in self.dense.embed(
+                texts,
+                batch_size=settings.embedding_batch_size,
+                parallel=settings.embedding_parallel,
+            )
+        ]
+
+    def _embed_sparse(self, texts: List[str]) -> List[models.SparseVector]:
+        return [
+            to_sparse_vector(vector)
+            for vector in self.sparse.embed(
+                texts,
+                batch_size=settings.embedding_batch_size,
+                parallel=settings.embedding_parallel,
+            )
+        ]
+
+    def embed_documents(
+        self, texts: List[str]
+    ) -> Tuple[List[List[float]], List[models.SparseVector]]:
+        """Embed passages for indexing, running both models side by side.
+
+        onnxruntime releases the GIL during inference, so the dense and sparse
+        models run in parallel threads.
+        """
+        start_time = time.time()
+        dense_future = self._executor.submit(self._timed, self._embed_dense, texts)
+        sparse, sparse_seconds = self._timed(self._embed_sparse, texts)
+        dense, dense_seconds = dense_future.result()
+
+        logger.debug(
+            f"Embedded {len(texts)} chunks in {time.time() - start_time:.2f}s "
+            f"(dense {dense_seconds:.2f}s, sparse {sparse_seconds:.2f}s)"
+        )
+        return dense, sparse
+
+    @staticmethod
+    def _timed(embed, texts: List[str]) -> Tuple[List[Any], float]:
+        start_time = time.time()
+        return embed(texts), time.time() - start_time
+
+    def embed_query(self, query: str) -> QueryVectors:
+        """Embed a search query, reusing cached vectors for repeated queries.
+
+        The returned vectors may be shared with other callers and must not be
+        modified.
+        """
+        key = query_cache_key(query)
+        if self.query_cache is not None:
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = normalize_query(query)
+        dense = next(iter(self.dense.query_embed(text))).tolist()
+        sparse = to_sparse_vector(next(iter(self.sparse.query_embed(text))))
+
+        if self.query_cache is not None:
+            self.query_cache.put(key, (dense, sparse))
+        return dense, sparse
+
+    def embed_dense_query(self, query: str) -> List[float]:
+        """Dense vector of a search query, for searches that skip SPLADE.
+
+        The returned vector may be shared with other callers and must not be
+        modified.
+        """
+        key = _DENSE_KEY_PREFIX + query_cache_key(query)
+        if self.query_cache is not None:
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                return cached
+
+        dense = next(iter(self.dense.query_embed(normalize_query(query)))).tolist()
+
+        if self.query_cache is not None:
+            self.query_cache.put(key, dense)
+        return dense
+
+    def embed_queries(self, queries: List[str]) -> List[QueryVectors]:
+        """Embed many search queries, running inference once for all cache misses."""
+        keys = [query_cache_key(query) for query in queries]
+        texts = {key: normalize_query(query) for key, query in zip(keys, queries)}
+        vectors: Dict[str, QueryVectors] = {}
+
+        if self.query_cache is not None:
+            for key in keys:
+                if key not in vectors:
+                    cached = self.query_cache.get(key)
+                    if cached is not None:
+                        vectors[key] = cached
+
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+        if missing:
+            missing_texts = [texts[key] for key in missing]
+            dense = self.dense.query_embed(
+                missing_texts, batch_size=settings.embedding_batch_size
+            )
+            sparse = self.sparse.query_embed(
+                missing_texts, batch_size=settings.embedding_batch_size
+            )
+            for key, dense_vector, sparse_vector in zip(missing, dense, sparse):
+                vectors[key] = (dense_vector.tolist(), to_sparse_vector(sparse_vector))
+                if self.query_cache is not None:
+                    self.query_cache.put(key, vectors[key])
+
+        return [vectors[key] for key in keys]
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        if self.query_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.query_cache.get_stats()}
+
+    def warm_up(self) -> None:
+        """Load both models and run one inference so the first query is fast."""
+        start_time = time.time()
+        next(iter(self.dense.query_embed("warm up")))
+        next(iter(self.sparse.query_embed("warm up")))
+        logger.info(
+            f"Embedding models {self.dense_model_name} and {self.sparse_model_name} "
+            f"ready in {time.time() - start_time:.2f}s"
+        )
+
+
+_embedding_models: Dict[Tuple[str, str], EmbeddingModels] = {}
+_embedding_models_lock = threading.Lock()
+
+
+def get_embedding_models(
+    dense_model: Optional[str] = None, sparse_model: Optional[str] = None
+) -> EmbeddingModels:
+    """Return the process-wide models for a dense/sparse pair.
+
+    Defaults to the configured models. During an embedding migration a
+    process can hold two pairs: the old one for the collection being served
+    and the new one for the collection being built.
+    """
+    key = (
+        dense_model or settings.embedding_dense_model,
+        sparse_model or settings.embedding_sparse_model,
+    )
+    with _embedding_models_lock:
+        if key not in _embedding_models:
+            _embedding_models[key] = EmbeddingModels(*key)
+        return _embedding_models[key]
@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+from dto.openai_models import MarkdownPage
+
+logger = logging.getLogger(__name__)
+
+
+class PageExtractionCache:
+    """Persistent, size-bounded LRU cache of vision extraction results.
+
+    Entries are keyed by a hash of the rendered page image together with
+    everything that influences the model output (model, prompt version and
+    extraction flags), so unchanged pages are never sent to the API twice.
+
+    Hits only record their access time when it is older than
+    ``TOUCH_INTERVAL_SECONDS``, and the cache size is tracked in memory, so
+    reads rarely write and writes rarely scan the table.
+    """
+
+    # Resolution of the LRU order; hits within it don't write to the database
+    TOUCH_INTERVAL_SECONDS = 600
+    # Other processes sharing the file also add entries, so the in-memory size
+    # is re-read from the table at least this often
+    SIZE_RESYNC_SECONDS = 300
+    # Eviction frees room down to this share of max_bytes, so a full cache
+    # isn't trimmed (and re-measured) on every write
+    EVICTION_TARGET = 0.9
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS page_cache (
+                cache_key TEXT PRIMARY KEY,
+                page_json TEXT NOT NULL,
+                tokens_used INTEGER NOT NULL DEFAULT 0,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_page_cache_last_accessed "
+            "ON page_cache (last_accessed)"
+        )
+        self._connection.commit()
+        self._sync_size_locked()
+
+    @staticmethod
+    def make_key(
+        image_bytes: bytes,
+        model: str,
+        prompt_version: str,
+        extract_tables: bool,
+        extract_figures: bool,
+    ) -> str:
+        """Build the content address for a page extraction."""
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        return hashlib.sha256(
+            f"{digest}|{model}|{prompt_version}|"
+            f"tables={extract_tables}|figures={extract_figures}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Tuple[MarkdownPage, int]]:
+        """Return the cached page and the tokens it originally cost, if present."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT page_json, tokens_used, last_accessed FROM page_cache "
+                "WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if now - row[2] >= self.TOUCH_INTERVAL_SECONDS:
+                self._connection.execute(
+                    "UPDATE page_cache SET last_accessed = ? WHERE cache_key = ?",
+                    (now, cache_key),
+                )
+                self._connection.commit()
+
+        try:
+            return MarkdownPage.model_validate_json(row[0]), row[1]
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {cache_key[:12]}: {e}")
+            self.delete(cache_key)
+            return None
+
+    def put(self, cache_key: str, page: MarkdownPage, tokens_used: int) -> None:
+        """Store an extraction result and evict least recently used entries."""
+        page_json = page.model_dump_json()
+        now = time.time()
+
+        with self._lock:
+            replaced_bytes = self._entry_size_locked(cache_key)
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO page_cache
+                    (cache_key, page_json, tokens_used, size_bytes, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (cache_key, page_json, tokens_used, len(page_json), now, now),
+            )
+            self._total_bytes += len(page_json) - replaced_bytes
+            if time.monotonic() - self._size_synced_at >= self.SIZE_RESYNC_SECONDS:
+                self._sync_size_locked()
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+            self._connection.commit()
+
+    def delete(self, cache_key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._entry_size_locked(cache_key)
+            self._connection.execute(
+                "DELETE FROM page_cache WHERE cache_key = ?", (cache_key,)
+            )
+            self._connection.commit()
+
+    def _entry_size_locked(self, cache_key: str) -> int:
+        row = self._connection.execute(
+            "SELECT size_bytes FROM page_cache WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _sync_size_locked(self) -> None:
+        """Re-read the cache size, which other processes may have changed."""
+        self._total_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM page_cache"
+        ).fetchone()[0]
+        self._size_synced_at = time.monotonic()
+
+    def _evict_locked(self) -> None:
+        """Drop least recently used entries until the cache is back under its limit."""
+        # Only reached when the tracked size is over the limit; confirm first
+        self._sync_size_locked()
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        excess = self._total_bytes - int(self.max_bytes * self.EVICTION_TARGET)
+        freed = 0
+        stale_keys = []
+        for cache_key, size_bytes in self._connection.execute(
+            "SELECT cache_key, size_bytes FROM page_cache ORDER BY last_accessed ASC"
+        ):
+            stale_keys.append((cache_key,))
+            freed += size_bytes
+            if freed >= excess:
+                break
+
+        self._connection.executemany(
+            "DELETE FROM page_cache WHERE cache_key = ?", stale_keys
+        )
+        self._total_bytes -= freed
+        logger.info(
+            f"Evicted {len(stale_keys)} page extraction cache entries ({freed} bytes)"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM page_cache"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "size_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_page_cache: Optional[PageExtractionCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_extraction_cache() -> Optional[PageExtractionCache]:
+    """Get the process-wide page extraction cache, or None when disabled."""
+    global _page_cache
+
+    if not settings.extraction_cache_enabled:
+        return None
+
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageExtractionCache(
+                db_path=settings.extraction_cache_path,
+                max_bytes=settings.extraction_cache_max_bytes,
+            )
+        return _page_cache
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import settings
+from dto.openai_models import MarkdownPage
+from utils.progress import DocumentProgress
+from utils.qdrant_client import QdrantOfficialHybridStore
+
+logger = logging.getLogger(__name__)
+
+PageIndexedCallback = Callable[[int, int], Awaitable[None]]
+
+# Marks the end of input on a stage queue
+_DONE = None
+
+
+class PageIndexingPipeline:
+    """Chunks, embeds and upserts pages while extraction is still running.
+
+    Pages go through two stages connected by bounded queues: chunk + embed
+    (CPU bound, run in a thread) and upsert to Qdrant (network bound). Each page
+    is searchable as soon as it leaves the second stage, and a full queue makes
+    ``put`` wait, so a slow stage applies backpressure instead of buffering the
+    whole document in memory.
+
+    Pages are diffed against what is already indexed: only chunks with a new
+    id are embedded and written, and ids the page no longer produces are
+    deleted, so re-indexing unchanged content costs no inference.
+
+    A stage error doesn't stop the other pages from flowing through; the first
+    error is raised by ``close``.
+    """
+
+    def __init__(
+        self,
+        vector_store: QdrantOfficialHybridStore,
+        document_id: str,
+        filename: str,
+        queue_size: Optional[int] = None,
+        on_page_indexed: Optional[PageIndexedCallback] = None,
+        progress: Optional[DocumentProgress] = None,
+    ):
+        self.vector_store = vector_store
+        self.document_id = document_id
+        self.filename = filename
+        self.on_page_indexed = on_page_indexed
+        self.progress = progress
+
+        queue_size = max(1, queue_size or settings.indexing_queue_size)
+        self._pages: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._embedded: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._error: Optional[Exception] = None
+
+        self.pages_indexed = 0
+        self.chunks_indexed = 0
+        self.chunks_reused = 0  # Unchanged since the last indexing, not re-embedded
+        # Busy time per stage, to tell which one is the bottleneck
+        self.stage_seconds = {"chunk": 0.0, "embed": 0.0, "upsert": 0.0}
+
+    def start(self) -> "PageIndexingPipeline":
+        self._tasks = [
+            asyncio.create_task(self._embed_stage()),
+            asyncio.create_task(self._upsert_stage()),
+        ]
+        return self
+
+    async def put(self, page_number: int, page: MarkdownPage) -> None:
+        """Queue an extracted page, waiting while the pipeline is full."""
+        await self._pages.put((page_number, page.dict()))
+
+    async def close(self) -> None:
+        """Wait for queued pages to be indexed and raise the first stage error."""
+        await self._pages.put(_DONE)
+        await asyncio.gather(*self._tasks)
+
+        logger.info(
+            f"Indexed {self.chunks_indexed} chunks from {self.pages_indexed} pages "
+            f"of document {self.document_id} ({self.chunks_reused} unchanged): "
+            + ", ".join(
+                f"{stage} {seconds:.2f}s"
+                for stage, seconds in self.stage_seconds.items()
+            )
+        )
+
+        if self._error is not None:
+            raise self._error
+
+    async def abort(self) -> None:
+        """Stop indexing immediately, dropping queued pages."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _record_error(self, page_number: int, error: Exception) -> None:
+        logger.error(
+            f"Indexing page {page_number} of document {self.document_id} failed: {error}"
+        )
+        if self._error is None:
+            self._error = Exception(
+                f"Indexing failed for page {page_number + 1}: {error}"
+            )
+
+    async def _embed_stage(self) -> None:
+        while (item := await self._pages.get()) is not _DONE:
+            page_number, page_data = item
+            if self._error is not None:
+                continue
+
+            try:
+                start_time = time.perf_counter()
+                texts, payloads = await asyncio.to_thread(
+                    self.vector_store.prepare_page,
+                    self.document_id,
+                    self.filename,
+                    page_number,
+                    page_data,
+                )
+                # Resolved per page, so an alias swap is followed mid-document
+                collection = await asyncio.to_thread(
+                    self.vector_store.active_collection
+                )
+                # Chunks already indexed with the same id and text are kept
+                changed, stale_ids = await asyncio.to_thread(
+                    self.vector_store.diff_chunks,
+                    self.document_id,
+                    payloads,
+                    page_number,
+                    collection.name,
+                )
+                embed_start = time.perf_counter()
+                vectors = await asyncio.to_thread(
+                    self.vector_store.embed_texts,
+                    [texts[position] for position in changed],
+                    collection,
+                )
+                self.stage_seconds["chunk"] += embed_start - start_time
+                self.stage_seconds["embed"] += time.perf_counter() - embed_start
+            except Exception as e:
+                self._record_error(page_number, e)
+                continue
+
+            self.chunks_reused += len(payloads) - len(changed)
+            if self.progress is not None:
+                self.progress.add(chunks_embedded=len(payloads))
+
+            await self._embedded.put(
+                (
+                    page_number,
+                    collection.name,
+                    vectors,
+                    [payloads[position] for position in changed],
+                    stale_ids,
+                    len(payloads),
+                )
+            )
+
+        await self._embedded.put(_DONE)
+
+    async def _upsert_stage(self) -> None:
+        while (item := await self._embedded.get()) is not _DONE:
+            page_number, collection_name, vectors, payloads, stale_ids, chunks = item
+            if self._error is not None:
+                continue
+
+            try:
+                start_time = time.perf_counter()
+                await asyncio.to_thread(
+                    self._update_page, collection_name, vectors, payloads, stale_ids
+                )
+                self.stage_seconds["upsert"] += time.perf_counter() - start_time
+            except Exception as e:
+                self._record_error(page_number, e)
+                continue
+
+            self.pages_indexed += 1
+            self.chunks_indexed += chunks
+            if self.progress is not None:
+                self.progress.add(pages_indexed=1, chunks_upserted=chunks)
+
+            if self.on_page_indexed is not None:
+                try:
+                    await self.on_page_indexed(page_number, chunks)
+                except Exception as e:
+                    logger.warning(
+                        f"Page indexed callback failed for page {page_number}: {e}"
+                    )
+
+    def _update_page(
+        self,
+        collection_name: str,
+        vectors: List[Dict[str, Any]],
+        payloads: List[Dict[str, Any]],
+        stale_ids: List[str],
+    ) -> None:
+        # New chunks go in before the ones they replace are removed
+        self.vector_store.upsert_chunks(vectors, payloads, collection_name)
+        self.vector_store.delete_points(stale_ids, collection_name)
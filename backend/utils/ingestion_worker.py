@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Dict, Optional
+
+from config import settings
+from constants import DocumentStatus, JobStatus, JobType
+from db.models import IngestionJob
+from dto.documents_dto import DocumentsDto
+from dto.jobs_dto import JobsDto
+from utils.document_processor import DocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorker:
+    """Claims ingestion jobs from the durable queue and runs them.
+
+    Each of ``concurrency`` slots claims one job at a time and keeps its lease
+    alive with heartbeats while the document is processed. A worker that
+    crashes simply stops heartbeating, and its jobs are reclaimed by any other
+    worker once the lease expires.
+    """
+
+    def __init__(
+        self,
+        db_engine,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        document_processor: Optional[DocumentProcessor] = None,
+    ):
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.concurrency = max(1, concurrency or settings.ingestion_worker_concurrency)
+        self.jobs_dto = JobsDto(db_engine)
+        self.documents_dto = DocumentsDto(db_engine)
+        self._db_engine = db_engine
+        self._document_processor = document_processor
+        self._stop_event: Optional[asyncio.Event] = None
+
+    @property
+    def document_processor(self) -> DocumentProcessor:
+        # Created on first use so an idle worker doesn't load embedding models
+        if self._document_processor is None:
+            self._document_processor = DocumentProcessor(self._db_engine)
+        return self._document_processor
+
+    async def run(self) -> None:
+        """Process jobs until ``stop`` is called."""
+        self._stop_event = asyncio.Event()
+        logger.info(
+            f"Ingestion worker {self.worker_id} started ({self.concurrency} slots)"
+        )
+        await asyncio.gather(*(self._run_slot() for _ in range(self.concurrency)))
+        logger.info(f"Ingestion worker {self.worker_id} stopped")
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; jobs already running are finished first."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def _run_slot(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                job = await asyncio.to_thread(
+                    self.jobs_dto.claim_next_job,
+                    self.worker_id,
+                    settings.ingestion_lease_seconds,
+                )
+            except Exception as e:
+                logger.error(f"Failed to claim ingestion job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(
+                        self._stop_event.wait(),
+                        timeout=settings.ingestion_poll_interval_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run_job(job)
+
+    async def _run_job(self, job: IngestionJob) -> None:
+        logger.info(
+            f"🔄 Worker {self.worker_id} running {job.job_type} job {job.job_id} "
+            f"for document {job.document_id} (attempt {job.attempts}/{job.max_attempts})"
+        )
+
+        job_task = asyncio.create_task(self._execute(job))
+        heartbeat_task = asyncio.create_task(self._heartbeat(job, job_task))
+
+        try:
+            result = await job_task
+            error_message = (
+                None if result.get("success") else result.get("error", "Unknown error")
+            )
+        except asyncio.CancelledError:
+            if heartbeat_task.done() and heartbeat_task.result():
+                logger.warning(
+                    f"Lost lease on job {job.job_id}, another worker has taken it over"
+                )
+                return
+
+            # Worker is shutting down - put the job straight back in the queue
+            await asyncio.to_thread(
+                self.jobs_dto.release_job, job.job_id, self.worker_id
+            )
+            raise
+        except Exception as e:
+            error_message = str(e)
+        finally:
+            heartbeat_task.cancel()
+
+        if error_message is None:
+            await asyncio.to_thread(
+                self.jobs_dto.complete_job, job.job_id, self.worker_id
+            )
+            logger.info(
+                f"✅ Document {job.document_id} processed successfully! "
+                f"{result['total_pages']} pages, {result['tables_extracted']} tables, "
+                f"{result['figures_extracted']} figures in {result['processing_time']:.2f}s"
+            )
+            return
+
+        status = await asyncio.to_thread(
+            self.jobs_dto.fail_job, job.job_id, self.worker_id, error_message
+        )
+        logger.error(
+            f"❌ Job {job.job_id} for document {job.document_id} failed: {error_message}"
+        )
+
+        try:
+            if status == JobStatus.QUEUED:
+                # Waiting for a retry rather than failed for good
+                await asyncio.to_thread(
+                    self.documents_dto.update_document_processing_status,
+                    document_id=job.document_id,
+                    status=DocumentStatus.PENDING,
+                )
+            elif status == JobStatus.FAILED:
+                await asyncio.to_thread(
+                    self.documents_dto.update_document_processing_status,
+                    document_id=job.document_id,
+                    status=DocumentStatus.FAILED,
+                    error_message=error_message,
+                )
+        except Exception as db_error:
+            logger.error(f"Failed to update document status: {db_error}")
+
+    async def _execute(self, job: IngestionJob) -> Dict[str, Any]:
+        if job.job_type == JobType.CLONE:
+            return await self.document_processor.clone_document(
+                document_id=job.document_id,
+                source_document_id=job.source_document_id,
+                file_path=job.file_path,
+            )
+
+        return await self.document_processor.process_document(
+            document_id=job.document_id,
+            file_path=job.file_path,
+            extract_tables=job.extract_tables,
+            extract_figures=job.extract_figures,
+            # Later attempts resume from the pages the first one saved
+            force=job.force and job.attempts == 1,
+            # Out of retries - complete the document without the failing pages
+            allow_failed_pages=job.attempts >= job.max_attempts,
+        )
+
+    async def _heartbeat(self, job: IngestionJob, job_task: asyncio.Task) -> bool:
+        """Renew the lease until cancelled. Returns True if the lease was lost."""
+        while True:
+            await asyncio.sleep(settings.ingestion_heartbeat_seconds)
+            try:
+                alive = await asyncio.to_thread(
+                    self.jobs_dto.heartbeat,
+                    job.job_id,
+                    self.worker_id,
+                    settings.ingestion_lease_seconds,
+                )
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for job {job.job_id}: {e}")
+                continue
+
+            if not alive:
+                job_task.cancel()
+                return True
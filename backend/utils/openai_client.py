@@ -4,9 +4,18 @@ import logging
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    AbstractSet,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+)
 
-import fitz  # PyMuPDF for PDF to image conversion
+import httpx
 import instructor
 from config import settings
 from dto.openai_models import (
@@ -18,38 +27,69 @@ from dto.openai_models import (
     OpenAIExtractionResponse,
     PageMetadata,
 )
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from utils.extraction_cache import PageExtractionCache, get_page_extraction_cache
+from utils.pdf_renderer import iter_rendered_pages, render_page
+from utils.rate_limiter import get_openai_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
+class ExtractedPage(NamedTuple):
+    """Outcome of extracting one page; ``page`` is None when extraction failed."""
+
+    page_number: int
+    page: Optional[MarkdownPage]
+    tokens_used: int = 0
+    source: str = "native"  # native, vision or cache
+    error: Optional[str] = None
+
+
+PageCallback = Callable[[ExtractedPage], Awaitable[None]]
+
+
 class OpenAIVisionClient:
     """Client for OpenAI Vision API to extract content from PDFs."""
 
+    # Bump whenever the extraction prompts change so cached pages are invalidated
+    PROMPT_VERSION = "1"
+
     def __init__(self):
-        # Initialize OpenAI client with Instructor for structured responses
-        openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.rate_limiter = get_openai_rate_limiter()
+
+        # Initialize OpenAI client with Instructor for structured responses.
+        # Retries are left to the shared rate limiter so 429s back off globally,
+        # and every response feeds its x-ratelimit-* headers back into it.
+        openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                event_hooks={"response": [self._record_rate_limits]}
+            ),
+        )
         self.client = instructor.from_openai(openai_client)
         self.model = "gpt-4.1"
+        self.page_cache = get_page_extraction_cache()
 
-    def _pdf_to_images(self, pdf_path: str, dpi: int = 150) -> List[bytes]:
-        """Convert PDF pages to images for vision processing."""
-        images = []
-
-        # Open PDF
-        pdf_document = fitz.open(pdf_path)
-
-        for page_num in range(pdf_document.page_count):
-            page = pdf_document[page_num]
+    async def _record_rate_limits(self, response: httpx.Response) -> None:
+        self.rate_limiter.update_from_headers(response.headers)
 
-            # Convert page to image
-            mat = fitz.Matrix(dpi / 72, dpi / 72)  # Scale factor for DPI
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            images.append(img_data)
+    def _native_text_options(
+        self, request: OpenAIExtractionRequest
+    ) -> Optional[Dict[str, Any]]:
+        """Options for the text-layer fast path, or None when it is disabled."""
+        if not settings.native_text_fast_path:
+            return None
 
-        pdf_document.close()
-        return images
+        return {
+            "language": request.language or "en",
+            "extract_tables": request.extract_tables,
+            "extract_figures": request.extract_figures,
+            "min_chars": settings.native_text_min_chars,
+            "max_image_coverage": settings.native_text_max_image_coverage,
+            "min_figure_area": settings.native_text_min_figure_area,
+            "max_drawings": settings.native_text_max_drawings,
+        }
 
     def _encode_image_to_base64(self, image_bytes: bytes) -> str:
         """Encode image bytes to base64 string."""
@@ -65,14 +105,16 @@ class OpenAIVisionClient:
         """Extract content from a single page using GPT-4.1 with vision capabilities and Instructor."""
 
         try:
-            # Use Instructor to get structured response with token tracking
-            completion = await self.client.chat.completions.create(
-                model=self.model,
-                response_model=MarkdownPage,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert document analysis AI. Extract content from this PDF page and return it as structured data.
+            # Use Instructor to get structured response with token tracking,
+            # scheduled against the process-wide OpenAI budget
+            completion = await self.rate_limiter.run(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    response_model=MarkdownPage,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": """You are an expert document analysis AI. Extract content from this PDF page and return it as structured data.
 
 Instructions:
 1. Convert all text content to clean markdown format preserving structure and hierarchy
@@ -90,13 +132,13 @@ Instructions:
 4. Detect the document language accurately
 5. Maintain reading order and document layout relationships
 6. Be thorough - do not skip content or leave fields empty unless truly no data exists""",
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"""Analyze this PDF page (page {page_number + 1}) and extract:
+                        },
+                        {
+                            "role": "user",
+                            "content": [
+                                {
+                                    "type": "text",
+                                    "text": f"""Analyze this PDF page (page {page_number + 1}) and extract:
 
 TEXT CONTENT:
 - Convert all text to clean markdown with proper headings, paragraphs, lists
@@ -119,96 +161,224 @@ LANGUAGE:
 - Detect the primary language of the page content
 
 Be thorough and complete - extract ALL visible content and data.""",
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_base64}",
-                                    "detail": "high",
                                 },
-                            },
-                        ],
-                    },
-                ],
-                max_tokens=4000,
-                temperature=0.1,  # Low temperature for consistent extraction
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:image/png;base64,{image_base64}",
+                                        "detail": "high",
+                                    },
+                                },
+                            ],
+                        },
+                    ],
+                    max_tokens=4000,
+                    temperature=0.1,  # Low temperature for consistent extraction
+                ),
+                estimated_tokens=settings.vision_estimated_tokens_per_page,
+                tokens_used=self._tokens_used,
             )
 
-            # Get token usage from the completion object
-            tokens_used = 0
-            if hasattr(completion, "_raw_response") and completion._raw_response:
-                usage = getattr(completion._raw_response, "usage", None)
-                if usage:
-                    tokens_used = usage.total_tokens
-
             # Return both the parsed page data and token usage
-            return completion, tokens_used
+            return completion, self._tokens_used(completion)
 
         except Exception as e:
             # Log the error for debugging
             logger.error(
                 f"OpenAI Vision extraction error for page {page_number + 1}: {str(e)}"
             )
+            raise
+
+    @staticmethod
+    def _tokens_used(completion: MarkdownPage) -> int:
+        """Token usage of an Instructor completion, or 0 when it isn't reported."""
+        raw_response = getattr(completion, "_raw_response", None)
+        usage = getattr(raw_response, "usage", None) if raw_response else None
+        return usage.total_tokens if usage else 0
+
+    def _failed_page(self, page_number: int) -> MarkdownPage:
+        """Placeholder page for a page the vision model could not extract."""
+        return MarkdownPage(
+            metadata=PageMetadata(language="en", page_number=page_number),
+            content=f"OpenAI Vision extraction failed for page {page_number + 1}. This could be due to complex layout, poor image quality, or API issues.",
+            markdown_content="",
+            tables=[],
+            figures=[],
+        )
 
-            # Return minimal page with error message and zero tokens
-            return (
-                MarkdownPage(
-                    metadata=PageMetadata(language="en", page_number=page_number),
-                    content=f"OpenAI Vision extraction failed for page {page_number + 1}. This could be due to complex layout, poor image quality, or API issues.",
-                    markdown_content="",
-                    tables=[],
-                    figures=[],
-                ),
-                0,
+    async def _extract_vision_page(
+        self,
+        image_bytes: bytes,
+        page_number: int,
+        extract_tables: bool = True,
+        extract_figures: bool = True,
+    ) -> ExtractedPage:
+        """Extract a rendered page, consulting the extraction cache first.
+
+        Never raises - a failed page is returned with ``page=None`` and the error.
+        """
+        cache_key = None
+        if self.page_cache is not None:
+            cache_key = PageExtractionCache.make_key(
+                image_bytes=image_bytes,
+                model=self.model,
+                prompt_version=self.PROMPT_VERSION,
+                extract_tables=extract_tables,
+                extract_figures=extract_figures,
             )
+            cached = await asyncio.to_thread(self.page_cache.get, cache_key)
+            if cached is not None:
+                page_data, _ = cached
+                page_data.metadata.page_number = page_number
+                return ExtractedPage(page_number, page_data, source="cache")
+
+        try:
+            page_data, tokens_used = await self._extract_page_content(
+                image_base64=self._encode_image_to_base64(image_bytes),
+                page_number=page_number,
+                extract_tables=extract_tables,
+                extract_figures=extract_figures,
+            )
+        except Exception as e:
+            return ExtractedPage(page_number, None, source="vision", error=str(e))
+
+        if cache_key is not None:
+            try:
+                await asyncio.to_thread(
+                    self.page_cache.put, cache_key, page_data, tokens_used
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache page {page_number + 1}: {e}")
+
+        return ExtractedPage(page_number, page_data, tokens_used, source="vision")
+
+    async def _extract_and_report(
+        self,
+        image_bytes: bytes,
+        page_number: int,
+        request: OpenAIExtractionRequest,
+        on_page: Optional[PageCallback],
+    ) -> ExtractedPage:
+        extracted = await self._extract_vision_page(
+            image_bytes=image_bytes,
+            page_number=page_number,
+            extract_tables=request.extract_tables,
+            extract_figures=request.extract_figures,
+        )
+        return await self._report_page(extracted, on_page)
+
+    @staticmethod
+    async def _report_page(
+        extracted: ExtractedPage, on_page: Optional[PageCallback]
+    ) -> ExtractedPage:
+        if on_page is not None:
+            try:
+                await on_page(extracted)
+            except Exception as e:
+                logger.warning(
+                    f"Page callback failed for page {extracted.page_number + 1}: {e}"
+                )
+        return extracted
 
     async def extract_document_content(
-        self, request: OpenAIExtractionRequest
+        self,
+        request: OpenAIExtractionRequest,
+        skip_pages: Optional[AbstractSet[int]] = None,
+        on_page: Optional[PageCallback] = None,
+        on_rendered: Optional[Callable[[int], None]] = None,
     ) -> OpenAIExtractionResponse:
-        """Extract content from entire PDF document."""
+        """Extract content from entire PDF document.
+
+        Pages in ``skip_pages`` are not rendered or extracted. ``on_page`` is
+        awaited with each page as soon as it finishes (including failures), so
+        callers can checkpoint progress, and ``on_rendered`` is called with each
+        page number once the page is rendered. Failed pages are reported in
+        ``failed_pages`` and left out of the returned document.
+        """
         start_time = time.time()
 
         try:
-            # Convert PDF to images
-            images = self._pdf_to_images(request.file_path)
-
-            # Process each page concurrently (with rate limiting)
-            pages = []
-            total_tokens = 0
-
-            # Process pages in batches to avoid rate limits
-            batch_size = 3  # Adjust based on rate limits
-            for i in range(0, len(images), batch_size):
-                batch = images[i : i + batch_size]
-                tasks = []
-
-                for j, image_bytes in enumerate(batch):
-                    page_number = i + j
-                    image_base64 = self._encode_image_to_base64(image_bytes)
-
-                    task = self._extract_page_content(
-                        image_base64=image_base64,
-                        page_number=page_number,
-                        extract_tables=request.extract_tables,
-                        extract_figures=request.extract_figures,
-                    )
-                    tasks.append(task)
-
-                # Process batch
-                batch_results = await asyncio.gather(*tasks)
-
-                # Unpack pages and tokens from each result
-                for page_data, page_tokens in batch_results:
-                    pages.append(page_data)
-                    total_tokens += page_tokens
-
-                # Rate limiting - wait between batches
-                if i + batch_size < len(images):
-                    await asyncio.sleep(1)  # 1 second between batches
+            # Render pages lazily on the render pool - only a bounded number of
+            # pages is rasterized ahead of the in-flight requests, and each
+            # image is dropped once its request has completed
+            page_images = iter_rendered_pages(
+                request.file_path,
+                native_options=self._native_text_options(request),
+                skip_pages=skip_pages,
+            )
 
-            # Create MarkdownDocument
+            native_pages: List[ExtractedPage] = []
+            vision_tasks: List[asyncio.Task] = []
+
+            # Sliding window: a new page is started as soon as any in-flight
+            # page finishes. The shared rate limiter decides when each request
+            # is actually sent; this window only bounds how many rendered pages
+            # this document holds in memory.
+            window = asyncio.Semaphore(max(1, settings.vision_max_concurrency))
+            try:
+                async for rendered in page_images:
+                    if on_rendered is not None:
+                        on_rendered(rendered.page_number)
+
+                    if rendered.native_page is not None:
+                        native_pages.append(
+                            await self._report_page(
+                                ExtractedPage(
+                                    rendered.page_number, rendered.native_page
+                                ),
+                                on_page,
+                            )
+                        )
+                        continue
+
+                    await window.acquire()
+                    task = asyncio.create_task(
+                        self._extract_and_report(
+                            rendered.image_bytes,
+                            rendered.page_number,
+                            request,
+                            on_page,
+                        )
+                    )
+                    task.add_done_callback(lambda _: window.release())
+                    vision_tasks.append(task)
+                    del rendered
+
+                vision_pages = await asyncio.gather(*vision_tasks)
+            finally:
+                for task in vision_tasks:
+                    task.cancel()
+                await page_images.aclose()
+
+            extracted_pages = sorted(
+                native_pages + vision_pages, key=lambda extracted: extracted.page_number
+            )
+            failed_pages = [
+                extracted.page_number
+                for extracted in extracted_pages
+                if extracted.page is None
+            ]
+
+            # Create MarkdownDocument in page order, without failed pages
+            pages = [
+                extracted.page
+                for extracted in extracted_pages
+                if extracted.page is not None
+            ]
             markdown_document = MarkdownDocument(pages=pages)
 
+            total_tokens = sum(extracted.tokens_used for extracted in vision_pages)
+            cache_hits = sum(
+                1 for extracted in vision_pages if extracted.source == "cache"
+            )
+            cache_misses = len(vision_pages) - cache_hits
+            logger.info(
+                f"Extracted {len(native_pages)} pages from the text layer and "
+                f"{len(vision_pages)} pages with {self.model} "
+                f"(cache hit rate {cache_hits}/{len(vision_pages)}, "
+                f"{len(failed_pages)} failed)"
+            )
+
             processing_time = time.time() - start_time
 
             return OpenAIExtractionResponse(
@@ -217,6 +387,11 @@ Be thorough and complete - extract ALL visible content and data.""",
                 processing_time=processing_time,
                 total_pages=len(pages),
                 total_tokens_used=total_tokens,  # Now tracking actual token usage
+                native_pages=len(native_pages),
+                vision_pages=len(vision_pages),
+                cache_hits=cache_hits,
+                cache_misses=cache_misses,
+                failed_pages=failed_pages,
                 extraction_timestamp=datetime.now(),
             )
 
@@ -231,15 +406,10 @@ Be thorough and complete - extract ALL visible content and data.""",
         extract_figures: bool = True,
     ) -> MarkdownPage:
         """Extract content from a single page (for testing)."""
-        images = self._pdf_to_images(pdf_path)
+        image_bytes = await render_page(pdf_path, page_number)
 
-        if page_number >= len(images):
-            raise ValueError(f"Page {page_number} not found in document")
-
-        image_base64 = self._encode_image_to_base64(images[page_number])
-
-        page_data, tokens_used = await self._extract_page_content(
-            image_base64=image_base64,
+        extracted = await self._extract_vision_page(
+            image_bytes=image_bytes,
             page_number=page_number,
             extract_tables=extract_tables,
             extract_figures=extract_figures,
@@ -247,8 +417,13 @@ Be thorough and complete - extract ALL visible content and data.""",
 
         # For single page extraction, just return the page data
         # (token usage could be logged or returned separately if needed)
-        logger.info(f"Single page extraction used {tokens_used} tokens")
-        return page_data
+        logger.info(
+            f"Single page extraction used {extracted.tokens_used} tokens "
+            f"(source: {extracted.source})"
+        )
+        if extracted.page is None:
+            return self._failed_page(page_number)
+        return extracted.page
 
 
 class OpenAISummaryClient:
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AbstractSet, Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+import fitz  # PyMuPDF for PDF to image conversion
+from config import settings
+from constants import RenderExecutor
+from dto.openai_models import MarkdownPage
+from utils.pdf_text_layer import extract_native_page
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+class RenderedPage(NamedTuple):
+    """A page prepared for extraction.
+
+    Exactly one of ``image_bytes`` (page needs the vision model) or
+    ``native_page`` (page was extracted from the PDF text layer) is set.
+    """
+
+    page_number: int
+    image_bytes: Optional[bytes] = None
+    native_page: Optional[MarkdownPage] = None
+
+
+def count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF."""
+    with fitz.open(pdf_path) as pdf_document:
+        return pdf_document.page_count
+
+
+def render_page_range(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    dpi: int,
+    native_options: Optional[Dict[str, Any]] = None,
+    skip_pages: Optional[AbstractSet[int]] = None,
+) -> List[RenderedPage]:
+    """Prepare pages [start, stop) of a PDF for extraction.
+
+    When ``native_options`` is given, pages with a usable text layer are
+    extracted locally and never rasterized; all other pages are rendered to PNG.
+    Pages in ``skip_pages`` (already extracted) are left out entirely.
+    Runs inside a pool worker, so it opens its own document handle and must
+    stay a module-level function to be picklable for the process pool.
+    """
+    rendered = []
+    mat = fitz.Matrix(dpi / 72, dpi / 72)  # Scale factor for DPI
+
+    with fitz.open(pdf_path) as pdf_document:
+        for page_number in range(start, min(stop, pdf_document.page_count)):
+            if skip_pages and page_number in skip_pages:
+                continue
+
+            page = pdf_document[page_number]
+
+            if native_options is not None:
+                try:
+                    native_page = extract_native_page(page, native_options)
+                except Exception as e:
+                    logger.warning(
+                        f"Native text extraction failed for page {page_number + 1}: {e}"
+                    )
+                    native_page = None
+
+                if native_page is not None:
+                    rendered.append(
+                        RenderedPage(page_number=page_number, native_page=native_page)
+                    )
+                    continue
+
+            pix = page.get_pixmap(matrix=mat)
+            rendered.append(
+                RenderedPage(page_number=page_number, image_bytes=pix.tobytes("png"))
+            )
+
+    return rendered
+
+
+def get_render_executor() -> Executor:
+    """Get the shared executor used for PDF rendering."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, settings.pdf_render_workers)
+            executor_type = settings.pdf_render_executor
+            if executor_type == RenderExecutor.THREAD:
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="pdf-render"
+                )
+            else:
+                _executor = ProcessPoolExecutor(max_workers=workers)
+            logger.info(
+                f"Started PDF render pool ({executor_type.value}, {workers} workers)"
+            )
+
+        return _executor
+
+
+def shutdown_render_executor() -> None:
+    """Shut down the shared render executor, if it was started."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def render_page(
+    pdf_path: str, page_number: int, dpi: Optional[int] = None
+) -> bytes:
+    """Render a single page off the event loop."""
+    loop = asyncio.get_running_loop()
+    rendered = await loop.run_in_executor(
+        get_render_executor(),
+        render_page_range,
+        pdf_path,
+        page_number,
+        page_number + 1,
+        dpi or settings.pdf_render_dpi,
+    )
+
+    if not rendered:
+        raise ValueError(f"Page {page_number} not found in document")
+
+    return rendered[0].image_bytes
+
+
+async def iter_rendered_pages(
+    pdf_path: str,
+    dpi: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    max_pending_shards: Optional[int] = None,
+    native_options: Optional[Dict[str, Any]] = None,
+    skip_pages: Optional[AbstractSet[int]] = None,
+) -> AsyncIterator[RenderedPage]:
+    """Render a PDF in page-range shards on the render pool, yielding pages in order.
+
+    At most ``max_pending_shards`` shards are rendered ahead of the consumer, so
+    memory stays bounded by ``max_pending_shards * shard_size`` pages while all
+    pool workers are kept busy. See ``render_page_range`` for how
+    ``native_options`` enables the text-layer fast path and ``skip_pages``
+    resumes a partially extracted document.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_render_executor()
+    dpi = dpi or settings.pdf_render_dpi
+    shard_size = max(1, shard_size or settings.pdf_render_shard_size)
+    max_pending_shards = max(1, max_pending_shards or settings.pdf_render_workers)
+
+    page_count = await loop.run_in_executor(executor, count_pages, pdf_path)
+    skip_pages = frozenset(skip_pages or ())
+    shards = (
+        start
+        for start in range(0, page_count, shard_size)
+        if not all(
+            page_number in skip_pages
+            for page_number in range(start, min(start + shard_size, page_count))
+        )
+    )
+    pending = deque()
+
+    def submit_next_shard() -> None:
+        start = next(shards, None)
+        if start is not None:
+            pending.append(
+                loop.run_in_executor(
+                    executor,
+                    render_page_range,
+                    pdf_path,
+                    start,
+                    start + shard_size,
+                    dpi,
+                    native_options,
+                    skip_pages,
+                )
+            )
+
+    try:
+        for _ in range(max_pending_shards):
+            submit_next_shard()
+
+        while pending:
+            rendered = await pending.popleft()
+            submit_next_shard()
+
+            for page in rendered:
+                yield page
+
+    finally:
+        # Consumer stopped early or failed - don't leave shards rendering
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,157 @@
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF for native text layer extraction
+from dto.openai_models import (
+    MarkdownPage,
+    MarkdownTable,
+    PageMetadata,
+    TableHeader,
+    TableMetadata,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _image_area_ratios(page: fitz.Page) -> List[float]:
+    """Return the fraction of the page covered by each embedded image."""
+    page_area = abs(page.rect) or 1.0
+    ratios = []
+    for image in page.get_image_info():
+        visible = fitz.Rect(image["bbox"]) & page.rect
+        ratios.append(abs(visible) / page_area)
+    return ratios
+
+
+def _text_is_garbled(text: str, max_bad_ratio: float = 0.05) -> bool:
+    """Detect broken text layers (missing ToUnicode maps, OCR junk)."""
+    if not text:
+        return True
+    bad = sum(
+        1 for ch in text if ch == "�" or (not ch.isprintable() and ch not in "\n\t")
+    )
+    return bad / len(text) > max_bad_ratio
+
+
+def _build_table(table: Any) -> Optional[MarkdownTable]:
+    """Convert a PyMuPDF table into a MarkdownTable, or None if it looks unreliable."""
+    rows = table.extract()
+    if not rows or table.col_count < 2:
+        return None
+
+    # Merged or missing cells mean the ruling-based detection guessed the grid
+    # wrong - leave those tables to the vision model
+    if any(cell is None for row in rows for cell in row):
+        return None
+
+    header_names = [
+        (name or f"column_{idx + 1}").strip()
+        for idx, name in enumerate(table.header.names)
+    ]
+    headers = [
+        TableHeader(id=str(idx), column=idx, name=name, dtype="string")
+        for idx, name in enumerate(header_names)
+    ]
+
+    body_rows = rows[1:] if not table.header.external else rows
+    data = [
+        {header_names[idx]: (cell or "").strip() for idx, cell in enumerate(row)}
+        for row in body_rows
+    ]
+
+    return MarkdownTable(
+        metadata=TableMetadata(title=None, caption=None, notes=None),
+        content=table.to_markdown(clean=False),
+        headers=headers,
+        data=data,
+    )
+
+
+def _blocks_to_markdown(page: fitz.Page, exclude: List[fitz.Rect]) -> str:
+    """Render the page text layer as markdown, promoting large lines to headings."""
+    text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+    blocks = [block for block in text_dict["blocks"] if block.get("type") == 0]
+
+    # The most common font size (by characters) is treated as body text
+    size_counts: Counter = Counter()
+    for block in blocks:
+        for line in block["lines"]:
+            for span in line["spans"]:
+                size_counts[round(span["size"], 1)] += len(span["text"].strip())
+    body_size = size_counts.most_common(1)[0][0] if size_counts else 0
+
+    paragraphs = []
+    for block in blocks:
+        if any(fitz.Rect(block["bbox"]).intersects(rect) for rect in exclude):
+            continue
+
+        lines = []
+        for line in block["lines"]:
+            line_text = "".join(span["text"] for span in line["spans"]).strip()
+            if line_text:
+                lines.append(line_text)
+        if not lines:
+            continue
+
+        text = " ".join(lines)
+        max_size = max(
+            span["size"] for line in block["lines"] for span in line["spans"]
+        )
+        is_short = len(text) < 120
+
+        if body_size and is_short and max_size >= body_size * 1.4:
+            paragraphs.append(f"## {text}")
+        elif body_size and is_short and max_size >= body_size * 1.15:
+            paragraphs.append(f"### {text}")
+        else:
+            paragraphs.append(text)
+
+    return "\n\n".join(paragraphs)
+
+
+def extract_native_page(
+    page: fitz.Page,
+    options: Dict[str, Any],
+) -> Optional[MarkdownPage]:
+    """Build a MarkdownPage from the PDF text layer, or None if vision is needed.
+
+    A page is only handled locally when it has a healthy text layer, is not
+    dominated by images, contains no figures worth describing (when figures are
+    requested) and every detected table could be extracted cleanly.
+    """
+    text = page.get_text("text").strip()
+    if len(text) < options["min_chars"] or _text_is_garbled(text):
+        return None
+
+    image_ratios = _image_area_ratios(page)
+    if sum(image_ratios) > options["max_image_coverage"]:
+        return None
+
+    if options["extract_figures"]:
+        if any(ratio >= options["min_figure_area"] for ratio in image_ratios):
+            return None
+        if len(page.get_drawings()) > options["max_drawings"]:
+            return None
+
+    tables: List[MarkdownTable] = []
+    table_rects: List[fitz.Rect] = []
+    if options["extract_tables"]:
+        for table in page.find_tables().tables:
+            markdown_table = _build_table(table)
+            if markdown_table is None:
+                return None
+            tables.append(markdown_table)
+            table_rects.append(fitz.Rect(table.bbox))
+
+    markdown_content = _blocks_to_markdown(page, exclude=table_rects)
+    if not markdown_content.strip() and not tables:
+        return None
+
+    return MarkdownPage(
+        metadata=PageMetadata(language=options["language"], page_number=page.number),
+        content=text,
+        markdown_content=markdown_content,
+        tables=tables,
+        figures=[],
+    )
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import settings
+from db import get_engine
+from dto.documents_dto import PROGRESS_COUNTERS, DocumentsDto
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentProgress:
+    """Live progress counters for one document being processed."""
+
+    def __init__(self, document_id: str, **counters: int):
+        self.document_id = document_id
+        self.counters = {counter: 0 for counter in PROGRESS_COUNTERS}
+        self.counters.update(counters)
+        self.updated_at = datetime.now()
+        self.finished = False
+        self.dirty = True
+        self._changed = asyncio.Event()
+
+    def add(self, **increments: int) -> None:
+        """Increment counters and wake up subscribers."""
+        for counter, amount in increments.items():
+            self.counters[counter] += amount
+        self._notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.counters, "progress_updated_at": self.updated_at}
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """Wait until the counters change. Returns False on timeout."""
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _notify(self) -> None:
+        self.updated_at = datetime.now()
+        self.dirty = True
+        # Swap the event so every waiter wakes up exactly once per change
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+
+class ProgressTracker:
+    """Keeps per-document progress in memory and flushes it to the database.
+
+    Counters change on every page and chunk, so they are written at most once
+    per ``flush_interval`` per document rather than committed per update.
+    Clients in the same process (the SSE endpoint with the embedded worker)
+    read them live; other processes read the last flushed values.
+    """
+
+    def __init__(self, db_engine, flush_interval: Optional[float] = None):
+        self.documents_dto = DocumentsDto(db_engine)
+        self.flush_interval = flush_interval or settings.progress_flush_seconds
+        self._active: Dict[str, DocumentProgress] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def start(self, document_id: str, **counters: int) -> DocumentProgress:
+        """Begin tracking a document; must be called from the event loop."""
+        progress = DocumentProgress(document_id, **counters)
+        self._active[document_id] = progress
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+        return progress
+
+    def get(self, document_id: str) -> Optional[DocumentProgress]:
+        return self._active.get(document_id)
+
+    async def finish(self, document_id: str) -> None:
+        """Write the final counters and stop tracking the document."""
+        progress = self._active.pop(document_id, None)
+        if progress is None:
+            return
+
+        await self._flush(progress)
+        progress.finished = True
+        progress._notify()
+
+    async def _flush(self, progress: DocumentProgress) -> None:
+        progress.dirty = False
+        try:
+            await asyncio.to_thread(
+                self.documents_dto.update_processing_progress,
+                progress.document_id,
+                **progress.snapshot(),
+            )
+        except Exception as e:
+            progress.dirty = True
+            logger.warning(
+                f"Failed to save progress for document {progress.document_id}: {e}"
+            )
+
+    async def _flush_loop(self) -> None:
+        while self._active:
+            await asyncio.sleep(self.flush_interval)
+            for progress in list(self._active.values()):
+                if progress.dirty:
+                    await self._flush(progress)
+
+
+_tracker: Optional[ProgressTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_progress_tracker() -> ProgressTracker:
+    """Return the process-wide progress tracker."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = ProgressTracker(get_engine())
+        return _tracker
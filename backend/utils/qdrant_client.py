@@ -1,11 +1,21 @@
+import asyncio
+import hashlib
 import logging
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
+import httpx
 import numpy as np
 from config import settings
-from qdrant_client import QdrantClient, models
+from constants import QdrantDefaults, QuantizationMode
+from db import get_engine
+from db.models import ChunkContent
+from dto.chunks_dto import ChunksDto
+from dto.collections_dto import VectorCollectionsDto
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from qdrant_client.models import (
     Distance,
     Document,
@@ -24,24 +34,53 @@ from qdrant_client.models import (
     VectorParams,
     VectorParamsDiff,
 )
-from utils.smart_chunker import MarkdownDocumentChunker
+from utils.embeddings import (
+    DENSE_MODEL,
+    SPARSE_MODEL,
+    EmbeddingModels,
+    get_embedding_models,
+)
+from utils.smart_chunker import (
+    CHUNK_ID_NAMESPACE,
+    MarkdownDocumentChunker,
+    stable_chunk_id,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class ActiveCollection(NamedTuple):
+    """The collection behind the alias and the models its vectors come from."""
+
+    name: str
+    embeddings: EmbeddingModels
+
+
+def versioned_collection_name(alias: str, dense_model: str, sparse_model: str) -> str:
+    """Collection name for a model pair, so a migration can be resumed."""
+    models_hash = hashlib.sha1(f"{dense_model}|{sparse_model}".encode()).hexdigest()
+    return f"{alias}_{models_hash[:8]}"
+
+
 class QdrantOfficialHybridStore:
 
-    # Official models from Qdrant documentation
-    DENSE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
-    SPARSE_MODEL = "prithivida/Splade_PP_en_v1"
+    # Kept in the Qdrant payload (filters and source attribution); chunk text
+    # and the remaining metadata live in the ChunkContent table
+    PAYLOAD_FIELDS = (
+        "chunk_id",
+        "document_id",
+        "filename",
+        "content_type",
+        "page_number",
+        "chunk_index",
+        "language",
+    )
 
-    def __init__(self):
-        if settings.qdrant_url and settings.qdrant_api_key:
-            self.client = QdrantClient(
-                url=settings.qdrant_url, api_key=settings.qdrant_api_key
-            )
-        else:
-            self.client = QdrantClient(host="localhost", port=6333)
+    def __init__(self, embeddings: Optional[EmbeddingModels] = None):
+        self.client = QdrantClient(**self._connection_args())
+        self.chunks_dto = ChunksDto(get_engine())
+        # Query path for async handlers; created on first use inside the loop
+        self._async_client: Optional[AsyncQdrantClient] = None
 
         self.dense_vector_name = "dense"
         self.sparse_vector_name = "sparse"
@@ -54,60 +93,604 @@ class QdrantOfficialHybridStore:
             table_max_size=3000,
         )
 
-        self.collection_name = "hybrid_documents_official"
+        # Searches and writes go to the collection behind this alias, embedded
+        # with the models that collection was built with
+        self.alias_name = settings.qdrant_collection
+        self.collections_dto = VectorCollectionsDto(get_engine())
+        self._embeddings_override = embeddings
+        self._active: Optional[ActiveCollection] = None
+        self._active_checked_at = 0.0
+        self._active_lock = threading.Lock()
 
         self._ensure_collection_exists()
 
-    def _ensure_collection_exists(self):
-        """Create hybrid collection using official Qdrant approach."""
-        try:
-            if not self.client.collection_exists(self.collection_name):
-                self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config={
-                        self.dense_vector_name: models.VectorParams(
-                            size=self.client.get_embedding_size(self.DENSE_MODEL),
-                            distance=models.Distance.COSINE,
-                        )
-                    },
-                    sparse_vectors_config={
-                        self.sparse_vector_name: models.SparseVectorParams()
-                    },
+    @property
+    def collection_name(self) -> str:
+        return self.active_collection().name
+
+    @property
+    def embeddings(self) -> EmbeddingModels:
+        return self.active_collection().embeddings
+
+    def active_collection(self) -> ActiveCollection:
+        """Resolve the alias, re-checking at most every QDRANT_ALIAS_REFRESH_SECONDS.
+
+        An embedding migration swaps the alias to a collection built with other
+        models; every process follows within the refresh interval.
+        """
+        with self._active_lock:
+            now = time.monotonic()
+            if (
+                self._active is None
+                or now - self._active_checked_at
+                >= settings.qdrant_alias_refresh_seconds
+            ):
+                name = self._alias_target() or self.alias_name
+                if self._active is None or self._active.name != name:
+                    self._active = ActiveCollection(name, self._models_for(name))
+                    logger.info(
+                        f"Using collection {name} behind {self.alias_name} "
+                        f"({self._active.embeddings.dense_model_name}, "
+                        f"{self._active.embeddings.sparse_model_name})"
+                    )
+                self._active_checked_at = now
+            return self._active
+
+    def _alias_target(self) -> Optional[str]:
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == self.alias_name:
+                return alias.collection_name
+        return None
+
+    def _models_for(self, collection_name: str) -> EmbeddingModels:
+        if self._embeddings_override is not None:
+            return self._embeddings_override
+
+        record = self.collections_dto.get_collection(collection_name)
+        if record is None:
+            # Built before collections were tracked, with the original models
+            return get_embedding_models(DENSE_MODEL, SPARSE_MODEL)
+        return get_embedding_models(record.dense_model, record.sparse_model)
+
+    def point_alias(self, collection_name: str) -> None:
+        """Atomically point the alias at a collection."""
+        operations: List[Any] = []
+        if self._alias_target() is not None:
+            operations.append(
+                models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=self.alias_name)
                 )
-                logger.info(
-                    f"Created official hybrid collection: {self.collection_name}"
+            )
+        operations.append(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=collection_name, alias_name=self.alias_name
                 )
+            )
+        )
+        # Both operations are applied in one request, searches never miss
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        self.collections_dto.mark_active(collection_name)
 
-            self._ensure_indexes_exist()
+        with self._active_lock:
+            self._active = None
+        logger.info(f"Alias {self.alias_name} now points to {collection_name}")
+
+    @staticmethod
+    def _connection_args() -> Dict[str, Any]:
+        if settings.qdrant_url and settings.qdrant_api_key:
+            connection = {
+                "url": settings.qdrant_url,
+                "api_key": settings.qdrant_api_key,
+            }
+        else:
+            connection = {"host": "localhost", "port": 6333}
+
+        return {
+            **connection,
+            "prefer_grpc": settings.qdrant_prefer_grpc,
+            "grpc_port": settings.qdrant_grpc_port,
+        }
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClient(
+                **self._connection_args(),
+                # Keep connections alive between searches (the client disables
+                # keep-alive for localhost by default)
+                limits=httpx.Limits(
+                    max_connections=settings.qdrant_max_connections,
+                    max_keepalive_connections=settings.qdrant_max_connections,
+                ),
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the async client's connection pool."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def _ensure_collection_exists(self):
+        """Create the aliased hybrid collection using official Qdrant approach."""
+        try:
+            if self._alias_target() is None and not self.client.collection_exists(
+                self.alias_name
+            ):
+                if self.client.collection_exists(QdrantDefaults.COLLECTION_NAME):
+                    # Collection from before aliases; keep serving it
+                    target = QdrantDefaults.COLLECTION_NAME
+                else:
+                    target = self.create_collection(
+                        settings.embedding_dense_model, settings.embedding_sparse_model
+                    )
+                self.point_alias(target)
+
+            # Layout changes rebuild indexes, so they are only applied on request
+            changes = self.migrate_collection_config(dry_run=True)
+            if changes:
+                logger.warning(
+                    f"Collection {self.collection_name} layout differs from the "
+                    f"QDRANT_* settings ({', '.join(changes)}); run "
+                    "configure_collection.py to apply them"
+                )
+            self._ensure_indexes_exist(self.collection_name)
 
         except Exception as e:
             logger.error(f"Error creating official hybrid collection: {e}")
             raise
 
-    def _ensure_indexes_exist(self):
+    def create_collection(self, dense_model: str, sparse_model: str) -> str:
+        """Create an empty versioned collection for a model pair, if missing."""
+        collection_name = versioned_collection_name(
+            self.alias_name, dense_model, sparse_model
+        )
+        if self.client.collection_exists(collection_name):
+            return collection_name
+
+        self.client.create_collection(
+            collection_name=collection_name,
+            **self.collection_layout(self.client.get_embedding_size(dense_model)),
+        )
+        self.collections_dto.register_collection(
+            collection_name, dense_model, sparse_model
+        )
+        self._ensure_indexes_exist(collection_name)
+        logger.info(
+            f"Created official hybrid collection: {collection_name} "
+            f"({dense_model}, {sparse_model})"
+        )
+        return collection_name
+
+    def collection_layout(self, dense_size: int) -> Dict[str, Any]:
+        """create_collection args for the layout configured in settings."""
+        return {
+            "vectors_config": {
+                self.dense_vector_name: models.VectorParams(
+                    size=dense_size,
+                    distance=models.Distance.COSINE,
+                    on_disk=settings.qdrant_vectors_on_disk,
+                )
+            },
+            "sparse_vectors_config": {
+                self.sparse_vector_name: self._sparse_vector_params()
+            },
+            "hnsw_config": self._hnsw_config(),
+            "quantization_config": self._quantization_config(),
+            "on_disk_payload": settings.qdrant_payload_on_disk,
+        }
+
+    @staticmethod
+    def _hnsw_config() -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=settings.qdrant_hnsw_m,
+            ef_construct=settings.qdrant_hnsw_ef_construct,
+            on_disk=settings.qdrant_hnsw_on_disk,
+        )
+
+    @staticmethod
+    def _sparse_vector_params() -> models.SparseVectorParams:
+        return models.SparseVectorParams(
+            index=models.SparseIndexParams(on_disk=settings.qdrant_sparse_on_disk)
+        )
+
+    @staticmethod
+    def _quantization_config() -> Optional[models.QuantizationConfig]:
+        if settings.qdrant_quantization == QuantizationMode.SCALAR:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=settings.qdrant_quantization_always_ram,
+                )
+            )
+        if settings.qdrant_quantization == QuantizationMode.BINARY:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=settings.qdrant_quantization_always_ram
+                )
+            )
+        return None
+
+    @staticmethod
+    def _dense_search_params() -> Optional[models.SearchParams]:
+        if settings.qdrant_quantization == QuantizationMode.NONE:
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=settings.qdrant_quantization_rescore,
+                oversampling=settings.qdrant_quantization_oversampling,
+            )
+        )
+
+    def _collection_config_changes(self, info: models.CollectionInfo) -> Dict[str, Any]:
+        """Diff the collection's layout against settings as update_collection args."""
+        changes: Dict[str, Any] = {}
+        params = info.config.params
+
+        dense_params = params.vectors[self.dense_vector_name]
+        if bool(dense_params.on_disk) != settings.qdrant_vectors_on_disk:
+            changes["vectors_config"] = {
+                self.dense_vector_name: models.VectorParamsDiff(
+                    on_disk=settings.qdrant_vectors_on_disk
+                )
+            }
+
+        sparse_params = (params.sparse_vectors or {}).get(self.sparse_vector_name)
+        sparse_on_disk = bool(
+            sparse_params and sparse_params.index and sparse_params.index.on_disk
+        )
+        if sparse_on_disk != settings.qdrant_sparse_on_disk:
+            changes["sparse_vectors_config"] = {
+                self.sparse_vector_name: self._sparse_vector_params()
+            }
+
+        if bool(params.on_disk_payload) != settings.qdrant_payload_on_disk:
+            changes["collection_params"] = models.CollectionParamsDiff(
+                on_disk_payload=settings.qdrant_payload_on_disk
+            )
+
+        hnsw = info.config.hnsw_config
+        if (hnsw.m, hnsw.ef_construct, bool(hnsw.on_disk)) != (
+            settings.qdrant_hnsw_m,
+            settings.qdrant_hnsw_ef_construct,
+            settings.qdrant_hnsw_on_disk,
+        ):
+            changes["hnsw_config"] = self._hnsw_config()
+
+        quantization = self._quantization_config()
+        if not self._same_quantization(info.config.quantization_config, quantization):
+            changes["quantization_config"] = quantization or models.Disabled.DISABLED
+
+        return changes
+
+    @staticmethod
+    def _same_quantization(
+        current: Optional[models.QuantizationConfig],
+        desired: Optional[models.QuantizationConfig],
+    ) -> bool:
+        if current is None or desired is None:
+            return current is desired
+        # Newer servers report extra defaulted fields, compare only what we set
+        wanted = desired.model_dump(exclude_none=True)
+        reported = current.model_dump(exclude_none=True)
+        return all(
+            reported.get(kind, {}).get(field) == value
+            for kind, fields in wanted.items()
+            for field, value in fields.items()
+        )
+
+    def migrate_collection_config(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Bring the served collection's layout in line with settings, in place.
+
+        Qdrant rebuilds the affected indexes and quantized vectors in the
+        background; the collection stays searchable meanwhile. Returns the
+        applied changes, or with ``dry_run`` the changes that would be applied.
+        """
+        collection_name = self.collection_name
+        info = self.client.get_collection(collection_name)
+        changes = self._collection_config_changes(info)
+        if not changes or dry_run:
+            return changes
+
+        logger.info(
+            f"Updating collection {collection_name} config: {', '.join(changes)}"
+        )
+        self.client.update_collection(collection_name=collection_name, **changes)
+        return changes
+
+    def _ensure_indexes_exist(self, collection_name: str):
         """Create necessary indexes for efficient filtering."""
         try:
             self.client.create_payload_index(
-                collection_name=self.collection_name,
+                collection_name=collection_name,
                 field_name="document_id",
                 field_schema=models.PayloadSchemaType.KEYWORD,
             )
             logger.info(f"Created index for document_id field")
 
             self.client.create_payload_index(
-                collection_name=self.collection_name,
+                collection_name=collection_name,
                 field_name="content_type",
                 field_schema=models.PayloadSchemaType.KEYWORD,
             )
             logger.info(f"Created index for content_type field")
 
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="language",
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+            logger.info(f"Created index for language field")
+
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="page_number",
+                field_schema=models.PayloadSchemaType.INTEGER,
+            )
+            logger.info(f"Created index for page_number field")
+
         except Exception as e:
             logger.warning(f"Could not create indexes (might already exist): {e}")
 
+    def _chunk_to_payload(
+        self, chunk: Any, document_id: str, filename: str
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Build the text to embed and the Qdrant payload for a chunk."""
+        content = chunk.page_content.strip() if chunk.page_content else ""
+        if not content:
+            return None
+
+        chunk_metadata = chunk.metadata or {}
+        page_number = chunk_metadata.get("page_number", 0)
+        chunk_index = chunk_metadata.get("chunk_index", 0)
+
+        return content, {
+            "chunk_id": chunk_metadata.get("chunk_id")
+            or stable_chunk_id(f"{document_id}_p{page_number}_c{chunk_index}", content),
+            "document_id": chunk_metadata.get("document_id", document_id),
+            "filename": chunk_metadata.get("filename", filename),
+            "content": content,
+            "content_type": chunk_metadata.get("content_type", "text"),
+            "page_number": page_number,
+            "chunk_index": chunk_index,
+            "chunk_size": len(content),
+            "language": chunk_metadata.get("language", "en"),
+            "heading_context": chunk_metadata.get("heading_context"),
+            "indexed_at": datetime.now().isoformat(),
+            **{
+                k: v
+                for k, v in chunk_metadata.items()
+                if k
+                not in [
+                    "chunk_id",
+                    "document_id",
+                    "filename",
+                    "content_type",
+                    "page_number",
+                    "chunk_index",
+                    "language",
+                    "heading_context",
+                ]
+            },
+        }
+
+    def _chunks_to_payloads(
+        self, chunks: List[Any], document_id: str, filename: str
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        texts = []
+        payloads = []
+        for chunk_idx, chunk in enumerate(chunks):
+            try:
+                prepared = self._chunk_to_payload(chunk, document_id, filename)
+            except Exception as chunk_error:
+                logger.error(
+                    f"Error processing chunk {chunk_idx} for document {document_id}: {chunk_error}"
+                )
+                continue
+
+            if prepared is None:
+                logger.debug(
+                    f"Skipping empty chunk {chunk_idx} for document {document_id}"
+                )
+                continue
+
+            texts.append(prepared[0])
+            payloads.append(prepared[1])
+
+        return texts, payloads
+
+    def prepare_page(
+        self,
+        document_id: str,
+        filename: str,
+        page_number: int,
+        page_data: Dict[str, Any],
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Chunk a single extracted page into texts to embed and their payloads."""
+        chunks = self.chunker.chunk_markdown_page(
+            document_id=document_id,
+            filename=filename,
+            page_number=page_number,
+            page_data=page_data,
+        )
+        return self._chunks_to_payloads(chunks, document_id, filename)
+
+    def embed_texts(
+        self, texts: List[str], collection: Optional[ActiveCollection] = None
+    ) -> List[Dict[str, Any]]:
+        """Compute named dense and sparse vectors for each text (CPU bound).
+
+        Pass the ``collection`` the vectors will be written to, so they match
+        its models even if the alias is swapped in between.
+        """
+        if not texts:
+            return []
+
+        embeddings = (collection or self.active_collection()).embeddings
+        dense_vectors, sparse_vectors = embeddings.embed_documents(texts)
+
+        return [
+            {self.dense_vector_name: dense, self.sparse_vector_name: sparse}
+            for dense, sparse in zip(dense_vectors, sparse_vectors)
+        ]
+
+    def warm_up(self) -> None:
+        """Load the embedding models ahead of the first query."""
+        self.embeddings.warm_up()
+
+    def _split_payload(
+        self, point_id: str, payload: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], ChunkContent]:
+        """Split a chunk payload into the Qdrant part and the stored content."""
+        chunk = ChunkContent(
+            point_id=point_id,
+            document_id=payload["document_id"],
+            page_number=payload["page_number"],
+            content=payload["content"],
+        )
+        chunk.chunk_metadata = {
+            k: v
+            for k, v in payload.items()
+            if k not in self.PAYLOAD_FIELDS and k != "content"
+        }
+        return {k: payload[k] for k in self.PAYLOAD_FIELDS if k in payload}, chunk
+
+    def upsert_chunks(
+        self,
+        vectors: List[Dict[str, Any]],
+        payloads: List[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+    ) -> int:
+        """Write embedded chunks to the collection and their content to the DB."""
+        if not vectors:
+            return 0
+
+        points, chunks = [], []
+        for vector, payload in zip(vectors, payloads):
+            # Deterministic ids make a repeated upsert overwrite, not duplicate
+            slim_payload, chunk = self._split_payload(payload["chunk_id"], payload)
+            points.append(
+                models.PointStruct(
+                    id=chunk.point_id, vector=vector, payload=slim_payload
+                )
+            )
+            chunks.append(chunk)
+
+        # Content first, so every searchable point can be hydrated
+        self.chunks_dto.save_chunks(chunks)
+        self.client.upload_points(
+            collection_name=collection_name or self.collection_name,
+            points=points,
+            batch_size=settings.qdrant_upload_batch_size,
+            wait=True,
+        )
+        return len(vectors)
+
+    def get_point_ids(
+        self,
+        document_id: Optional[str],
+        page_number: Optional[int] = None,
+        collection_name: Optional[str] = None,
+    ) -> Set[str]:
+        """Ids of the indexed chunks of a document, one of its pages, or all."""
+        point_filter = self._build_filter(
+            document_id=document_id,
+            page_range=(page_number, page_number) if page_number is not None else None,
+        )
+
+        point_ids: Set[str] = set()
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name or self.collection_name,
+                scroll_filter=point_filter,
+                limit=1024,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            point_ids.update(str(point.id) for point in points)
+            if offset is None:
+                return point_ids
+
+    def diff_chunks(
+        self,
+        document_id: str,
+        payloads: List[Dict[str, Any]],
+        page_number: Optional[int] = None,
+        collection_name: Optional[str] = None,
+    ) -> Tuple[List[int], List[str]]:
+        """Compare freshly chunked payloads with what is indexed.
+
+        Returns the positions of payloads whose chunk isn't indexed yet (only
+        these need embedding) and the ids of indexed chunks that are no longer
+        produced. Without ``page_number`` the whole document is compared.
+        """
+        indexed_ids = self.get_point_ids(document_id, page_number, collection_name)
+        current_ids = {payload["chunk_id"] for payload in payloads}
+
+        changed = [
+            position
+            for position, payload in enumerate(payloads)
+            if payload["chunk_id"] not in indexed_ids
+        ]
+        return changed, sorted(indexed_ids - current_ids)
+
+    def delete_points(
+        self, point_ids: List[str], collection_name: Optional[str] = None
+    ) -> None:
+        """Remove chunks by id."""
+        if not point_ids:
+            return
+
+        self.client.delete(
+            collection_name=collection_name or self.collection_name,
+            points_selector=models.PointIdsList(points=point_ids),
+        )
+        self.chunks_dto.delete_chunks(point_ids)
+
+    def delete_other_pages(self, document_id: str, page_numbers: List[int]) -> None:
+        """Remove chunks of pages a document no longer has."""
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="document_id",
+                        match=models.MatchValue(value=document_id),
+                    )
+                ],
+                must_not=[
+                    models.FieldCondition(
+                        key="page_number",
+                        match=models.MatchAny(any=list(page_numbers)),
+                    )
+                ],
+            ),
+        )
+        self.chunks_dto.delete_other_pages(document_id, page_numbers)
+
+    def count_document_chunks(self, document_id: str) -> int:
+        """Count indexed chunks for a document."""
+        return self.client.count(
+            collection_name=self.collection_name,
+            count_filter=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="document_id",
+                        match=models.MatchValue(value=document_id),
+                    )
+                ]
+            ),
+            exact=True,
+        ).count
+
     def index_document(
         self, document_id: str, filename: str, markdown_doc_data: Dict[str, Any]
     ) -> int:
-        """Index a MarkdownDocument using official Qdrant hybrid approach."""
+        """Index a complete MarkdownDocument in one pass."""
         try:
             if not markdown_doc_data or "pages" not in markdown_doc_data:
                 logger.warning(f"Invalid document data for {document_id}")
@@ -118,6 +701,7 @@ class QdrantOfficialHybridStore:
                 logger.warning(f"No pages found for document {document_id}")
                 return 0
 
+            chunk_start = time.time()
             chunks = self.chunker.chunk_markdown_document(
                 document_id=document_id,
                 filename=filename,
@@ -128,171 +712,243 @@ class QdrantOfficialHybridStore:
                 logger.warning(f"No chunks generated from document {document_id}")
                 return 0
 
-            documents = []
-            payloads = []
-
-            for chunk_idx, chunk in enumerate(chunks):
-                try:
-                    if not hasattr(chunk, "page_content"):
-                        logger.warning(
-                            f"Chunk {chunk_idx} missing page_content attribute for document {document_id}"
-                        )
-                        continue
-
-                    content = chunk.page_content.strip() if chunk.page_content else ""
-                    if not content:
-                        logger.debug(
-                            f"Skipping empty chunk {chunk_idx} for document {document_id}"
-                        )
-                        continue
-
-                    documents.append(
-                        {
-                            self.dense_vector_name: models.Document(
-                                text=content, model=self.DENSE_MODEL
-                            ),
-                            self.sparse_vector_name: models.Document(
-                                text=content, model=self.SPARSE_MODEL
-                            ),
-                        }
-                    )
+            texts, payloads = self._chunks_to_payloads(chunks, document_id, filename)
 
-                    chunk_metadata = chunk.metadata or {}
-
-                    payloads.append(
-                        {
-                            "chunk_id": chunk_metadata.get(
-                                "chunk_id", str(uuid.uuid4())
-                            ),
-                            "document_id": chunk_metadata.get(
-                                "document_id", document_id
-                            ),
-                            "filename": chunk_metadata.get("filename", filename),
-                            "content": content,
-                            "content_type": chunk_metadata.get("content_type", "text"),
-                            "page_number": chunk_metadata.get("page_number", 0),
-                            "chunk_index": chunk_metadata.get("chunk_index", 0),
-                            "chunk_size": len(content),
-                            "language": chunk_metadata.get("language", "en"),
-                            "heading_context": chunk_metadata.get("heading_context"),
-                            "indexed_at": datetime.now().isoformat(),
-                            **{
-                                k: v
-                                for k, v in chunk_metadata.items()
-                                if k
-                                not in [
-                                    "chunk_id",
-                                    "document_id",
-                                    "filename",
-                                    "content_type",
-                                    "page_number",
-                                    "chunk_index",
-                                    "language",
-                                    "heading_context",
-                                ]
-                            },
-                        }
-                    )
-
-                except Exception as chunk_error:
-                    logger.error(
-                        f"Error processing chunk {chunk_idx} for document {document_id}: {chunk_error}"
-                    )
-                    continue
-
-            if not documents:
+            if not texts:
                 logger.warning(
                     f"No valid chunks with content found for document {document_id}"
                 )
                 return 0
 
-            self.client.upload_collection(
-                collection_name=self.collection_name,
-                vectors=documents,
-                payload=payloads,
-                parallel=2,
+            # Only chunks that changed since the last indexing are embedded
+            collection = self.active_collection()
+            changed, stale_ids = self.diff_chunks(
+                document_id, payloads, collection_name=collection.name
             )
 
+            embed_start = time.time()
+            vectors = self.embed_texts(
+                [texts[position] for position in changed], collection
+            )
+            upload_start = time.time()
+            self.upsert_chunks(
+                vectors,
+                [payloads[position] for position in changed],
+                collection.name,
+            )
+            self.delete_points(stale_ids, collection.name)
+            upload_end = time.time()
+
             logger.info(
-                f"Successfully indexed {len(documents)} chunks for document {document_id} (official hybrid)"
+                f"Successfully indexed {len(payloads)} chunks for document {document_id} (official hybrid): "
+                f"{len(changed)} written, {len(stale_ids)} removed, "
+                f"chunking {embed_start - chunk_start:.2f}s, "
+                f"embedding {upload_start - embed_start:.2f}s, "
+                f"upload {upload_end - upload_start:.2f}s"
             )
-            return len(documents)
+            return len(payloads)
 
         except Exception as e:
             logger.error(f"Failed to index document {document_id}: {str(e)}")
             raise Exception(f"Failed to index document: {str(e)}")
 
+    def _build_filter(
+        self,
+        document_id: Optional[Union[str, List[str]]] = None,
+        chunk_types: Optional[List[str]] = None,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> Optional[models.Filter]:
+        """Translate search restrictions into a Qdrant payload filter.
+
+        ``page_range`` is an inclusive (first, last) pair of zero-based page
+        numbers; either end may be None.
+        """
+        conditions = []
+
+        if isinstance(document_id, str):
+            conditions.append(
+                models.FieldCondition(
+                    key="document_id", match=models.MatchValue(value=document_id)
+                )
+            )
+        elif document_id:
+            conditions.append(
+                models.FieldCondition(
+                    key="document_id", match=models.MatchAny(any=list(document_id))
+                )
+            )
+
+        if chunk_types:
+            conditions.append(
+                models.FieldCondition(
+                    key="content_type", match=models.MatchAny(any=list(chunk_types))
+                )
+            )
+
+        if language:
+            conditions.append(
+                models.FieldCondition(
+                    key="language", match=models.MatchValue(value=language)
+                )
+            )
+
+        if page_range and any(bound is not None for bound in page_range):
+            first_page, last_page = page_range
+            conditions.append(
+                models.FieldCondition(
+                    key="page_number",
+                    range=models.Range(gte=first_page, lte=last_page),
+                )
+            )
+
+        return models.Filter(must=conditions) if conditions else None
+
+    def _hybrid_prefetch(
+        self,
+        dense_query: List[float],
+        sparse_query: models.SparseVector,
+        query_filter: Optional[models.Filter],
+        limit: int,
+        score_threshold: Optional[float],
+    ) -> List[models.Prefetch]:
+        return [
+            models.Prefetch(
+                query=dense_query,
+                using=self.dense_vector_name,
+                filter=query_filter,
+                params=self._dense_search_params(),
+                score_threshold=score_threshold,
+                limit=limit * 2,
+            ),
+            models.Prefetch(
+                query=sparse_query,
+                using=self.sparse_vector_name,
+                filter=query_filter,
+                limit=limit * 2,
+            ),
+        ]
+
+    @staticmethod
+    def _format_result(
+        point: models.ScoredPoint, search_type: str = "official_hybrid_rrf"
+    ) -> Dict[str, Any]:
+        return {
+            "chunk_id": point.id,
+            "score": point.score,
+            "search_type": search_type,
+            # Only points indexed before content moved out of Qdrant have it here
+            "content": point.payload.get("content"),
+            "document_id": point.payload["document_id"],
+            "content_type": point.payload.get("content_type", "text"),
+            "page_number": point.payload["page_number"],
+            "chunk_index": point.payload["chunk_index"],
+            "metadata": {
+                k: v
+                for k, v in point.payload.items()
+                if k
+                not in [
+                    "content",
+                    "document_id",
+                    "content_type",
+                    "page_number",
+                    "chunk_index",
+                ]
+            },
+        }
+
+    def _dense_vectors_selector(self, with_dense_scores: bool) -> Any:
+        # Only the dense vectors of the final hits are fetched
+        return [self.dense_vector_name] if with_dense_scores else False
+
+    def _format_result_with_dense_score(
+        self, point: models.ScoredPoint, dense_query: List[float]
+    ) -> Dict[str, Any]:
+        """``_format_result`` plus the hit's cosine similarity, if its vector came back."""
+        result = self._format_result(point)
+        vector = (
+            point.vector.get(self.dense_vector_name)
+            if isinstance(point.vector, dict)
+            else None
+        )
+        if vector is not None:
+            query, hit = np.asarray(dense_query), np.asarray(vector)
+            norm = float(np.linalg.norm(query) * np.linalg.norm(hit))
+            result["dense_score"] = float(query @ hit) / norm if norm else 0.0
+        return result
+
+    def _hydrate(
+        self, results: List[Dict[str, Any]], limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Fill in content and metadata of final results from the chunk store.
+
+        Results without stored content are dropped. Searches fetch
+        ``HYDRATION_MARGIN`` extra hits to make up for them and pass their
+        ``limit`` to cut the results back to size.
+        """
+        missing = [result for result in results if result["content"] is None]
+        if not missing:
+            return results[:limit]
+
+        chunks = self.chunks_dto.get_chunks([result["chunk_id"] for result in missing])
+        for result in missing:
+            chunk = chunks.get(str(result["chunk_id"]))
+            if chunk is None:
+                logger.warning(f"No stored content for chunk {result['chunk_id']}")
+                continue
+            result["content"] = chunk.content
+            result["metadata"] = {**chunk.chunk_metadata, **result["metadata"]}
+
+        return [result for result in results if result["content"] is not None][:limit]
+
     def hybrid_search(
         self,
         query: str,
-        document_id: Optional[str] = None,
+        document_id: Optional[Union[str, List[str]]] = None,
         chunk_types: Optional[List[str]] = None,
         limit: int = 10,
-        score_threshold: float = 0.3,
+        score_threshold: Optional[float] = 0.3,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        with_dense_scores: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Perform hybrid search using official Qdrant native fusion.
+
+        Filters are applied by Qdrant inside both prefetches. RRF scores only
+        reflect rank, so ``score_threshold`` is a cosine similarity cutoff on
+        the dense candidates; sparse (keyword) candidates are kept as is.
+        ``with_dense_scores`` adds each result's cosine similarity to the query
+        as ``dense_score``.
         """
         try:
-            query_filter = None
-            if document_id:
-                query_filter = models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="document_id",
-                            match=models.MatchValue(value=document_id),
-                        )
-                    ]
-                )
+            collection = self.active_collection()
+            query_filter = self._build_filter(
+                document_id, chunk_types, language, page_range
+            )
+
+            dense_query, sparse_query = collection.embeddings.embed_query(query)
 
             search_result = self.client.query_points(
-                collection_name=self.collection_name,
+                collection_name=collection.name,
                 query=models.FusionQuery(
                     fusion=models.Fusion.RRF  # Reciprocal Rank Fusion
                 ),
-                prefetch=[
-                    models.Prefetch(
-                        query=models.Document(text=query, model=self.DENSE_MODEL),
-                        using=self.dense_vector_name,
-                        limit=limit * 2,
-                    ),
-                    models.Prefetch(
-                        query=models.Document(text=query, model=self.SPARSE_MODEL),
-                        using=self.sparse_vector_name,
-                        limit=limit * 2,
-                    ),
-                ],
-                query_filter=query_filter,
-                limit=limit,
+                prefetch=self._hybrid_prefetch(
+                    dense_query, sparse_query, query_filter, limit, score_threshold
+                ),
+                limit=limit + QdrantDefaults.HYDRATION_MARGIN,
                 with_payload=True,
+                with_vectors=self._dense_vectors_selector(with_dense_scores),
             ).points
 
-            results = []
-            for point in search_result:
-                results.append(
-                    {
-                        "chunk_id": point.id,
-                        "score": point.score,
-                        "search_type": "official_hybrid_rrf",
-                        "content": point.payload["content"],
-                        "document_id": point.payload["document_id"],
-                        "content_type": point.payload.get("content_type", "text"),
-                        "page_number": point.payload["page_number"],
-                        "chunk_index": point.payload["chunk_index"],
-                        "metadata": {
-                            k: v
-                            for k, v in point.payload.items()
-                            if k
-                            not in [
-                                "content",
-                                "document_id",
-                                "content_type",
-                                "page_number",
-                                "chunk_index",
-                            ]
-                        },
-                    }
-                )
+            results = self._hydrate(
+                [
+                    self._format_result_with_dense_score(point, dense_query)
+                    for point in search_result
+                ],
+                limit,
+            )
 
             logger.info(f"Official hybrid search completed: {len(results)} results")
             return results
@@ -301,119 +957,399 @@ class QdrantOfficialHybridStore:
             logger.error(f"Official hybrid search failed: {e}")
             raise Exception(f"Failed to perform hybrid search: {str(e)}")
 
+    async def ahybrid_search(
+        self,
+        query: str,
+        document_id: Optional[Union[str, List[str]]] = None,
+        chunk_types: Optional[List[str]] = None,
+        limit: int = 10,
+        score_threshold: Optional[float] = 0.3,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        with_dense_scores: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Async ``hybrid_search`` that doesn't block the event loop."""
+        try:
+            collection = await asyncio.to_thread(self.active_collection)
+            query_filter = self._build_filter(
+                document_id, chunk_types, language, page_range
+            )
+
+            dense_query, sparse_query = await asyncio.to_thread(
+                collection.embeddings.embed_query, query
+            )
+
+            response = await self.async_client.query_points(
+                collection_name=collection.name,
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                prefetch=self._hybrid_prefetch(
+                    dense_query, sparse_query, query_filter, limit, score_threshold
+                ),
+                limit=limit + QdrantDefaults.HYDRATION_MARGIN,
+                with_payload=True,
+                with_vectors=self._dense_vectors_selector(with_dense_scores),
+            )
+
+            results = await asyncio.to_thread(
+                self._hydrate,
+                [
+                    self._format_result_with_dense_score(point, dense_query)
+                    for point in response.points
+                ],
+                limit,
+            )
+
+            logger.info(f"Official hybrid search completed: {len(results)} results")
+            return results
+
+        except Exception as e:
+            logger.error(f"Official hybrid search failed: {e}")
+            raise Exception(f"Failed to perform hybrid search: {str(e)}")
+
+    def hybrid_search_batch(
+        self,
+        queries: List[str],
+        document_id: Optional[Union[str, List[str]]] = None,
+        chunk_types: Optional[List[str]] = None,
+        limit: int = 10,
+        score_threshold: Optional[float] = 0.3,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run ``hybrid_search`` for many queries in one Qdrant round trip.
+
+        All queries are embedded in one batch and share the same filters.
+        Returns one result list per query, in query order.
+        """
+        if not queries:
+            return []
+
+        try:
+            collection = self.active_collection()
+            query_filter = self._build_filter(
+                document_id, chunk_types, language, page_range
+            )
+
+            query_vectors = collection.embeddings.embed_queries(queries)
+
+            responses = []
+            for start in range(0, len(query_vectors), settings.search_batch_size):
+                responses.extend(
+                    self.client.query_batch_points(
+                        collection_name=collection.name,
+                        requests=[
+                            models.QueryRequest(
+                                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                                prefetch=self._hybrid_prefetch(
+                                    dense_query,
+                                    sparse_query,
+                                    query_filter,
+                                    limit,
+                                    score_threshold,
+                                ),
+                                limit=limit + QdrantDefaults.HYDRATION_MARGIN,
+                                with_payload=True,
+                            )
+                            for dense_query, sparse_query in query_vectors[
+                                start : start + settings.search_batch_size
+                            ]
+                        ],
+                    )
+                )
+
+            results = [
+                [self._format_result(point) for point in response.points]
+                for response in responses
+            ]
+            # One content lookup for the whole batch
+            hydrated = self._hydrate([result for batch in results for result in batch])
+            hydrated_ids = {id(result) for result in hydrated}
+            results = [
+                [result for result in batch if id(result) in hydrated_ids][:limit]
+                for batch in results
+            ]
+
+            logger.info(
+                f"Official hybrid batch search completed: {len(queries)} queries, "
+                f"{sum(len(result) for result in results)} results"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Official hybrid batch search failed: {e}")
+            raise Exception(f"Failed to perform hybrid batch search: {str(e)}")
+
     def search_documents(
         self,
         query: str,
-        document_id: Optional[str] = None,
+        document_id: Optional[Union[str, List[str]]] = None,
         chunk_types: Optional[List[str]] = None,
         limit: int = 10,
-        score_threshold: float = 0.7,
+        score_threshold: Optional[float] = 0.7,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
     ) -> List[Dict[str, Any]]:
         """Dense-only search for backward compatibility."""
         try:
-            query_filter = None
-            if document_id:
-                query_filter = models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="document_id",
-                            match=models.MatchValue(value=document_id),
-                        )
-                    ]
-                )
+            collection = self.active_collection()
+            query_filter = self._build_filter(
+                document_id, chunk_types, language, page_range
+            )
+
+            # Skips SPLADE inference, which dense-only search doesn't use
+            dense_query = collection.embeddings.embed_dense_query(query)
 
             search_results = self.client.query_points(
-                collection_name=self.collection_name,
-                query=models.Document(text=query, model=self.DENSE_MODEL),
+                collection_name=collection.name,
+                query=dense_query,
                 using=self.dense_vector_name,
                 query_filter=query_filter,
-                limit=limit,
+                search_params=self._dense_search_params(),
+                limit=limit + QdrantDefaults.HYDRATION_MARGIN,
                 score_threshold=score_threshold,
                 with_payload=True,
             ).points
 
-            results = []
-            for point in search_results:
-                results.append(
-                    {
-                        "chunk_id": point.id,
-                        "score": point.score,
-                        "search_type": "dense_only_official",
-                        "content": point.payload["content"],
-                        "document_id": point.payload["document_id"],
-                        "content_type": point.payload.get("content_type", "text"),
-                        "page_number": point.payload["page_number"],
-                        "chunk_index": point.payload["chunk_index"],
-                        "metadata": {
-                            k: v
-                            for k, v in point.payload.items()
-                            if k
-                            not in [
-                                "content",
-                                "document_id",
-                                "content_type",
-                                "page_number",
-                                "chunk_index",
-                            ]
-                        },
-                    }
-                )
+            return self._hydrate(
+                [
+                    self._format_result(point, "dense_only_official")
+                    for point in search_results
+                ],
+                limit,
+            )
 
-            return results
+        except Exception as e:
+            logger.error(f"Dense search failed: {e}")
+            raise Exception(f"Failed to search documents: {str(e)}")
+
+    async def asearch_documents(
+        self,
+        query: str,
+        document_id: Optional[Union[str, List[str]]] = None,
+        chunk_types: Optional[List[str]] = None,
+        limit: int = 10,
+        score_threshold: Optional[float] = 0.7,
+        language: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Async ``search_documents``."""
+        try:
+            collection = await asyncio.to_thread(self.active_collection)
+            query_filter = self._build_filter(
+                document_id, chunk_types, language, page_range
+            )
+
+            dense_query = await asyncio.to_thread(
+                collection.embeddings.embed_dense_query, query
+            )
+
+            response = await self.async_client.query_points(
+                collection_name=collection.name,
+                query=dense_query,
+                using=self.dense_vector_name,
+                query_filter=query_filter,
+                search_params=self._dense_search_params(),
+                limit=limit + QdrantDefaults.HYDRATION_MARGIN,
+                score_threshold=score_threshold,
+                with_payload=True,
+            )
+
+            return await asyncio.to_thread(
+                self._hydrate,
+                [
+                    self._format_result(point, "dense_only_official")
+                    for point in response.points
+                ],
+                limit,
+            )
 
         except Exception as e:
             logger.error(f"Dense search failed: {e}")
             raise Exception(f"Failed to search documents: {str(e)}")
 
+    def clone_document(
+        self, source_document_id: str, document_id: str, filename: str
+    ) -> int:
+        """Copy all points of an indexed document to a new document id.
+
+        Vectors are copied as stored, so no embeddings are recomputed.
+        """
+        try:
+            # Vectors are copied as is, so stay on one collection throughout
+            collection_name = self.collection_name
+            source_filter = models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="document_id",
+                        match=models.MatchValue(value=source_document_id),
+                    )
+                ]
+            )
+
+            total_points = 0
+            offset = None
+            while True:
+                points, offset = self.client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=source_filter,
+                    limit=256,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+
+                if points:
+                    indexed_at = datetime.now().isoformat()
+                    new_points, new_chunks, copied_ids = [], [], {}
+                    for point in points:
+                        # Stable per (clone, source chunk), so a retried clone overwrites
+                        point_id = str(
+                            uuid.uuid5(CHUNK_ID_NAMESPACE, f"{document_id}:{point.id}")
+                        )
+                        payload = {
+                            **point.payload,
+                            "chunk_id": point_id,
+                            "document_id": document_id,
+                            "filename": filename,
+                        }
+                        if "content" in payload:
+                            # Indexed before content moved out of Qdrant
+                            payload, chunk = self._split_payload(
+                                point_id, {**payload, "indexed_at": indexed_at}
+                            )
+                            new_chunks.append(chunk)
+                        else:
+                            copied_ids[str(point.id)] = point_id
+
+                        new_points.append(
+                            models.PointStruct(
+                                id=point_id, vector=point.vector, payload=payload
+                            )
+                        )
+
+                    self.chunks_dto.save_chunks(new_chunks)
+                    self.chunks_dto.copy_chunks(copied_ids, document_id)
+                    self.client.upsert(
+                        collection_name=collection_name, points=new_points
+                    )
+                    total_points += len(points)
+
+                if offset is None:
+                    break
+
+            logger.info(
+                f"Cloned {total_points} chunks from document {source_document_id} to {document_id}"
+            )
+            return total_points
+
+        except Exception as e:
+            logger.error(
+                f"Failed to clone document {source_document_id} to {document_id}: {str(e)}"
+            )
+            raise Exception(f"Failed to clone document: {str(e)}")
+
     def delete_document(self, document_id: str) -> bool:
         """Delete all chunks for a document."""
         try:
             delete_result = self.client.delete(
                 collection_name=self.collection_name,
-                points_selector=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="document_id",
-                            match=models.MatchValue(value=document_id),
-                        )
-                    ]
-                ),
+                points_selector=self._build_filter(document_id=document_id),
             )
+            self.chunks_dto.delete_document_chunks(document_id)
+            return self._check_delete_result(document_id, delete_result)
 
-            # Check if the operation was successful
-            if hasattr(delete_result, "operation_id") or delete_result:
-                logger.info(f"Successfully deleted document {document_id} from Qdrant")
-                return True
-            else:
-                logger.warning(
-                    f"Delete operation for document {document_id} returned unexpected result"
-                )
-                return False
+        except Exception as e:
+            logger.error(f"Failed to delete document {document_id}: {str(e)}")
+            return False
+
+    async def adelete_document(self, document_id: str) -> bool:
+        """Async ``delete_document``."""
+        try:
+            collection = await asyncio.to_thread(self.active_collection)
+            delete_result = await self.async_client.delete(
+                collection_name=collection.name,
+                points_selector=self._build_filter(document_id=document_id),
+            )
+            await asyncio.to_thread(self.chunks_dto.delete_document_chunks, document_id)
+            return self._check_delete_result(document_id, delete_result)
 
         except Exception as e:
             logger.error(f"Failed to delete document {document_id}: {str(e)}")
             return False
 
+    @staticmethod
+    def _check_delete_result(document_id: str, delete_result: Any) -> bool:
+        # Check if the operation was successful
+        if hasattr(delete_result, "operation_id") or delete_result:
+            logger.info(f"Successfully deleted document {document_id} from Qdrant")
+            return True
+
+        logger.warning(
+            f"Delete operation for document {document_id} returned unexpected result"
+        )
+        return False
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection."""
         try:
-            info = self.client.get_collection(self.collection_name)
-            return {
-                "total_points": info.points_count,
-                "dense_vector_size": info.config.params.vectors[
-                    self.dense_vector_name
-                ].size,
-                "distance_metric": info.config.params.vectors[
-                    self.dense_vector_name
-                ].distance,
-                "has_sparse_vectors": bool(info.config.params.sparse_vectors),
-                "collection_name": self.collection_name,
-                "approach": "official_qdrant_hybrid_fastembed",
-            }
+            collection = self.active_collection()
+            return self._format_collection_stats(
+                collection, self.client.get_collection(collection.name)
+            )
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def aget_collection_stats(self) -> Dict[str, Any]:
+        """Async ``get_collection_stats``."""
+        try:
+            collection = await asyncio.to_thread(self.active_collection)
+            return self._format_collection_stats(
+                collection, await self.async_client.get_collection(collection.name)
+            )
 
         except Exception as e:
             return {"error": str(e)}
 
+    def _format_collection_stats(
+        self, collection: ActiveCollection, info: models.CollectionInfo
+    ) -> Dict[str, Any]:
+        return {
+            "total_points": info.points_count,
+            "dense_vector_size": info.config.params.vectors[
+                self.dense_vector_name
+            ].size,
+            "distance_metric": info.config.params.vectors[
+                self.dense_vector_name
+            ].distance,
+            "has_sparse_vectors": bool(info.config.params.sparse_vectors),
+            "collection_name": collection.name,
+            "collection_alias": self.alias_name,
+            "dense_model": collection.embeddings.dense_model_name,
+            "sparse_model": collection.embeddings.sparse_model_name,
+            "approach": "official_qdrant_hybrid_fastembed",
+        }
+
+
+_vector_store: Optional[QdrantOfficialHybridStore] = None
+_vector_store_lock = threading.Lock()
+
+
+def get_vector_store() -> QdrantOfficialHybridStore:
+    """Get the vector store shared by document processing and chat in this process."""
+    global _vector_store
+
+    with _vector_store_lock:
+        if _vector_store is None:
+            _vector_store = QdrantOfficialHybridStore()
+        return _vector_store
+
+
+async def close_vector_store() -> None:
+    """Close the shared store's async connection pool, if it was opened."""
+    if _vector_store is not None:
+        await _vector_store.aclose()
+
 
 # Keep backward compatibility - this will use the older custom approach as fallback
 QdrantHybridVectorStore = QdrantOfficialHybridStore
@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar
+
+from config import settings
+from openai import APIConnectionError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset durations such as ``"20ms"``, ``"1.5s"`` or ``"6m0s"``."""
+    if not value:
+        return None
+
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _rate_limit_cause(error: BaseException) -> Optional[BaseException]:
+    """Find a 429 response anywhere in an exception chain.
+
+    Instructor wraps API errors in its own retry exception, so the original
+    RateLimitError is usually the ``__cause__`` rather than the raised error.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if getattr(current, "status_code", None) == 429:
+            return current
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def _transient_cause(error: BaseException) -> Optional[BaseException]:
+    """Find a server error, timeout or connection failure in an exception chain."""
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, APIConnectionError):  # Includes APITimeoutError
+            return current
+        status_code = getattr(current, "status_code", None)
+        if isinstance(status_code, int) and status_code >= 500:
+            return current
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read the server-suggested retry delay from a rate limit error."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    return parse_reset_duration(headers.get("retry-after"))
+
+
+class TokenBucket:
+    """Continuously refilling budget expressed as units per minute.
+
+    ``reserve`` always succeeds and returns how long the caller has to wait
+    before its reservation is covered, which keeps callers roughly FIFO
+    without a polling loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self.updated_at) * self.refill_rate
+        )
+        self.updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+        if self.available >= 0:
+            return 0.0
+        return -self.available / self.refill_rate
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, when negative) a correction to an earlier reservation."""
+        self._refill()
+        self.available = min(self.capacity, self.available - amount)
+
+    def update_limit(self, per_minute: float) -> None:
+        if per_minute > 0 and per_minute != self.capacity:
+            self._refill()
+            self.capacity = float(per_minute)
+            self.available = min(self.available, self.capacity)
+
+    def sync_remaining(self, remaining: float) -> None:
+        """Trust the server when it reports less budget than we think we have."""
+        self._refill()
+        self.available = min(self.available, remaining)
+
+
+class OpenAIRateLimiter:
+    """Process-wide scheduler for OpenAI calls.
+
+    Combines request and token buckets, an adaptive concurrency window
+    (halved on every 429, grown additively on success) and jittered
+    exponential backoff. A 429 pauses all callers sharing the limiter; server
+    errors, timeouts and connection failures only retry the failed call.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._concurrency = float(self.max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._lock = threading.Lock()  # Guards buckets, updated from HTTP hooks
+
+    @property
+    def concurrency(self) -> int:
+        return max(1, int(self._concurrency))
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _acquire_slot(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.concurrency)
+            self._in_flight += 1
+
+    async def _release_slot(self, succeeded: bool, rate_limited: bool) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            if rate_limited:
+                self._concurrency = max(1.0, self._concurrency / 2)
+            elif succeeded:
+                self._concurrency = min(
+                    float(self.max_concurrency),
+                    self._concurrency + 1.0 / self._concurrency,
+                )
+            condition.notify_all()
+
+    async def _wait_for_budget(self, estimated_tokens: int) -> None:
+        with self._lock:
+            wait = max(
+                self.requests.reserve(1),
+                self.tokens.reserve(estimated_tokens),
+                self._paused_until - time.monotonic(),
+            )
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _settle_tokens(self, reserved: int, used: int) -> None:
+        """Correct a token reservation once the real usage is known."""
+        with self._lock:
+            self.tokens.adjust(used - reserved)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Reconcile local budgets with OpenAI ``x-ratelimit-*`` response headers."""
+        try:
+            with self._lock:
+                if headers.get("x-ratelimit-limit-requests"):
+                    self.requests.update_limit(
+                        float(headers["x-ratelimit-limit-requests"])
+                    )
+                if headers.get("x-ratelimit-limit-tokens"):
+                    self.tokens.update_limit(float(headers["x-ratelimit-limit-tokens"]))
+                if headers.get("x-ratelimit-remaining-requests"):
+                    self.requests.sync_remaining(
+                        float(headers["x-ratelimit-remaining-requests"])
+                    )
+                if headers.get("x-ratelimit-remaining-tokens"):
+                    self.tokens.sync_remaining(
+                        float(headers["x-ratelimit-remaining-tokens"])
+                    )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Ignoring malformed rate limit headers: {e}")
+
+    def _backoff_delay(
+        self, attempt: int, retry_after: Optional[float], pause_all: bool
+    ) -> float:
+        """Full-jitter exponential backoff, never shorter than the server asks."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, retry_after)
+
+        if pause_all:
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        tokens_used: Optional[Callable[[T], Optional[int]]] = None,
+    ) -> T:
+        """Run an API call within the shared budget, retrying transient failures.
+
+        429 responses, server errors, timeouts and connection failures are
+        retried with backoff. When ``tokens_used`` is given it reads the real
+        usage from the result, and the token budget is charged or refunded the
+        difference from ``estimated_tokens``.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._acquire_slot()
+            succeeded = rate_limited = False
+            try:
+                await self._wait_for_budget(estimated_tokens)
+                result = await operation()
+                succeeded = True
+            except Exception as e:
+                rate_limit = _rate_limit_cause(e)
+                if rate_limit is not None:
+                    # Rejected requests don't count against the token budget
+                    self._settle_tokens(estimated_tokens, 0)
+                cause = rate_limit or _transient_cause(e)
+                if cause is None or attempt >= self.max_retries:
+                    raise
+                rate_limited = rate_limit is not None
+                reason = "rate limit hit" if rate_limited else f"call failed ({cause})"
+                delay = self._backoff_delay(
+                    attempt, _retry_after_seconds(cause), pause_all=rate_limited
+                )
+            finally:
+                await self._release_slot(succeeded, rate_limited)
+
+            if succeeded:
+                used = tokens_used(result) if tokens_used is not None else None
+                if used:
+                    self._settle_tokens(estimated_tokens, used)
+                return result
+
+            logger.warning(
+                f"OpenAI {reason}, retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{self.max_retries}, concurrency {self.concurrency})"
+            )
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "requests_per_minute": self.requests.capacity,
+                "tokens_per_minute": self.tokens.capacity,
+            }
+
+
+_rate_limiter: Optional[OpenAIRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """Get the rate limiter shared by every OpenAI vision call in this process."""
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = OpenAIRateLimiter(
+                requests_per_minute=settings.openai_requests_per_minute,
+                tokens_per_minute=settings.openai_tokens_per_minute,
+                max_concurrency=settings.vision_max_concurrency,
+                max_retries=settings.openai_max_retries,
+                backoff_base=settings.openai_backoff_base_seconds,
+                backoff_max=settings.openai_backoff_max_seconds,
+            )
+        return _rate_limiter
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from config import settings
+from constants import RelevanceGraderMode
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+GRADE_PROMPT = (
+    "You are a grader assessing relevance of a retrieved document to a user question. \n "
+    "Here is the retrieved document: \n\n {context} \n\n"
+    "Here is the user question: {question} \n"
+    "If the document contains keyword(s) or semantic meaning related to the user question, grade it as relevant. \n"
+    "Give a binary score 'yes' or 'no' score to indicate whether the document is relevant to the question."
+)
+
+# Weights of the retrieval signals in the combined score
+DENSE_WEIGHT = 0.55
+KEYWORD_WEIGHT = 0.25
+AGREEMENT_WEIGHT = 0.2
+
+# Qdrant's RRF gives 1 / (rank + 1) per list, so a hit ranked first by either
+# search alone reaches 0.5; only hits found by both searches score above it
+RRF_SINGLE_LIST_MAX = 0.5
+
+# Hits whose text is compared with the question
+SIGNAL_TOP_HITS = 3
+
+_TERM = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has have "
+    "what when where which who whom why how this that these those with from "
+    "into about does did doing there their them they then than its it's your "
+    "tell give show explain describe list please".split()
+)
+
+
+class GradeDocuments(BaseModel):
+    """Grade documents using a binary score for relevance check."""
+
+    binary_score: str = Field(
+        description="Relevance score: 'yes' if relevant, or 'no' if not relevant"
+    )
+
+
+class GradeResult(NamedTuple):
+    relevant: bool
+    grader: str  # signals, cross_encoder or llm
+    score: Optional[float] = None
+
+
+class RelevanceGrader:
+    """Decides whether retrieved documents can answer a question.
+
+    Grades in steps, each only consulted when the previous one is unsure:
+
+    1. Retrieval signals: dense cosine similarity of the best hit, share of
+       question keywords found in the top hits and whether the best hit was
+       ranked by both dense and sparse search (its RRF score is above 0.5).
+    2. A local cross-encoder, when RELEVANCE_CROSS_ENCODER_MODEL is set.
+    3. The LLM grader.
+
+    RELEVANCE_GRADER=llm grades everything with the LLM, as before;
+    ``signals`` never calls a model and settles the unsure band at its middle.
+    """
+
+    def __init__(self, llm: BaseChatModel, mode: Optional[RelevanceGraderMode] = None):
+        self.llm = llm
+        self.mode = mode or settings.relevance_grader
+        self.accept_score = settings.relevance_accept_score
+        self.reject_score = settings.relevance_reject_score
+        self.cross_encoder_model = settings.relevance_cross_encoder_model
+        self.cross_encoder_accept = settings.relevance_cross_encoder_accept
+        self.cross_encoder_reject = settings.relevance_cross_encoder_reject
+
+        self._cross_encoder = None
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    # Grading
+
+    def grade(
+        self, question: str, documents: Sequence[Document], context: str
+    ) -> GradeResult:
+        result = self._grade_locally(question, documents)
+        if result is None:
+            response = self.llm.with_structured_output(GradeDocuments).invoke(
+                self._llm_prompt(question, context)
+            )
+            result = GradeResult(response.binary_score == "yes", "llm")
+        return self._record(result)
+
+    async def agrade(
+        self, question: str, documents: Sequence[Document], context: str
+    ) -> GradeResult:
+        if self._uses_cross_encoder():
+            # ONNX inference is CPU bound
+            result = await asyncio.to_thread(self._grade_locally, question, documents)
+        else:
+            result = self._grade_locally(question, documents)
+
+        if result is None:
+            response = await self.llm.with_structured_output(GradeDocuments).ainvoke(
+                self._llm_prompt(question, context)
+            )
+            result = GradeResult(response.binary_score == "yes", "llm")
+        return self._record(result)
+
+    def _grade_locally(
+        self, question: str, documents: Sequence[Document]
+    ) -> Optional[GradeResult]:
+        """Signal and cross-encoder steps; None when the LLM has to decide."""
+        if self.mode == RelevanceGraderMode.LLM:
+            return None
+        if not documents:
+            return GradeResult(False, "signals", 0.0)
+
+        score = self.signal_score(question, documents)
+        if score is not None:
+            if score >= self.accept_score:
+                return GradeResult(True, "signals", score)
+            if score < self.reject_score:
+                return GradeResult(False, "signals", score)
+
+        if self._uses_cross_encoder():
+            probability = self.cross_encoder_score(question, documents)
+            if probability >= self.cross_encoder_accept:
+                return GradeResult(True, "cross_encoder", probability)
+            if probability <= self.cross_encoder_reject:
+                return GradeResult(False, "cross_encoder", probability)
+
+        if self.mode == RelevanceGraderMode.SIGNALS:
+            middle = (self.accept_score + self.reject_score) / 2
+            return GradeResult(score is not None and score >= middle, "signals", score)
+
+        return None
+
+    @staticmethod
+    def _llm_prompt(question: str, context: str) -> List[Dict[str, str]]:
+        prompt = GRADE_PROMPT.format(question=question, context=context)
+        return [{"role": "user", "content": prompt}]
+
+    # Signals
+
+    def signal_score(
+        self, question: str, documents: Sequence[Document]
+    ) -> Optional[float]:
+        """Weighted retrieval signals in [0, 1]; None without dense scores.
+
+        Documents indexed or retrieved without dense scores leave the
+        decision to the next step.
+        """
+        dense_scores = [
+            doc.metadata["dense_score"]
+            for doc in documents
+            if doc.metadata.get("dense_score") is not None
+        ]
+        if not dense_scores:
+            return None
+
+        top_hits = sorted(
+            documents,
+            key=lambda doc: doc.metadata.get("relevance_score", 0.0),
+            reverse=True,
+        )[:SIGNAL_TOP_HITS]
+        rrf_top = max(doc.metadata.get("relevance_score", 0.0) for doc in documents)
+        # The score itself is near 0.5 to 1 for any retrieval, only agreement
+        # between the two searches carries information
+        agreement = 1.0 if rrf_top > RRF_SINGLE_LIST_MAX else 0.0
+
+        return (
+            DENSE_WEIGHT * min(max(max(dense_scores), 0.0), 1.0)
+            + KEYWORD_WEIGHT * self.keyword_overlap(question, top_hits)
+            + AGREEMENT_WEIGHT * agreement
+        )
+
+    @staticmethod
+    def keyword_overlap(question: str, documents: Sequence[Document]) -> float:
+        """Share of the question's content words found in the documents."""
+        terms = {
+            term
+            for term in _TERM.findall(question.lower())
+            if len(term) > 2 and term not in _STOPWORDS
+        }
+        if not terms:
+            return 0.0
+
+        text = set(
+            _TERM.findall(" ".join(doc.page_content for doc in documents).lower())
+        )
+        return len(terms & text) / len(terms)
+
+    # Cross-encoder
+
+    def _uses_cross_encoder(self) -> bool:
+        return bool(self.cross_encoder_model)
+
+    @property
+    def cross_encoder(self):
+        if self._cross_encoder is None:
+            with self._lock:
+                if self._cross_encoder is None:
+                    from fastembed.rerank.cross_encoder import TextCrossEncoder
+
+                    self._cross_encoder = TextCrossEncoder(
+                        model_name=self.cross_encoder_model,
+                        threads=settings.embedding_threads,
+                        providers=settings.embedding_providers,
+                    )
+        return self._cross_encoder
+
+    def cross_encoder_score(
+        self, question: str, documents: Sequence[Document]
+    ) -> float:
+        """Probability that the best of the top hits answers the question."""
+        top_hits = sorted(
+            documents,
+            key=lambda doc: doc.metadata.get("relevance_score", 0.0),
+            reverse=True,
+        )[:SIGNAL_TOP_HITS]
+        logits = list(
+            self.cross_encoder.rerank(question, [doc.page_content for doc in top_hits])
+        )
+        return 1 / (1 + math.exp(-max(logits)))
+
+    # Stats
+
+    def _record(self, result: GradeResult) -> GradeResult:
+        with self._lock:
+            self._counts[result.grader] += 1
+        logger.info(
+            f"Relevance graded by {result.grader}: "
+            f"{'relevant' if result.relevant else 'not relevant'}"
+            + (f" (score {result.score:.3f})" if result.score is not None else "")
+        )
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._counts.values())
+            return {
+                "mode": self.mode.value,
+                "graded": total,
+                "by_grader": dict(self._counts),
+                "llm_rate": round(self._counts["llm"] / total, 3) if total else 0.0,
+            }
@@ -0,0 +1,385 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config import settings
+from db.models import SessionCheckpoint, SessionCheckpointWrite
+from dto.checkpoints_dto import CheckpointsDto
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from utils.context_builder import turn_start_indexes
+
+logger = logging.getLogger(__name__)
+
+_CacheKey = Tuple[str, str]  # (thread_id, checkpoint_ns)
+_CacheEntry = Tuple[SessionCheckpoint, List[SessionCheckpointWrite]]
+
+
+class SessionCheckpointer(BaseCheckpointSaver):
+    """LangGraph checkpointer keeping chat sessions in the application database.
+
+    Only the latest checkpoint of a session is kept, with the message history
+    cut to the last ``max_turns`` question/answer turns and the retrieved
+    context of earlier retrievals shortened. Sessions idle for longer than
+    ``ttl_seconds`` are purged, at most once per purge interval, by whichever
+    process writes next.
+
+    Recently used sessions are also kept serialized in a per-process LRU, so
+    loading a hot session only reads its checkpoint id from the database to
+    make sure no other worker has written it since.
+    """
+
+    def __init__(
+        self,
+        db_engine,
+        max_turns: Optional[int] = None,
+        tool_content_chars: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        purge_interval_seconds: Optional[float] = None,
+    ):
+        super().__init__()
+        self.checkpoints_dto = CheckpointsDto(db_engine)
+        self.max_turns = max_turns or settings.chat_history_max_turns
+        self.tool_content_chars = (
+            tool_content_chars or settings.chat_history_tool_content_chars
+        )
+        self.cache_size = (
+            cache_size if cache_size is not None else settings.chat_session_cache_size
+        )
+        self.ttl_seconds = ttl_seconds or settings.chat_session_ttl_seconds
+        self.purge_interval_seconds = (
+            purge_interval_seconds or settings.chat_session_purge_interval_seconds
+        )
+
+        self._cache: "OrderedDict[_CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_purge = time.monotonic()
+
+    # Sync API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        key = (thread_id, checkpoint_ns)
+
+        stored_id = self.checkpoints_dto.get_checkpoint_id(thread_id, checkpoint_ns)
+        if stored_id is None:
+            self._cache_pop(key)
+            return None
+
+        # Only the latest checkpoint is kept
+        requested_id = get_checkpoint_id(config)
+        if requested_id and requested_id != stored_id:
+            return None
+
+        entry = self._cache_get(key)
+        if entry is None or entry[0].checkpoint_id != stored_id:
+            row = self.checkpoints_dto.get_checkpoint(thread_id, checkpoint_ns)
+            if row is None:
+                return None
+            writes = self.checkpoints_dto.get_writes(
+                thread_id, checkpoint_ns, row.checkpoint_id
+            )
+            entry = (row, writes)
+            self._cache_put(key, entry)
+
+        return self._to_tuple(*entry)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        # Sessions are only looked up by id, and each has a single checkpoint
+        if not config or limit == 0:
+            return
+
+        checkpoint_tuple = self.get_tuple(
+            {
+                "configurable": {
+                    "thread_id": config["configurable"]["thread_id"],
+                    "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+                }
+            }
+        )
+        if checkpoint_tuple is None:
+            return
+
+        checkpoint_id = checkpoint_tuple.config["configurable"]["checkpoint_id"]
+        requested_id = get_checkpoint_id(config)
+        if requested_id and requested_id != checkpoint_id:
+            return
+        if before and checkpoint_id >= get_checkpoint_id(before):
+            return
+        if filter and any(
+            checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()
+        ):
+            return
+
+        yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(
+            self._compact(checkpoint)
+        )
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        row = SessionCheckpoint(
+            thread_id=thread_id,
+            checkpoint_ns=checkpoint_ns,
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=get_checkpoint_id(config),
+            checkpoint_type=checkpoint_type,
+            checkpoint_blob=checkpoint_blob,
+            metadata_type=metadata_type,
+            metadata_blob=metadata_blob,
+            updated_at=datetime.now(),
+        )
+        self.checkpoints_dto.save_checkpoint(row)
+        self._cache_put((thread_id, checkpoint_ns), (row, []))
+
+        self._maybe_purge()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_blob = self.serde.dumps_typed(value)
+            rows.append(
+                SessionCheckpointWrite(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    checkpoint_id=checkpoint_id,
+                    task_id=task_id,
+                    idx=WRITES_IDX_MAP.get(channel, idx),
+                    channel=channel,
+                    value_type=value_type,
+                    value_blob=value_blob,
+                    task_path=task_path,
+                )
+            )
+
+        self.checkpoints_dto.save_writes(rows)
+
+        key = (thread_id, checkpoint_ns)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0].checkpoint_id != checkpoint_id:
+                return
+            stored = {(w.task_id, w.idx): w for w in entry[1]}
+            for row in rows:
+                if row.idx < 0 or (row.task_id, row.idx) not in stored:
+                    stored[(row.task_id, row.idx)] = row
+            self._cache[key] = (entry[0], list(stored.values()))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.checkpoints_dto.delete_thread(thread_id)
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == thread_id]:
+                del self._cache[key]
+
+    def purge_idle_sessions(self) -> int:
+        """Delete sessions idle for longer than the TTL; returns how many."""
+        updated_before = datetime.now() - timedelta(seconds=self.ttl_seconds)
+        thread_ids = set(self.checkpoints_dto.delete_idle(updated_before))
+        if thread_ids:
+            with self._lock:
+                for key in [key for key in self._cache if key[0] in thread_ids]:
+                    del self._cache[key]
+            logger.info(f"Purged {len(thread_ids)} idle chat sessions")
+        return len(thread_ids)
+
+    # Async API, over the sync one in a thread
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # History trimming
+
+    def _compact(self, checkpoint: Checkpoint) -> Checkpoint:
+        """Copy of the checkpoint with the message history trimmed.
+
+        The running graph keeps its full state; the trimmed history is what
+        the next question of the session starts from.
+        """
+        values = checkpoint["channel_values"]
+        messages = values.get("messages")
+        if not messages:
+            return checkpoint
+        return {
+            **checkpoint,
+            "channel_values": {**values, "messages": self._trim_history(messages)},
+        }
+
+    def _trim_history(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        turn_starts = turn_start_indexes(messages)
+        if len(turn_starts) > self.max_turns:
+            messages = messages[turn_starts[-self.max_turns] :]
+
+        # Earlier retrievals only need enough context to follow the conversation
+        tool_indexes = [
+            index for index, msg in enumerate(messages) if isinstance(msg, ToolMessage)
+        ]
+        trimmed = list(messages)
+        for index in tool_indexes[:-1]:
+            msg = trimmed[index]
+            content = msg.content
+            if isinstance(content, str) and len(content) > self.tool_content_chars:
+                content = content[: self.tool_content_chars] + "..."
+            if content is not msg.content or msg.artifact is not None:
+                trimmed[index] = msg.model_copy(
+                    update={"content": content, "artifact": None}
+                )
+        return trimmed
+
+    # Helpers
+
+    def _to_tuple(
+        self, row: SessionCheckpoint, writes: List[SessionCheckpointWrite]
+    ) -> CheckpointTuple:
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed(
+                (row.checkpoint_type, row.checkpoint_blob)
+            ),
+            metadata=self.serde.loads_typed((row.metadata_type, row.metadata_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": row.thread_id,
+                        "checkpoint_ns": row.checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (
+                    write.task_id,
+                    write.channel,
+                    self.serde.loads_typed((write.value_type, write.value_blob)),
+                )
+                for write in writes
+            ],
+        )
+
+    def _cache_get(self, key: _CacheKey) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key: _CacheKey, entry: _CacheEntry) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_pop(self, key: _CacheKey) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def _maybe_purge(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval_seconds
+
+        try:
+            self.purge_idle_sessions()
+        except Exception as e:
+            logger.warning(f"Idle chat session purge failed: {e}")
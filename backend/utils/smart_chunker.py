@@ -1,3 +1,4 @@
+import hashlib
 import json
 import re
 import uuid
@@ -6,6 +7,19 @@ from typing import Any, Dict, List, Optional
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Fixed namespace, so chunk ids are the same in every process and release
+CHUNK_ID_NAMESPACE = uuid.UUID("6f1d2c4e-8b0a-5e3f-9c71-2a4d5b6e7f80")
+
+
+def stable_chunk_id(chunk_ref: str, content: str) -> str:
+    """Derive a chunk's point id from its position and text.
+
+    Re-chunking unchanged content yields the same id, so re-indexing only has
+    to write chunks whose id is new and delete ids that disappeared.
+    """
+    content_hash = hashlib.sha256(content.strip().encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{chunk_ref}:{content_hash}"))
+
 
 class MarkdownDocumentChunker:
     """Smart chunking strategy for MarkdownDocument that preserves semantic structure."""
@@ -90,6 +104,36 @@ class MarkdownDocumentChunker:
 
         return all_chunks
 
+    def chunk_markdown_page(
+        self,
+        document_id: str,
+        filename: str,
+        page_number: int,
+        page_data: Dict[str, Any],
+    ) -> List[Document]:
+        """
+        Chunk a single page as soon as it is extracted (streaming ingestion).
+
+        The rest of the document isn't known yet, so adaptive sizing is based
+        on this page alone.
+
+        Args:
+            document_id: Document identifier
+            filename: Document filename
+            page_number: Zero-based page index in the PDF
+            page_data: Parsed MarkdownPage JSON
+
+        Returns:
+            List of Document chunks for the page
+        """
+        return self._chunk_page(
+            page=page_data,
+            page_idx=page_number,
+            document_id=document_id,
+            filename=filename,
+            doc_analysis=self._analyze_document_complexity({"pages": [page_data]}),
+        )
+
     def _analyze_document_complexity(
         self, markdown_doc_data: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -229,6 +273,7 @@ class MarkdownDocumentChunker:
 
             chunk_heading = self._find_relevant_heading(chunk_text, headings)
             quality_score = self._calculate_content_quality(chunk_text)
+            chunk_ref = f"{document_id}_p{page_idx}_c{chunk_idx}"
 
             chunk = Document(
                 page_content=chunk_text,
@@ -241,8 +286,8 @@ class MarkdownDocumentChunker:
                     "language": language,
                     "heading_context": chunk_heading,
                     "chunk_size": len(chunk_text),
-                    "chunk_id": str(uuid.uuid4()),
-                    "original_chunk_ref": f"{document_id}_p{page_idx}_c{chunk_idx}",
+                    "chunk_id": stable_chunk_id(chunk_ref, chunk_text),
+                    "original_chunk_ref": chunk_ref,
                     "quality_score": quality_score,
                     "is_complete_section": self._is_complete_section(chunk_text),
                     "is_structured_document": doc_analysis.get(
@@ -285,6 +330,7 @@ class MarkdownDocumentChunker:
 
         # Try to preserve table integrity - only chunk if absolutely necessary
         if len(full_table_content) <= self.table_max_size:
+            chunk_ref = f"{document_id}_p{page_idx}_t{table_idx}"
             chunk = Document(
                 page_content=full_table_content,
                 metadata={
@@ -298,8 +344,8 @@ class MarkdownDocumentChunker:
                     "table_caption": table_caption,
                     "language": language,
                     "chunk_size": len(full_table_content),
-                    "chunk_id": str(uuid.uuid4()),
-                    "original_chunk_ref": f"{document_id}_p{page_idx}_t{table_idx}",
+                    "chunk_id": stable_chunk_id(chunk_ref, full_table_content),
+                    "original_chunk_ref": chunk_ref,
                     "is_complete_table": True,
                     "quality_score": 0.9,
                 },
@@ -308,6 +354,7 @@ class MarkdownDocumentChunker:
         else:
             table_chunks = self.text_splitter.split_text(full_table_content)
             for chunk_idx, chunk_text in enumerate(table_chunks):
+                chunk_ref = f"{document_id}_p{page_idx}_t{table_idx}_c{chunk_idx}"
                 chunk = Document(
                     page_content=chunk_text,
                     metadata={
@@ -321,8 +368,8 @@ class MarkdownDocumentChunker:
                         "table_caption": table_caption,
                         "language": language,
                         "chunk_size": len(chunk_text),
-                        "chunk_id": str(uuid.uuid4()),
-                        "original_chunk_ref": f"{document_id}_p{page_idx}_t{table_idx}_c{chunk_idx}",
+                        "chunk_id": stable_chunk_id(chunk_ref, chunk_text),
+                        "original_chunk_ref": chunk_ref,
                         "is_complete_table": False,
                         "table_part": f"Part {chunk_idx + 1} of {len(table_chunks)}",
                         "quality_score": 0.6,
@@ -358,6 +405,7 @@ class MarkdownDocumentChunker:
         if not full_figure_content or not full_figure_content.strip():
             return None
 
+        chunk_ref = f"{document_id}_p{page_idx}_f{figure_idx}"
         return Document(
             page_content=full_figure_content,
             metadata={
@@ -371,8 +419,8 @@ class MarkdownDocumentChunker:
                 "figure_caption": figure_caption,
                 "language": language,
                 "chunk_size": len(full_figure_content),
-                "chunk_id": str(uuid.uuid4()),
-                "original_chunk_ref": f"{document_id}_p{page_idx}_f{figure_idx}",
+                "chunk_id": stable_chunk_id(chunk_ref, full_figure_content),
+                "original_chunk_ref": chunk_ref,
             },
         )
 
@@ -0,0 +1,55 @@
+"""Standalone ingestion worker.
+
+Runs ingestion jobs from the shared database queue, independently of the API.
+Start any number of these (on any machine that can reach the database, Qdrant
+and the upload directory) alongside the API:
+
+    python worker.py
+"""
+
+import asyncio
+import signal
+
+from config import settings
+from db import create_db_and_tables, get_engine
+from utils.ingestion_worker import IngestionWorker
+from utils.logging import get_logger, setup_logging
+from utils.pdf_renderer import shutdown_render_executor
+
+setup_logging(
+    debug=settings.debug,
+    structured_logs=False,
+    log_level="DEBUG" if settings.debug else "INFO",
+)
+logger = get_logger(__name__)
+
+
+async def main() -> None:
+    create_db_and_tables()
+
+    worker = IngestionWorker(get_engine())
+
+    # First signal drains running jobs, a second one interrupts them
+    loop = asyncio.get_running_loop()
+    run_task = asyncio.current_task()
+
+    def handle_signal() -> None:
+        if worker.stopping:
+            run_task.cancel()
+        else:
+            logger.info("Finishing running jobs before exit (signal again to abort)")
+            worker.stop()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, handle_signal)
+
+    try:
+        await worker.run()
+    except asyncio.CancelledError:
+        logger.info("Worker interrupted, running jobs were returned to the queue")
+    finally:
+        shutdown_render_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())